@@ -0,0 +1,63 @@
+"""Compares validating a mixed roster with partition_identifiers against the old per-item checks.
+
+Run from the repository root with ``python -m benchmarks.bench_checks``.
+"""
+import time
+import uuid
+
+from string import ascii_letters
+
+from py4mc.utils.checks import partition_identifiers
+
+
+def legacy_is_valid_uuid(value: str, version: int = 4) -> bool:
+    try:
+        uuid.UUID(value, version=version)
+        return True
+    except ValueError:
+        return False
+
+
+def legacy_is_valid_name(name: str) -> bool:
+    if len(name) <= 25:
+        return all(x in ascii_letters + "_" for x in name)
+    return False
+
+
+def legacy_partition(identifiers: list) -> tuple:
+    uuids = [i for i in identifiers if legacy_is_valid_uuid(i)]
+    names = [i for i in identifiers if not legacy_is_valid_uuid(i) and legacy_is_valid_name(i)]
+    return names, uuids
+
+
+def roster(size: int) -> list:
+    identifiers = []
+    for i in range(size):
+        kind = i % 4
+        if kind == 0:
+            identifiers.append(uuid.UUID(int=i).hex)
+        elif kind == 1:
+            identifiers.append(str(uuid.UUID(int=i)))
+        elif kind == 2:
+            identifiers.append(f"player_{i}"[:16])
+        else:
+            identifiers.append(f"Player_{chr(97 + i % 26)}{chr(97 + i // 26 % 26)}")
+    return identifiers
+
+
+def main(size: int = 1_000_000):
+    identifiers = roster(size)
+    started = time.perf_counter()
+    legacy_partition(identifiers)
+    legacy = time.perf_counter() - started
+    started = time.perf_counter()
+    partition_identifiers(identifiers)
+    current = time.perf_counter() - started
+    print(
+        f"{size} identifiers: {legacy:.2f}s -> {current:.2f}s "
+        f"({legacy / current:.1f}x faster, {current / size * 1e9:.0f}ns per identifier)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""Measures the latency and throughput of the public API against a local FakeMojangServer.
+
+Every scenario runs over real HTTP on localhost, with optional injected latency, 429s and 5xx,
+so results are repeatable and can be compared across releases:
+
+    python -m benchmarks.bench_endpoints --json results.json
+    python -m benchmarks.bench_endpoints --compare results.json
+
+Run from the repository root.
+"""
+import sys
+import json
+import time
+import argparse
+import statistics
+
+import py4mc
+
+from py4mc import Dispatch, CredentialManager
+from py4mc.ratelimit import RateLimiter
+from py4mc.testing import FakeMojangServer
+from py4mc.types import prefetch_textures
+from py4mc.types.textures import _Texture
+from py4mc.cache import TextureCache
+
+NAMES = [f"player_{chr(97 + i // 26)}{chr(97 + i % 26)}" for i in range(200)]
+
+
+def bench_get_user(mojang):
+    return lambda: mojang.get_user(NAMES[0])
+
+
+def bench_get_users(mojang):
+    return lambda: mojang.get_users(NAMES[:50])
+
+
+def bench_get_uuids(mojang):
+    return lambda: mojang.get_uuids(NAMES)
+
+
+def bench_textures(mojang):
+    profiles = mojang.get_users(NAMES[:50])
+
+    def download():
+        _Texture.cache = TextureCache()
+        prefetch_textures(profiles, max_workers=16)
+
+    return download
+
+
+def bench_blocked_servers(mojang):
+    return lambda: mojang.get_blocked_server_index().is_blocked("mc.example.com")
+
+
+def bench_auth(mojang):
+    manager = CredentialManager("client", leeway=0.0)
+
+    def login():
+        manager.add_refresh_token("account", "refresh")
+        return manager.get_access_token("account")
+
+    return login
+
+
+SCENARIOS = {
+    "get_user": (bench_get_user, 1),
+    "get_users[50]": (bench_get_users, 50),
+    "get_uuids[200]": (bench_get_uuids, 200),
+    "textures[50]": (bench_textures, 50),
+    "blocked_servers": (bench_blocked_servers, 1),
+    "auth_chain": (bench_auth, 1),
+}
+
+
+def measure(function, rounds: int, warmup: int) -> list:
+    for _ in range(warmup):
+        function()
+    timings = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def summarize(timings: list, items: int) -> dict:
+    ordered = sorted(timings)
+    return {
+        "rounds": len(timings),
+        "min": ordered[0],
+        "mean": statistics.fmean(timings),
+        "p50": ordered[len(ordered) // 2],
+        "p99": ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))],
+        "items_per_second": items * len(timings) / sum(timings),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=2)
+    parser.add_argument("--latency", type=float, default=0.005, help="seconds the fake server delays every response")
+    parser.add_argument("--rate-limit-ratio", type=float, default=0.0, help="share of requests answered with a 429")
+    parser.add_argument("--error-ratio", type=float, default=0.0, help="share of requests answered with a 503")
+    parser.add_argument("--only", nargs="*", choices=list(SCENARIOS), help="the scenarios to run, all by default")
+    parser.add_argument("--json", help="where to save the results")
+    parser.add_argument("--compare", help="previously saved results to compare the p50 latencies against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="the slowdown reported as a regression")
+    arguments = parser.parse_args(argv)
+
+    server = FakeMojangServer(
+        NAMES, capes=NAMES[::3], latency=arguments.latency,
+        rate_limit_ratio=arguments.rate_limit_ratio, error_ratio=arguments.error_ratio, retry_after=0.01,
+    ).start()
+    transport = server.transport(pool_maxsize=64)
+    previous = Dispatch.set_transport(transport)
+    rate_limiter = Dispatch.set_rate_limiter(RateLimiter(limits={}, backoff=0.01))
+    results = {}
+    try:
+        mojang = py4mc.MojangApi(max_workers=32)
+        print(f"{'scenario':>16} {'min':>9} {'mean':>9} {'p50':>9} {'p99':>9} {'items/s':>10}")
+        for name in arguments.only or SCENARIOS:
+            build, items = SCENARIOS[name]
+            results[name] = summary = summarize(measure(build(mojang), arguments.rounds, arguments.warmup), items)
+            print(
+                f"{name:>16} " + " ".join(f"{summary[k] * 1e3:7.2f}ms" for k in ("min", "mean", "p50", "p99"))
+                + f" {summary['items_per_second']:10.1f}"
+            )
+    finally:
+        Dispatch.set_transport(previous)
+        Dispatch.set_rate_limiter(rate_limiter)
+        transport.close()
+        server.stop()
+
+    if arguments.json:
+        with open(arguments.json, "w") as results_file:
+            json.dump({"version": py4mc.__version__, "results": results}, results_file, indent=2)
+    regressions = []
+    if arguments.compare:
+        with open(arguments.compare) as baseline_file:
+            baseline = json.load(baseline_file)["results"]
+        for name, summary in results.items():
+            if name in baseline:
+                change = summary["p50"] / baseline[name]["p50"] - 1
+                print(f"{name:>16} p50 {change:+.1%} against {arguments.compare}")
+                if change > arguments.threshold:
+                    regressions.append(name)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+"""Compares the per-instance memory footprint of the slotted models against the old __dict__ based ones.
+
+Run from the repository root with ``python -m benchmarks.bench_model_memory``.
+"""
+import json
+import base64
+import tracemalloc
+
+from uuid import UUID
+from datetime import datetime
+
+from py4mc.types import Profile, HistoryIndex, Statistics
+
+
+class LegacyProfile:
+    def __init__(self, profile_value: str, signature: str):
+        self.profile = json.loads(base64.b64decode(profile_value))
+        self.uuid = UUID(self.profile.get("profileId"), version=4)
+        self.username = self.profile.get("profileName")
+        self.timestamp = datetime.utcfromtimestamp(int(self.profile.get("timestamp")) // 1000)
+        self.signature = signature
+
+
+class LegacyHistoryIndex:
+    def __init__(self, raw_data: dict):
+        self.name = raw_data.get("name")
+        self.changed_at = raw_data.get("changedToAt")
+        self.is_original = self.changed_at is None
+        if not self.is_original:
+            self.changed_at = datetime.utcfromtimestamp(int(self.changed_at) // 1000)
+
+
+class LegacyStatistics:
+    def __init__(self, raw_data: dict):
+        self.total = raw_data.get("total")
+        self.last_24h = raw_data.get("last24h")
+        self.sale_velocity = raw_data.get("saleVelocityPerSeconds")
+
+
+def profile_arguments(index: int) -> tuple:
+    value = {
+        "timestamp": 1641070000000 + index,
+        "profileId": UUID(int=index * 7919 + 1, version=4).hex,
+        "profileName": f"player{index}",
+        "textures": {
+            "SKIN": {"url": f"http://textures.minecraft.net/texture/{index:064x}"},
+            "CAPE": {"url": f"http://textures.minecraft.net/texture/{index:063x}c"},
+        },
+    }
+    return base64.b64encode(json.dumps(value).encode()).decode(), f"signature{index}"
+
+
+def measure(factory, arguments: list) -> float:
+    tracemalloc.start()
+    instances = [factory(*a) for a in arguments]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del instances
+    return size / len(arguments)
+
+
+def main(count: int = 20000):
+    cases = {
+        "Profile": (LegacyProfile, Profile, [profile_arguments(i) for i in range(count)]),
+        "HistoryIndex": (
+            LegacyHistoryIndex,
+            HistoryIndex,
+            [({"name": f"name{i}", "changedToAt": 1423059891000 + i},) for i in range(count)],
+        ),
+        "Statistics": (
+            LegacyStatistics,
+            Statistics,
+            [({"total": i, "last24h": i, "saleVelocityPerSeconds": i / 3},) for i in range(count)],
+        ),
+    }
+    for name, (legacy, current, arguments) in cases.items():
+        legacy_size = measure(legacy, arguments)
+        current_size = measure(current, arguments)
+        print(
+            f"{name:>12}: {legacy_size:8.0f} -> {current_size:8.0f} bytes per instance "
+            f"({1 - current_size / legacy_size:.0%} smaller)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Compares the CPU time Dispatch.parse_response spends per request against the old four-decode parser.
+
+Run from the repository root with ``python -m benchmarks.bench_parse_response``.
+"""
+import json
+import base64
+import timeit
+
+from requests import Response
+
+from py4mc import Dispatch
+from py4mc.utils.checks import is_valid_json
+from py4mc.utils.parsers import JSON_BACKEND
+
+
+def make_response(payload) -> Response:
+    response = Response()
+    response.status_code = 200
+    response.encoding = "utf-8"
+    response._content = json.dumps(payload).encode()
+    return response
+
+
+def legacy_parse_response(response: Response):
+    if response.status_code == 200:
+        if is_valid_json(response.text):
+            if isinstance(response.json(), list):
+                return response.json()
+            elif not Dispatch._find_problems(response.json()):
+                return response.json()
+        else:
+            return response
+    return response
+
+
+def large_profile() -> dict:
+    textures = {"SKIN": {"url": "http://textures.minecraft.net/texture/" + "a" * 64}, "CAPE": {"url": "b" * 100}}
+    value = {"timestamp": 1641070000000, "profileId": "0" * 32, "profileName": "Notch", "textures": textures}
+    encoded = base64.b64encode(json.dumps(value).encode()).decode()
+    return {
+        "id": "0" * 32,
+        "name": "Notch",
+        "properties": [{"name": "textures", "value": encoded, "signature": "s" * 684}],
+    }
+
+
+PAYLOADS = {
+    "profile": large_profile(),
+    "name batch": [{"id": f"{i:032x}", "name": f"player{i}"} for i in range(10)],
+    "name history": [{"name": f"name{i}", "changedToAt": 1423059891000 + i} for i in range(500)],
+}
+
+
+def main(number: int = 2000):
+    print(f"json backend: {JSON_BACKEND}")
+    for name, payload in PAYLOADS.items():
+        response = make_response(payload)
+        assert legacy_parse_response(response) == Dispatch.parse_response(response)
+        legacy = timeit.timeit(lambda: legacy_parse_response(response), number=number) / number
+        current = timeit.timeit(lambda: Dispatch.parse_response(response), number=number) / number
+        print(
+            f"{name:>14}: {legacy * 1e6:9.1f}us -> {current * 1e6:9.1f}us per request "
+            f"({legacy / current:.1f}x faster, {len(response.content)} bytes)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""Compares decoding archived profiles one by one against Profile.from_raw_many on a process pool.
+
+Run from the repository root with ``python -m benchmarks.bench_profile_decode``.
+"""
+import os
+import json
+import time
+import base64
+
+from py4mc.types import Profile
+
+
+def archive(size: int) -> list:
+    lines = []
+    for i in range(size):
+        uuid = f"{i:032x}"
+        textures = {"SKIN": {"url": "http://textures.minecraft.net/texture/" + uuid * 2}}
+        value = {"timestamp": 1641070000000, "profileId": uuid, "profileName": f"player{i}", "textures": textures}
+        encoded = base64.b64encode(json.dumps(value).encode()).decode()
+        response = {"id": uuid, "name": f"player{i}", "properties": [{"name": "textures", "value": encoded}]}
+        lines.append(json.dumps(response))
+    return lines
+
+
+def main(size: int = 200_000):
+    lines = archive(size)
+    started = time.perf_counter()
+    [Profile.from_response(json.loads(line)) for line in lines]
+    sequential = time.perf_counter() - started
+    print(f"{size} profiles, one by one: {sequential:.2f}s")
+    for processes in (0, os.cpu_count()):
+        started = time.perf_counter()
+        Profile.from_raw_many(lines, processes=processes)
+        elapsed = time.perf_counter() - started
+        print(f"from_raw_many, {processes} processes: {elapsed:.2f}s ({sequential / elapsed:.1f}x faster)")
+        started = time.perf_counter()
+        Profile.from_raw_many(lines, processes=processes, fields_only=True)
+        elapsed = time.perf_counter() - started
+        print(f"  fields_only: {elapsed:.2f}s ({sequential / elapsed:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
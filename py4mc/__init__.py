@@ -1,10 +1,22 @@
 from .api import MojangApi
+from .async_api import AsyncMojangApi
 from .dispatcher import Dispatch
+from .transport import Transport, AsyncTransport
+from .authentication import CredentialManager
+from .singleflight import SingleFlight, AsyncSingleFlight
+from .batcher import UuidBatcher
+from .metrics import Instrumentation
+from .history import NameHistoryService
+from .monitor import StatisticsMonitor
+from .resilience import RetryPolicy, CircuitBreaker, BatchResult
 from .exceptions import (
     ApiException,
     ResourceNotFound,
     InternalServerException,
     UserNotFound,
+    Ratelimited,
+    NetworkException,
+    CircuitOpen,
 )
 
 __version__ = "0.0.1a"
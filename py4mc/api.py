@@ -24,29 +24,56 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
 
-import hashlib
-import requests
-
-from typing import Union, Optional
-from requests import Response
+from typing import Union, Optional, Iterator, Tuple
+from itertools import islice
 from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 
 from .exceptions import ApiException, InvalidMetric, AuthenticationException
 from .authentication import MicrosoftOAuth, MinecraftAuthentication
-from .utils.checks import is_valid_uuid, is_valid_name
+from .utils.checks import is_valid_uuid, is_valid_name, partition_identifiers
 from .dispatcher import Dispatch
+from .response import ApiResponse
+from .cache import LookupCache, MISSING
+from .store import ProfileStore
+from .batcher import UuidBatcher
+from .export import export_profiles
+from .monitor import StatisticsMonitor
+from .resilience import BatchResult
 
 from .types.profile import Profile
 from .types.account import Account
 from .types.misc import Statistics
+from .types.servers import BlockedServerIndex
 
 
 class MojangApi:
     """Everything regarding the Mojang API is within this class.
 
     Anything regarding Mojang's API that is documented in wiki.vg, has been implemented in some sort in this library.
+
+    Attributes:
+        max_workers (int): The amount of threads bulk lookups are spread across.
+        cache (LookupCache): Where UUID, profile and name history lookups are cached, if anywhere.
+        store (ProfileStore): The persistent profile store checked before going to the network, if any.
+        batcher (UuidBatcher): Packs the get_uuid calls of many threads into batched requests, if set.
+
     """
 
+    NOT_FOUND_STATUSES = (204, 404)
+
+    def __init__(
+        self,
+        max_workers: int = 8,
+        cache: Optional[LookupCache] = None,
+        store: Optional[ProfileStore] = None,
+        batcher: Optional[UuidBatcher] = None,
+    ):
+        self.max_workers = max_workers
+        self.cache = cache
+        self.store = store
+        self.batcher = batcher
+
     def get_profile_attributes(self, uuid: str):
         """Retrieves the profile information given the users UUID.
 
@@ -60,14 +87,44 @@ class MojangApi:
             Union[Profile, bool]: The profile retrieved, or None if the profile was not found.
 
         """
-        route = Dispatch.SESSION_SERVER + f"/session/minecraft/profile/{uuid}"
-        profile = Dispatch.do_request("GET", route + "?unsigned=false")
-        if not isinstance(profile, dict):
+        payload = self._get_profile_payload(uuid)
+        if payload is None:
             return None
-        properties = profile.get("properties")[0]
-        return Profile(properties.get("value"), properties.get("signature"))
+        return Profile(*payload, cache=self.cache)
+
+    def _get_profile_payload(self, uuid: str) -> Optional[tuple]:
+        """Gets the raw textures property of a profile, going through the cache and the store first.
+
+        Args:
+            uuid (UUID): The profile's UUID.
 
-    def _chunk_usernames(self, usernames, chunk_size: int = 10):
+        Returns:
+            tuple: The base64 value and the signature of the property, or None if the profile was not found.
+
+        """
+        key = str(uuid).replace("-", "").lower()
+        if self.cache is not None:
+            cached = self.cache.get("profile", key)
+            if cached is not MISSING:
+                return cached
+        payload = None if self.store is None else self.store.get_by_uuid(key)
+        if payload is None:
+            route = Dispatch.SESSION_SERVER + f"/session/minecraft/profile/{uuid}"
+            profile = Dispatch.do_request("GET", route + "?unsigned=false")
+            if isinstance(profile, dict):
+                properties = profile.get("properties")[0]
+                payload = (properties.get("value"), properties.get("signature"))
+                if self.store is not None:
+                    self.store.put(profile.get("id"), profile.get("name"), *payload)
+            elif not self._is_not_found(profile):
+                # An error response says nothing about the profile, so it is not cached as missing.
+                return None
+        if self.cache is not None:
+            self.cache.set("profile", key, payload)
+        return payload
+
+    @staticmethod
+    def _chunk_usernames(usernames, chunk_size: int = 10):
         """Splits the given profiles into multiple lists.
 
         This chunks a large list, into smaller lists so more than 10 names can be provided into the get_profile method.
@@ -89,23 +146,66 @@ class MojangApi:
         Args:
             username: The username to get the uuid of.
 
+        Notes:
+            When the api has a cache, a missing player is only cached if Mojang said so. Error
+            responses are never cached, so the name is looked up again on the next call.
+
         Returns:
             bool: Returns None if no person with that name is found.
             str: The uuid of the username given.
 
         """
-        route = Dispatch.API_BASE + "/users/profiles/minecraft/"
-        response = Dispatch.do_request("GET", route + username)
-        if isinstance(response, Response):
+        if self.cache is not None:
+            cached = self.cache.get("uuid", username.lower())
+            if cached is not MISSING:
+                return cached
+        if self.store is not None:
+            stored = self.store.get_uuid(username)
+            if stored is not None:
+                return stored
+        if self.batcher is not None:
+            uuid = self.batcher.get_uuid(username)
+            # The batcher cannot tell a missing player from a failed batch, so only hits are cached.
+            found = uuid is not None
+        else:
+            route = Dispatch.API_BASE + "/users/profiles/minecraft/"
+            response = Dispatch.do_request("GET", route + username)
+            uuid = response.get("id") if isinstance(response, dict) else None
+            found = uuid is not None or self._is_not_found(response)
+        if self.cache is not None and found:
+            self.cache.set("uuid", username.lower(), uuid)
+        return uuid
+
+    @classmethod
+    def _is_not_found(cls, response) -> bool:
+        """Checks if a response means the player does not exist, rather than that the request failed."""
+        return isinstance(response, ApiResponse) and response.status_code in cls.NOT_FOUND_STATUSES
+
+    def _post_usernames(self, usernames: list) -> Optional[list]:
+        """Sends one chunk of at most 10 names to the profiles endpoint.
+
+        Args:
+            usernames (list): The names to resolve.
+
+        Returns:
+            list: The id and name of every name that was found, or None if the response was not a list.
+
+        """
+        route = Dispatch.API_BASE + "/profiles/minecraft"
+        chunk = [c for c in usernames if is_valid_name(c)]
+        if not chunk:
+            return []
+        response = Dispatch.do_request("POST", route, json=chunk)
+        if not isinstance(response, list):
             return None
-        return response.get("id")
+        return response
 
     def get_uuids(self, usernames: Iterable) -> str:
         """Attempts to get all UUIDS of the given profiles.
 
         Because the API can only take 10 names per request, we can chunk a list larger than 10 names so
         instead of having to discard any names past the first ten, we can return to the user all of
-        their requested names, albeit a little slower.
+        their requested names. The chunks are sent in parallel across max_workers threads.
 
         Args:
             usernames (Iterable): An iterable of names.
@@ -114,17 +214,30 @@ class MojangApi:
             list: The UUID's associated with each name.
 
         """
-        processed_uuids = []
-        chunked_profiles = list(self._chunk_usernames(usernames))
-        route = Dispatch.API_BASE + "/profiles/minecraft"
-        for profile_chunk in chunked_profiles:
-            chunk = [c for c in profile_chunk if is_valid_name(c)]
-            response = Dispatch.do_request("POST", route, json=chunk)
-            processed_uuids.extend([r.get("id") for r in response])
-        return processed_uuids
+        chunked_profiles = list(self._chunk_usernames(partition_identifiers(usernames).names))
+        with ThreadPoolExecutor(self.max_workers) as executor:
+            responses = executor.map(self._post_usernames, chunked_profiles)
+            return [r.get("id") for response in responses for r in response or ()]
+
+    def get_uuid_mapping(self, usernames: Iterable) -> dict:
+        """Resolves many names at once, 10 names per request.
+
+        Args:
+            usernames (Iterable): An iterable of names.
+
+        Returns:
+            dict: The lowercase names mapped to their UUIDs. Names that were not found are left out.
+
+        """
+        names = list(dict.fromkeys(n.lower() for n in usernames))
+        chunked_profiles = list(self._chunk_usernames(names))
+        with ThreadPoolExecutor(self.max_workers) as executor:
+            mappings = executor.map(self._map_usernames, chunked_profiles)
+            return {n: u for mapping in mappings for n, u in mapping.items() if u is not None}
 
+    @staticmethod
     def _postprocess_profiles(
-        self, profiles: Union[str, Iterable]
+        profiles: Union[str, Iterable]
     ) -> Union[Profile, list, bool]:
         """Processes the profiles before returning.
 
@@ -155,6 +268,8 @@ class MojangApi:
         Notes:
             No user can have a valid Minecraft UUID as a username,
             therefore we exclude the uuids from getting checked to speed up the profile gathering process.
+            For large lists of profiles, get_users is considerably faster.
+            If the api was given a store, fresh profiles in it are used instead of requesting them again.
 
         Args:
             profiles (Union[str, Iterable]): The profiles to retrieve from the API.
@@ -169,34 +284,205 @@ class MojangApi:
             ]
         for profile in profiles:
             if not is_valid_uuid(profile):
-                profile = self.get_uuid(profile)
-            profile_data = self.get_profile_attributes(profile)
-            retrieved_profiles.append(profile_data)
+                profile = self.get_uuid(profile) if is_valid_name(profile) else None
+            retrieved_profiles.append(self._get_optional_profile(profile))
         return self._postprocess_profiles(retrieved_profiles)
 
+    def get_users(self, profiles: Iterable, max_workers: Optional[int] = None) -> BatchResult:
+        """Gets the attributes of a large amount of profiles in bulk.
+
+        Unlike get_user, every name is first resolved in 10 name chunks, then all of the profiles
+        are fetched on a thread pool. A lookup that fails, for instance because the sessionserver
+        is down, does not abort the others: it is left as None and its exception is recorded.
+
+        Args:
+            profiles (Iterable): The names or UUIDs to retrieve from the API.
+            max_workers (int): The amount of threads to use, defaults to max_workers.
+
+        Returns:
+            BatchResult: The retrieved profiles in input order, with None for every profile that was not
+            found or failed. The exceptions of the failed lookups are in its errors, keyed by index.
+        """
+        profiles = list(profiles)
+        identifiers = partition_identifiers(profiles)
+        valid_uuids = set(identifiers.uuids)
+        names = list(dict.fromkeys(n.lower() for n in identifiers.names))
+        resolved, failed_names = {}, {}
+        with ThreadPoolExecutor(max_workers or self.max_workers) as executor:
+            chunks = list(self._chunk_usernames(names))
+            for chunk, future in [(c, executor.submit(self._map_usernames, c)) for c in chunks]:
+                try:
+                    resolved.update(future.result())
+                except ApiException as exception:
+                    failed_names.update(dict.fromkeys(chunk, exception))
+            uuids = [p if p in valid_uuids else resolved.get(p.lower()) if is_valid_name(p) else None for p in profiles]
+            futures = [executor.submit(self._get_optional_profile, u) for u in uuids]
+            result = BatchResult()
+            for index, (profile, future) in enumerate(zip(profiles, futures)):
+                try:
+                    result.append(future.result())
+                except ApiException as exception:
+                    result.errors[index] = exception
+                    result.append(None)
+                if is_valid_name(profile) and profile.lower() in failed_names:
+                    result.errors[index] = failed_names[profile.lower()]
+            return result
+
+    def _map_usernames(self, usernames: list) -> dict:
+        """Resolves one chunk of at most 10 names, going through the cache if there is one.
+
+        Args:
+            usernames (list): The names to resolve.
+
+        Returns:
+            dict: The lowercase names mapped to their UUIDs, or None if they were not found.
+
+        """
+        names = [n.lower() for n in usernames]
+        mapping = {}
+        if self.cache is not None:
+            cached = {n: self.cache.get("uuid", n) for n in names}
+            mapping = {n: u for n, u in cached.items() if u is not MISSING}
+            names = [n for n in names if n not in mapping]
+        if self.store is not None:
+            stored = {n: self.store.get_uuid(n) for n in names}
+            mapping.update({n: u for n, u in stored.items() if u is not None})
+            names = [n for n in names if n not in mapping]
+        if names:
+            response = self._post_usernames(names)
+            resolved = {r.get("name").lower(): r.get("id") for r in response or ()}
+            for name in names:
+                mapping[name] = resolved.get(name)
+                # Names left out of a list response do not exist, but a failed response says nothing about them.
+                if self.cache is not None and response is not None:
+                    self.cache.set("uuid", name, mapping[name])
+        return mapping
+
+    def iter_profiles(
+        self, profiles: Iterable, max_workers: Optional[int] = None, max_pending: Optional[int] = None
+    ) -> Iterator[Tuple[str, Optional[Profile]]]:
+        """Lazily resolves profiles, yielding every one of them as soon as its lookup finishes.
+
+        The profiles are pulled from the iterable only as fast as they are resolved, so at most
+        max_pending lookups are held in memory at once, no matter how many profiles are passed.
+        Names are resolved 10 at a time before their profiles are fetched.
+
+        Notes:
+            Results are yielded in the order the lookups finish, not in input order.
+            A lookup that fails does not abort the others, its exception is yielded in place of the profile.
+
+        Args:
+            profiles (Iterable): The names or UUIDs to retrieve from the API.
+            max_workers (int): The amount of threads to use, defaults to max_workers.
+            max_pending (int): The maximum amount of lookups in flight, defaults to four per worker.
+
+        Yields:
+            tuple: The requested name or UUID, and its Profile, None if it was not found, or the
+            ApiException the lookup raised.
+        """
+        max_workers = max_workers or self.max_workers
+        max_pending = max_pending or max_workers * 4
+        profiles = iter(profiles)
+        executor = ThreadPoolExecutor(max_workers)
+        pending = {}
+        try:
+            exhausted = False
+            while True:
+                while not exhausted and len(pending) < max_pending:
+                    chunk = list(islice(profiles, 10))
+                    exhausted = not chunk
+                    names, uuids, rejects = partition_identifiers(chunk)
+                    for uuid in uuids:
+                        pending[executor.submit(self.get_profile_attributes, uuid)] = uuid
+                    if names:
+                        pending[executor.submit(self._map_usernames, names)] = names
+                    for reject in rejects:
+                        yield reject, None
+                if not pending:
+                    return
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    requested = pending.pop(future)
+                    try:
+                        resolved = future.result()
+                    except ApiException as exception:
+                        if isinstance(requested, str):
+                            yield requested, exception
+                        else:
+                            yield from ((name, exception) for name in requested)
+                        continue
+                    if isinstance(requested, str):
+                        yield requested, resolved
+                        continue
+                    for name in requested:
+                        uuid = resolved.get(name.lower())
+                        if uuid is None:
+                            yield name, None
+                        else:
+                            pending[executor.submit(self.get_profile_attributes, uuid)] = name
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def export_profiles(
+        self,
+        profiles: Iterable,
+        path: str,
+        format: Optional[str] = None,
+        batch_size: int = 10000,
+        max_workers: Optional[int] = None,
+    ) -> dict:
+        """Resolves profiles and streams them to an NDJSON, CSV or Parquet file as they are resolved.
+
+        Profiles go straight from iter_profiles to the file in batches of batch_size, so neither
+        the input nor the resolved profiles are ever held in memory all at once.
+
+        Args:
+            profiles (Iterable): The names or UUIDs to export.
+            path (str): The file to write, its extension selects the format unless one is passed.
+            format (str): One of "ndjson", "csv" or "parquet".
+            batch_size (int): How many profiles are buffered before they are written.
+            max_workers (int): The amount of threads to use, defaults to max_workers.
+
+        Returns:
+            dict: How many profiles were written, how many were not found, and how many lookups failed.
+        """
+        return export_profiles(self.iter_profiles(profiles, max_workers), path, format, batch_size)
+
+    def _get_optional_profile(self, uuid: Optional[str]) -> Optional[Profile]:
+        if uuid is None:
+            return None
+        return self.get_profile_attributes(uuid)
+
     def get_blocked_servers(self, raw_hashes: bool = True):
         """Retrieves a list of blocked servers.
 
         Upon connecting to a server, the client will check if the hashed server IP is within this list.
-        If it is, then it will not connect to that server.
+        If it is, then it will not connect to that server. To check addresses against the list,
+        use get_blocked_server_index instead.
 
         Args:
-            raw_hashes (bool): If the hashes should not be converted into a _hashlib.HASH object.
+            raw_hashes (bool): If the hashes should be returned as hex strings rather than as 20 byte digests.
 
         Returns:
             list: A list of blocked hashes.
         """
-        blocked_servers = []
         route = Dispatch.SESSION_SERVER + "/blockedservers"
-        response = requests.request("GET", route)
-        for blocked_hash in response.content.splitlines():
-            if not raw_hashes:
-                server_hash = hashlib.sha1(blocked_hash)
-                blocked_servers.append(server_hash)
-            else:
-                blocked_servers.append(blocked_hash.decode())
+        response = Dispatch.raw_request("GET", route)
+        blocked_servers = response.content.decode().split()
+        if not raw_hashes:
+            return [bytes.fromhex(h) for h in blocked_servers]
         return blocked_servers
 
+    def get_blocked_server_index(self) -> BlockedServerIndex:
+        """Retrieves the blocked servers as an index that addresses can be checked against.
+
+        Returns:
+            BlockedServerIndex: The index of blocked hashes.
+        """
+        route = Dispatch.SESSION_SERVER + "/blockedservers"
+        response = Dispatch.raw_request("GET", route)
+        return BlockedServerIndex.from_content(response.content)
+
     def get_statistics(self, metrics: Iterable):
         """Gets Mojang sales statistics.
 
@@ -228,6 +514,20 @@ class MojangApi:
         statistics = Dispatch.do_request("POST", route, json=payload)
         return Statistics(statistics)
 
+    def monitor_statistics(self, metrics: Iterable, interval: float = 60.0, capacity: int = 1440) -> StatisticsMonitor:
+        """Gets the shared monitor polling the sales statistics of some metrics.
+
+        Args:
+            metrics (Iterable): A list of valid metrics to query.
+            interval (float): How many seconds are between two requests.
+            capacity (int): How many samples the monitor keeps.
+
+        Returns:
+            StatisticsMonitor: The monitor, subscribe to it to start polling.
+
+        """
+        return StatisticsMonitor.shared(metrics, interval, capacity)
+
     def get_profile(self, profiles: Iterable):
         """An alias for get_user.
 
@@ -249,7 +549,7 @@ class MojangApi:
         microsoft_oauth = MicrosoftOAuth(client_id, redirect_uri)
         if code is None:
             return microsoft_oauth.build_url(state, open_webbrowser)
-        oauth_token = microsoft_oauth.get_oauth_token(code)
+        oauth_token = microsoft_oauth.preform_oauth(code)
         xbl_token = MinecraftAuthentication.get_xbl_token(oauth_token)
         xsts_token, user_hash = MinecraftAuthentication.get_xsts_token(xbl_token)
         return Account(MinecraftAuthentication.get_access_token(xsts_token, user_hash))
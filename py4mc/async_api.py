@@ -0,0 +1,351 @@
+import time
+import asyncio
+
+from typing import Union, Optional
+from urllib.parse import urlsplit
+from collections.abc import Iterable
+
+from .api import MojangApi
+from .exceptions import ApiException, InvalidMetric, ResourceNotFound, NetworkException, CircuitOpen
+from .utils.checks import is_valid_name, partition_identifiers
+from .dispatcher import Dispatch
+from .transport import AsyncTransport, NETWORK_ERRORS
+from .singleflight import AsyncSingleFlight
+
+from .types.profile import Profile, HistoryIndex
+from .types.textures import Skin, Cape
+from .types.misc import Statistics
+from .types.servers import BlockedServerIndex
+
+
+class AsyncMojangApi:
+    """The asyncio counterpart of MojangApi.
+
+    Every method is a coroutine, and independent requests are sent concurrently. The amount of
+    requests in flight at once is bounded by a semaphore, so large lookups never open more
+    connections than the transport's pool can hold. Requests are scheduled with the same
+    rate limiter as the Dispatch.
+
+    Attributes:
+        transport (AsyncTransport): The transport requests are sent through.
+        concurrency (int): The maximum amount of requests in flight at once.
+        single_flight (AsyncSingleFlight): Coalesces identical requests in flight at once, None disables it.
+
+    """
+
+    def __init__(self, transport: Optional[AsyncTransport] = None, concurrency: int = 32):
+        self.transport = transport if transport is not None else AsyncTransport(pool_maxsize=concurrency)
+        self.concurrency = concurrency
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._pacing = {}
+        self.single_flight = AsyncSingleFlight()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def close(self):
+        """Closes the underlying transport."""
+        await self.transport.close()
+
+    async def send(self, method: str, route: str, kwargs: dict):
+        circuit_breaker = Dispatch.circuit_breaker
+        if circuit_breaker is not None:
+            token = circuit_breaker.before(route)
+        response = None
+        try:
+            response = await self._transmit(method, route, kwargs)
+            return response
+        except NETWORK_ERRORS as exception:
+            raise NetworkException(f"{method} {route} failed: {exception}") from exception
+        finally:
+            if circuit_breaker is not None:
+                circuit_breaker.record(route, response is not None and response.status_code < 500, token)
+
+    async def _transmit(self, method: str, route: str, kwargs: dict):
+        instrumentation = Dispatch.instrumentation
+        if instrumentation is None:
+            return await self.transport.request(method, route, **kwargs)
+        started = instrumentation.started(method, route, kwargs)
+        response = None
+        try:
+            response = await self.transport.request(method, route, **kwargs)
+            return response
+        finally:
+            instrumentation.finished(method, route, kwargs, response, started)
+
+    @staticmethod
+    async def throttle(delay: float):
+        if Dispatch.instrumentation is not None:
+            Dispatch.instrumentation.waited(delay)
+        await asyncio.sleep(delay)
+
+    async def raw_request(self, method: str, route: str, **kwargs):
+        Dispatch.prepare_headers(kwargs)
+        retry_policy = Dispatch.retry_policy if Dispatch.is_idempotent(method, route) else None
+        attempt = 0
+        while True:
+            try:
+                response = await self.scheduled_send(method, route, kwargs)
+            except CircuitOpen:
+                raise
+            except NetworkException:
+                if retry_policy is None or not retry_policy.should_retry(attempt):
+                    raise
+            else:
+                if retry_policy is None or not retry_policy.should_retry(attempt, response.status_code):
+                    return response
+            if Dispatch.instrumentation is not None:
+                Dispatch.instrumentation.retried(route)
+            await self.throttle(retry_policy.delay(attempt))
+            attempt += 1
+
+    async def scheduled_send(self, method: str, route: str, kwargs: dict):
+        # The semaphore is taken before a token is reserved, so a gathered lookup never has more
+        # than concurrency reservations outstanding.
+        async with self._semaphore:
+            return await self._scheduled_send(method, route, kwargs)
+
+    async def _reserve(self, rate_limiter, route: str, deadline: Optional[float]) -> float:
+        # The reservations of a host are made one at a time, each waiting out its delay before the next
+        # one is made. The bucket is then at most one token in debt, and the waiting requests are paced
+        # at its rate rather than reserving tokens far past the deadline all at once. Like the wait for
+        # the semaphore, the wait for the requests queued before does not count against the deadline.
+        host = urlsplit(route).hostname
+        pacing = self._pacing.get(host)
+        if pacing is None:
+            pacing = self._pacing[host] = asyncio.Lock()
+        async with pacing:
+            if deadline is None:
+                deadline = time.monotonic() + rate_limiter.deadline
+            delay = rate_limiter.reserve(route, deadline)
+            if delay > 0:
+                await self.throttle(delay)
+        return deadline
+
+    async def _scheduled_send(self, method: str, route: str, kwargs: dict):
+        rate_limiter = Dispatch.rate_limiter
+        if rate_limiter is None:
+            return await self.send(method, route, kwargs)
+        deadline = None
+        attempt = 0
+        while True:
+            deadline = await self._reserve(rate_limiter, route, deadline)
+            response = await self.send(method, route, kwargs)
+            if response.status_code != 429:
+                return response
+            retry_after = response.headers.get("Retry-After")
+            delay = rate_limiter.rate_limited(route, attempt, deadline, retry_after)
+            if Dispatch.instrumentation is not None:
+                Dispatch.instrumentation.retried(route)
+            await self.throttle(delay)
+            attempt += 1
+
+    async def _parsed_request(self, method: str, route: str, **kwargs):
+        response = await self.raw_request(method, route, **kwargs)
+        return Dispatch.parse_response(response)
+
+    async def do_request(self, method: str, route: str, **kwargs):
+        single_flight = self.single_flight
+        key = None if single_flight is None else Dispatch.flight_key(method, route, kwargs)
+        if key is None:
+            return await self._parsed_request(method, route, **kwargs)
+        return await single_flight.do(key, self._parsed_request, method, route, **kwargs)
+
+    async def get_profile_attributes(self, uuid: str) -> Optional[Profile]:
+        """Retrieves the profile information given the users UUID.
+
+        Args:
+            uuid (UUID): The profile's UUID.
+
+        Returns:
+            Profile: The profile retrieved, or None if the profile was not found.
+
+        """
+        route = Dispatch.SESSION_SERVER + f"/session/minecraft/profile/{uuid}"
+        profile = await self.do_request("GET", route + "?unsigned=false")
+        if not isinstance(profile, dict):
+            return None
+        return Profile.from_response(profile)
+
+    async def get_uuid(self, username: str) -> Optional[str]:
+        """Gets the uuid of the given username.
+
+        Args:
+            username: The username to get the uuid of.
+
+        Returns:
+            str: The uuid of the username given, or None if no person with that name is found.
+
+        """
+        route = Dispatch.API_BASE + "/users/profiles/minecraft/"
+        response = await self.do_request("GET", route + username)
+        if not isinstance(response, dict):
+            return None
+        return response.get("id")
+
+    async def _post_names(self, chunk: list) -> list:
+        route = Dispatch.API_BASE + "/profiles/minecraft"
+        response = await self.do_request("POST", route, json=chunk)
+        if not isinstance(response, list):
+            return []
+        return response
+
+    async def _resolve_names(self, usernames: Iterable) -> dict:
+        """Resolves names to UUIDs, sending every 10 name chunk concurrently.
+
+        Returns:
+            dict: The lowercase names mapped to their UUIDs. Unknown names are left out.
+        """
+        names = list(dict.fromkeys(partition_identifiers(usernames).names))
+        chunks = MojangApi._chunk_usernames(names)
+        responses = await asyncio.gather(*[self._post_names(c) for c in chunks])
+        return {r.get("name").lower(): r.get("id") for response in responses for r in response}
+
+    async def get_uuids(self, usernames: Iterable) -> list:
+        """Attempts to get all UUIDS of the given profiles.
+
+        The names are split into chunks of 10, and every chunk is requested concurrently.
+
+        Args:
+            usernames (Iterable): An iterable of names.
+
+        Returns:
+            list: The UUID's associated with each name.
+
+        """
+        chunks = MojangApi._chunk_usernames(partition_identifiers(usernames).names)
+        responses = await asyncio.gather(*[self._post_names(chunk) for chunk in chunks])
+        return [r.get("id") for response in responses for r in response]
+
+    async def get_user(self, profiles: Union[str, Iterable]):
+        """Gets the specified profiles attributes.
+
+        Names are first resolved in batches of 10, then every profile is fetched concurrently.
+        Resolving a few hundred names therefore only takes a few round-trips.
+
+        Args:
+            profiles (Union[str, Iterable]): The profiles to retrieve from the API.
+
+        Returns:
+            Union[Profile, list]: The retrieved profiles.
+        """
+        if isinstance(profiles, str):
+            profiles = [
+                profiles,
+            ]
+        profiles = list(profiles)
+        identifiers = partition_identifiers(profiles)
+        resolved = await self._resolve_names(identifiers.names)
+        valid_uuids = set(identifiers.uuids)
+        uuids = [p if p in valid_uuids else resolved.get(p.lower()) if is_valid_name(p) else None for p in profiles]
+        retrieved_profiles = await asyncio.gather(*[self._get_optional_profile(u) for u in uuids])
+        return MojangApi._postprocess_profiles(list(retrieved_profiles))
+
+    async def _get_optional_profile(self, uuid: Optional[str]) -> Optional[Profile]:
+        if uuid is None:
+            return None
+        return await self.get_profile_attributes(uuid)
+
+    async def get_profile(self, profiles: Iterable):
+        """An alias for get_user.
+
+        Check the get_user method for extended documentation.
+        """
+        return await self.get_user(profiles)
+
+    async def get_blocked_servers(self) -> list:
+        """Retrieves a list of blocked server hashes.
+
+        Returns:
+            list: A list of blocked hashes.
+        """
+        route = Dispatch.SESSION_SERVER + "/blockedservers"
+        response = await self.raw_request("GET", route)
+        return response.content.decode().split()
+
+    async def get_blocked_server_index(self) -> BlockedServerIndex:
+        """Retrieves the blocked servers as an index that addresses can be checked against.
+
+        Returns:
+            BlockedServerIndex: The index of blocked hashes.
+        """
+        route = Dispatch.SESSION_SERVER + "/blockedservers"
+        response = await self.raw_request("GET", route)
+        return BlockedServerIndex.from_content(response.content)
+
+    async def get_statistics(self, metrics: Iterable) -> Statistics:
+        """Gets Mojang sales statistics.
+
+        Args:
+            metrics (Iterable): A list of valid metrics to query.
+
+        Returns:
+            Statistics: The returned statistics.
+
+        Raises:
+            ApiException: If you do not provide any metrics.
+            InvalidMetric: If you provided one or more invalid metrics.
+
+        """
+        if len(metrics) == 0:
+            raise ApiException("You must provide at least one metric!")
+        if isinstance(metrics, str):
+            metrics = [
+                metrics,
+            ]
+        for metric in metrics:
+            if metric not in Statistics.VALID_METRICS:
+                raise InvalidMetric(f"{metric} is not a valid metric!")
+        route = Dispatch.API_BASE + "/orders/statistics"
+        statistics = await self.do_request("POST", route, json={"metricKeys": list(metrics)})
+        return Statistics(statistics)
+
+    async def name_history(self, profile: Profile) -> Union[HistoryIndex, list]:
+        """Gets the profile's name history.
+
+        Args:
+            profile (Profile): The profile to get the name history of.
+
+        Returns:
+            HistoryIndex: One of the profile's names.
+            list: A list of the profile's old names.
+
+        """
+        route = Dispatch.API_BASE + "/user/profiles/{}/names".format(profile.uuid)
+        previous_names = await self.do_request("GET", route)
+        if len(previous_names) == 1:
+            return HistoryIndex(previous_names[0])
+        return [HistoryIndex(v) for v in previous_names]
+
+    async def _texture_bytes(self, texture_url: str) -> bytes:
+        texture = Skin.cache.get(texture_url[38:])
+        if texture is None:
+            if self.single_flight is None:
+                return await self._download_texture(texture_url)
+            texture = await self.single_flight.do(("texture", texture_url[38:]), self._download_texture, texture_url)
+        return texture
+
+    async def _download_texture(self, texture_url: str) -> bytes:
+        response = await self.raw_request("GET", texture_url)
+        if response.status_code != 200:
+            raise ResourceNotFound(f"The texture {texture_url} could not be downloaded.")
+        return response.content
+
+    async def get_textures(self, profile: Profile) -> tuple:
+        """Downloads the profile's skin and cape concurrently, unless they are already cached.
+
+        Args:
+            profile (Profile): The profile to get the textures of.
+
+        Returns:
+            tuple: The profile's Skin and Cape, either of which is None if the profile does not have one.
+        """
+        skin_url, model_type = profile.skin_attributes()
+        urls = [u for u in (skin_url, profile.cape_url()) if u is not None]
+        textures = dict(zip(urls, await asyncio.gather(*[self._texture_bytes(u) for u in urls])))
+        skin = None if skin_url is None else Skin(skin_url, model_type, textures[skin_url])
+        cape = None if profile.cape_url() is None else Cape(profile.cape_url(), textures[profile.cape_url()])
+        return skin, cape
@@ -1,15 +1,60 @@
+import time
 import urllib
+import threading
 import webbrowser
 
+from typing import Optional
+from datetime import datetime, timezone
+
 from .dispatcher import Dispatch
 from .exceptions import AuthenticationException
 
 
-class MicrosoftOAuth:  # Add refresh token
+class Token:
+    """A token of the authentication chain, along with when it expires.
+
+    Attributes:
+        value (str): The token itself.
+        expires_at (float): The unix time the token expires at.
+        refresh_token (str): The refresh token issued along with a Microsoft token, if any.
+        user_hash (str): The user hash issued along with an Xbox Live token, if any.
+
+    """
+
+    __slots__ = ("value", "expires_at", "refresh_token", "user_hash")
+
+    def __init__(
+        self,
+        value: str,
+        expires_at: float,
+        refresh_token: Optional[str] = None,
+        user_hash: Optional[str] = None,
+    ):
+        self.value = value
+        self.expires_at = expires_at
+        self.refresh_token = refresh_token
+        self.user_hash = user_hash
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} expires_at={self.expires_at}>"
+
+    def is_valid(self, leeway: float = 0.0) -> bool:
+        return self.value is not None and time.time() + leeway < self.expires_at
+
+    @staticmethod
+    def _parse_not_after(not_after: str) -> float:
+        # Xbox Live timestamps have 7 fractional digits, which strptime cannot parse.
+        parsed = datetime.strptime(not_after[:19], "%Y-%m-%dT%H:%M:%S")
+        return parsed.replace(tzinfo=timezone.utc).timestamp()
+
+
+class MicrosoftOAuth:
     AUTH_TOKEN_URL = "https://login.live.com/oauth20_token.srf"
 
     AUTH_CODE_URL = "https://login.live.com/oauth20_authorize.srf"
 
+    SCOPE = "XboxLive.signin offline_access"
+
     def __init__(self, client_id: str, redirect_uri: str = "https://localhost"):
         self.client_id = client_id
         self.redirect_uri = redirect_uri
@@ -19,7 +64,7 @@ class MicrosoftOAuth:  # Add refresh token
             "client_id": self.client_id,
             "response_type": "code",
             "redirect_uri": self.redirect_uri,
-            "scope": "XboxLive.signin offline_access",
+            "scope": self.SCOPE,
         }
         if state is not None:
             url_query_arguments["state"] = state
@@ -29,25 +74,40 @@ class MicrosoftOAuth:  # Add refresh token
             webbrowser.open(oauth_code_url)
         return oauth_code_url
 
-    def preform_oauth(self, code: str, refresh_token: bool = False):
-        payload_arguments = {
-            "client_id": self.client_id,
-            "code": code,
-            "redirect_uri": self.redirect_uri,
-            "grant_type": "authorization_code",
-        }
+    def _token_request(self, payload_arguments: dict) -> Token:
         headers = {"Content-Type": "application/x-www-form-urlencoded"}
         response = Dispatch.do_request(
             "POST", self.AUTH_TOKEN_URL, data=payload_arguments, headers=headers
         )
         if not isinstance(response, dict):
             raise AuthenticationException(response.json().get("error_description"))
+        expires_at = time.time() + int(response.get("expires_in", 3600))
+        return Token(response.get("access_token"), expires_at, refresh_token=response.get("refresh_token"))
+
+    def request_token(self, code: str) -> Token:
+        payload_arguments = {
+            "client_id": self.client_id,
+            "code": code,
+            "redirect_uri": self.redirect_uri,
+            "grant_type": "authorization_code",
+        }
+        return self._token_request(payload_arguments)
+
+    def preform_oauth(self, code: str, refresh_token: bool = False):
+        token = self.request_token(code)
         if not refresh_token:
-            return response.get("access_token")
-        return response.get("access_token"), response.get("refresh_token")
+            return token.value
+        return token.value, token.refresh_token
 
-    def refresh_token(self, refresh_token: str):
-        pass
+    def refresh_token(self, refresh_token: str) -> Token:
+        payload_arguments = {
+            "client_id": self.client_id,
+            "refresh_token": refresh_token,
+            "redirect_uri": self.redirect_uri,
+            "grant_type": "refresh_token",
+            "scope": self.SCOPE,
+        }
+        return self._token_request(payload_arguments)
 
 
 class MinecraftAuthentication:
@@ -58,7 +118,7 @@ class MinecraftAuthentication:
     MINECRAFT_URL = "https://api.minecraftservices.com/authentication/login_with_xbox"
 
     @classmethod
-    def get_xbl_token(cls, access_token: str):
+    def request_xbl_token(cls, access_token: str) -> Token:
         payload_arguments = {
             "Properties": {
                 "AuthMethod": "RPS",
@@ -71,10 +131,14 @@ class MinecraftAuthentication:
         response = Dispatch.do_request("POST", cls.XBL_URL, json=payload_arguments)
         if not isinstance(response, dict):
             raise AuthenticationException("Invalid Access Token was provided.")
-        return response.get("Token")
+        return Token(response.get("Token"), Token._parse_not_after(response.get("NotAfter")))
 
     @classmethod
-    def get_xsts_token(cls, user_token: str):
+    def get_xbl_token(cls, access_token: str):
+        return cls.request_xbl_token(access_token).value
+
+    @classmethod
+    def request_xsts_token(cls, user_token: str) -> Token:
         payload_arguments = {
             "Properties": {"SandboxId": "RETAIL", "UserTokens": [user_token]},
             "RelyingParty": "rp://api.minecraftservices.com/",
@@ -87,12 +151,133 @@ class MinecraftAuthentication:
             raise AuthenticationException(
                 f"XSTS returned error code {response.get('XErr')}!"
             )
-        return response.get("Token"), response["DisplayClaims"]["xui"][0]["uhs"]
+        user_hash = response["DisplayClaims"]["xui"][0]["uhs"]
+        expires_at = Token._parse_not_after(response.get("NotAfter"))
+        return Token(response.get("Token"), expires_at, user_hash=user_hash)
 
     @classmethod
-    def get_access_token(cls, xsts_token: str, uhs: int):
+    def get_xsts_token(cls, user_token: str):
+        token = cls.request_xsts_token(user_token)
+        return token.value, token.user_hash
+
+    @classmethod
+    def request_access_token(cls, xsts_token: str, uhs: int) -> Token:
         payload = {"identityToken": f"XBL3.0 x={uhs};{xsts_token}"}
         response = Dispatch.do_request("POST", cls.MINECRAFT_URL, json=payload)
         if not isinstance(response, dict):
             raise AuthenticationException(response.json().get("error"))
-        return response.get("access_token")
+        return Token(response.get("access_token"), time.time() + int(response.get("expires_in", 86400)))
+
+    @classmethod
+    def get_access_token(cls, xsts_token: str, uhs: int):
+        return cls.request_access_token(xsts_token, uhs).value
+
+
+class _Credentials:
+    __slots__ = ("microsoft", "xbl", "xsts", "minecraft", "lock")
+
+    def __init__(self, microsoft: Optional[Token] = None):
+        self.microsoft = microsoft
+        self.xbl = None
+        self.xsts = None
+        self.minecraft = None
+        self.lock = threading.Lock()
+
+
+class CredentialManager:
+    """Caches every tier of the Microsoft authentication chain for many accounts.
+
+    Each account keeps its Microsoft, Xbox Live, XSTS and Minecraft tokens along with their
+    expiry. Asking for an access token only walks the chain from the first tier that is about
+    to expire, and a Microsoft token is renewed with its refresh token rather than a new login.
+    Concurrent requests for the same account wait for a single refresh instead of each running one.
+
+    Attributes:
+        oauth (MicrosoftOAuth): The OAuth client the accounts are logged in with.
+        leeway (float): How many seconds before its expiry a token is already refreshed.
+
+    """
+
+    def __init__(self, client_id: str, redirect_uri: str = "https://localhost", leeway: float = 300.0):
+        self.oauth = MicrosoftOAuth(client_id, redirect_uri)
+        self.leeway = leeway
+        self._accounts = {}
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} accounts={len(self._accounts)}>"
+
+    def __contains__(self, key: str):
+        return key in self._accounts
+
+    def _get_credentials(self, key: str) -> _Credentials:
+        credentials = self._accounts.get(key)
+        if credentials is None:
+            raise AuthenticationException(f"No credentials are stored for {key}.")
+        return credentials
+
+    def add_refresh_token(self, key: str, refresh_token: str):
+        """Stores an account by its Microsoft refresh token, without making any request.
+
+        Args:
+            key (str): The name the account is stored under.
+            refresh_token (str): The account's Microsoft refresh token.
+        """
+        with self._lock:
+            self._accounts[key] = _Credentials(Token(None, 0.0, refresh_token=refresh_token))
+
+    def login(self, key: str, code: str) -> str:
+        """Logs an account in with an OAuth authorization code, and stores its tokens.
+
+        Args:
+            key (str): The name the account is stored under.
+            code (str): The authorization code from the redirect of MicrosoftOAuth.build_url.
+
+        Returns:
+            str: The account's Minecraft access token.
+        """
+        credentials = _Credentials(self.oauth.request_token(code))
+        with self._lock:
+            self._accounts[key] = credentials
+        return self.get_access_token(key)
+
+    def get_access_token(self, key: str) -> str:
+        """Gets a valid Minecraft access token for an account, refreshing only the expired tiers.
+
+        Args:
+            key (str): The name the account is stored under.
+
+        Returns:
+            str: The account's Minecraft access token.
+
+        Raises:
+            AuthenticationException: If the account is unknown, or a tier could not be refreshed.
+        """
+        credentials = self._get_credentials(key)
+        with credentials.lock:
+            if credentials.minecraft is not None and credentials.minecraft.is_valid(self.leeway):
+                return credentials.minecraft.value
+            if credentials.xsts is None or not credentials.xsts.is_valid(self.leeway):
+                if credentials.xbl is None or not credentials.xbl.is_valid(self.leeway):
+                    microsoft = credentials.microsoft
+                    if not microsoft.is_valid(self.leeway):
+                        if microsoft.refresh_token is None:
+                            raise AuthenticationException(f"The Microsoft token of {key} cannot be refreshed.")
+                        refreshed = self.oauth.refresh_token(microsoft.refresh_token)
+                        if refreshed.refresh_token is None:
+                            refreshed.refresh_token = microsoft.refresh_token
+                        credentials.microsoft = microsoft = refreshed
+                    credentials.xbl = MinecraftAuthentication.request_xbl_token(microsoft.value)
+                credentials.xsts = MinecraftAuthentication.request_xsts_token(credentials.xbl.value)
+            credentials.minecraft = MinecraftAuthentication.request_access_token(
+                credentials.xsts.value, credentials.xsts.user_hash
+            )
+            return credentials.minecraft.value
+
+    def get_refresh_token(self, key: str) -> Optional[str]:
+        """Gets the latest Microsoft refresh token of an account, so it can be persisted."""
+        return self._get_credentials(key).microsoft.refresh_token
+
+    def remove(self, key: str):
+        with self._lock:
+            self._accounts.pop(key, None)
@@ -0,0 +1,142 @@
+import time
+import queue
+import threading
+
+from typing import Optional
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from .dispatcher import Dispatch
+from .utils.checks import is_valid_name
+
+
+class UuidBatcher:
+    """Packs single name lookups made from many threads into batched requests.
+
+    Every name is held for at most window seconds, during which the names asked for by other
+    threads are collected with it. As soon as batch_size distinct names are pending, or the window
+    of the oldest name ran out, they are resolved with a single POST to /profiles/minecraft, and
+    every caller receives its own UUID. A name asked for twice in one window is only sent once.
+
+    Attributes:
+        window (float): How many seconds a name waits for others to be batched with.
+        batch_size (int): The maximum amount of names per request, Mojang accepts 10.
+
+    """
+
+    def __init__(self, window: float = 0.005, batch_size: int = 10, max_workers: int = 4):
+        self.window = window
+        self.batch_size = batch_size
+        self.requests = 0
+        self.lookups = 0
+        self._pending = queue.Queue()
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix="py4mc-batcher")
+        self._thread = None
+        self._closed = False
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} window={self.window} requests={self.requests} lookups={self.lookups}>"
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def submit(self, username: str) -> Future:
+        """Queues a name to be resolved with the next batch.
+
+        Args:
+            username (str): The name to resolve.
+
+        Returns:
+            Future: Resolves to the UUID of the name, or None if no player has that name.
+
+        Raises:
+            RuntimeError: If the batcher was closed.
+        """
+        future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Cannot submit names to a closed batcher.")
+            if not is_valid_name(username):
+                future.set_result(None)
+                return future
+            self.lookups += 1
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._collect, name="py4mc-batcher", daemon=True)
+                self._thread.start()
+            # Queued under the lock, so no name can end up behind the sentinel close puts.
+            self._pending.put((username.lower(), future))
+        return future
+
+    def get_uuid(self, username: str, timeout: Optional[float] = None) -> Optional[str]:
+        """Resolves a name along with the names other threads are resolving at the same time.
+
+        Args:
+            username (str): The name to resolve.
+            timeout (float): How many seconds to wait for the result at most.
+
+        Returns:
+            str: The uuid of the name, or None if no player has that name.
+        """
+        return self.submit(username).result(timeout)
+
+    def _collect(self):
+        while True:
+            item = self._pending.get()
+            if item is None:
+                return
+            batch = {item[0]: [item[1]]}
+            deadline = time.monotonic() + self.window
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._pending.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    # Send what was collected first, the sentinel stops the loop afterwards.
+                    self._pending.put(None)
+                    break
+                batch.setdefault(item[0], []).append(item[1])
+            self.requests += 1
+            try:
+                self._executor.submit(self._resolve, batch)
+            except BaseException as exception:
+                # The futures would never resolve otherwise, and their callers would wait forever.
+                self._fail(batch, exception)
+
+    @staticmethod
+    def _fail(batch: dict, exception: BaseException):
+        for futures in batch.values():
+            for future in futures:
+                future.set_exception(exception)
+
+    @classmethod
+    def _resolve(cls, batch: dict):
+        try:
+            route = Dispatch.API_BASE + "/profiles/minecraft"
+            response = Dispatch.do_request("POST", route, json=list(batch))
+            found = {}
+            if isinstance(response, list):
+                found = {r.get("name").lower(): r.get("id") for r in response}
+        except BaseException as exception:
+            cls._fail(batch, exception)
+            return
+        for name, futures in batch.items():
+            for future in futures:
+                future.set_result(found.get(name))
+
+    def close(self):
+        """Sends the names that are still pending, and stops the batcher. It cannot be used afterwards."""
+        with self._lock:
+            self._closed = True
+            thread, self._thread = self._thread, None
+            if thread is not None:
+                self._pending.put(None)
+        if thread is not None:
+            thread.join()
+        self._executor.shutdown(wait=True)
@@ -0,0 +1,306 @@
+import os
+import time
+import shelve
+import threading
+
+from typing import Optional
+from collections import OrderedDict
+
+MISSING = object()
+
+
+class MemoryCache:
+    """An in-memory cache with per-entry TTLs and a least recently used size bound.
+
+    Attributes:
+        max_size (int): The maximum amount of entries, the least recently used entry is evicted past it.
+        hits (int): How many lookups found a fresh entry.
+        misses (int): How many lookups found nothing, or an expired entry.
+
+    """
+
+    def __init__(self, max_size: int = 10000):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} size={len(self)} max_size={self.max_size}>"
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key: str, default=MISSING):
+        """Gets a fresh entry from the cache.
+
+        Args:
+            key (str): The key of the entry.
+            default: What to return when there is no fresh entry.
+
+        Returns:
+            The cached value, or default if there is no fresh entry.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or (entry[0] is not None and entry[0] < time.time()):
+                if entry is not None:
+                    self._evict(key)
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: str, value, ttl: Optional[float] = None):
+        """Stores a value, evicting the least recently used entry if the cache is full.
+
+        Args:
+            key (str): The key of the entry.
+            value: The value to store. None is a valid value, and is used for negative caching.
+            ttl (float): How many seconds the entry stays fresh, forever if None.
+        """
+        expires_at = None if ttl is None else time.time() + ttl
+        with self._lock:
+            self._store(key, (expires_at, value))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._evict(next(iter(self._entries)))
+
+    def delete(self, key: str):
+        with self._lock:
+            if key in self._entries:
+                self._evict(key)
+
+    def clear(self):
+        with self._lock:
+            for key in list(self._entries):
+                self._evict(key)
+
+    def _store(self, key: str, entry: tuple):
+        self._entries[key] = entry
+
+    def _evict(self, key: str):
+        del self._entries[key]
+
+    @property
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self),
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+
+class FileCache(MemoryCache):
+    """A cache persisted to a shelve database, so entries survive process restarts.
+
+    Entries are read from disk lazily and the recency order is only tracked for the lifetime of
+    the process, the order of a reopened cache starts from the order the keys are stored in.
+
+    Attributes:
+        path (str): The path of the shelve database.
+
+    """
+
+    def __init__(self, path: str, max_size: int = 100000):
+        super().__init__(max_size)
+        self.path = path
+        self._shelf = shelve.open(path)
+        self._entries = _ShelfIndex(self._shelf)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _store(self, key: str, entry: tuple):
+        self._shelf[key] = entry
+        self._entries.mark(key)
+
+    def _evict(self, key: str):
+        del self._shelf[key]
+        self._entries.forget(key)
+
+    def sync(self):
+        with self._lock:
+            self._shelf.sync()
+
+    def close(self):
+        with self._lock:
+            self._shelf.close()
+
+
+class _ShelfIndex:
+    """Keeps the recency order of the keys of a shelf, and reads the entries through to disk."""
+
+    def __init__(self, shelf):
+        self._shelf = shelf
+        self._order = OrderedDict.fromkeys(shelf.keys())
+
+    def __len__(self):
+        return len(self._order)
+
+    def __iter__(self):
+        return iter(self._order)
+
+    def __contains__(self, key: str):
+        return key in self._order
+
+    def get(self, key: str):
+        if key not in self._order:
+            return None
+        return self._shelf.get(key)
+
+    def move_to_end(self, key: str):
+        self._order.move_to_end(key)
+
+    def mark(self, key: str):
+        self._order[key] = None
+
+    def forget(self, key: str):
+        self._order.pop(key, None)
+
+
+class LookupCache:
+    """Caches the results of UUID, profile and name history lookups.
+
+    Every type of data has its own TTL, and lookups that found nothing are cached as well for
+    negative_ttl seconds, so unknown names are not requested over and over again.
+
+    Attributes:
+        backend (MemoryCache): Where the entries are stored, a MemoryCache or a FileCache.
+        ttls (dict): The kinds of data mapped to how many seconds they stay fresh.
+        negative_ttl (float): How many seconds a lookup that found nothing stays fresh.
+        counters (dict): The hits and misses of every kind of data.
+
+    """
+
+    DEFAULT_TTLS = {
+        "uuid": 3600.0,
+        "profile": 60.0,
+        "name_history": 3600.0,
+    }
+
+    def __init__(
+        self,
+        backend: Optional[MemoryCache] = None,
+        ttls: Optional[dict] = None,
+        negative_ttl: float = 300.0,
+    ):
+        self.backend = backend if backend is not None else MemoryCache()
+        self.ttls = {**self.DEFAULT_TTLS, **(ttls or {})}
+        self.negative_ttl = negative_ttl
+        self.counters = {kind: {"hits": 0, "misses": 0} for kind in self.ttls}
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} backend={self.backend!r}>"
+
+    def get(self, kind: str, key: str):
+        """Gets a cached lookup.
+
+        Args:
+            kind (str): The kind of data, one of the keys of ttls.
+            key (str): The lowercase name or UUID that was looked up.
+
+        Returns:
+            The cached result, which is None for negative entries, or MISSING if nothing is cached.
+        """
+        value = self.backend.get(f"{kind}:{key}")
+        with self._lock:
+            counter = self.counters.setdefault(kind, {"hits": 0, "misses": 0})
+            counter["misses" if value is MISSING else "hits"] += 1
+        return value
+
+    def set(self, kind: str, key: str, value):
+        """Caches a lookup, a value of None is cached as a negative entry."""
+        ttl = self.negative_ttl if value is None else self.ttls.get(kind)
+        self.backend.set(f"{kind}:{key}", value, ttl)
+
+    def delete(self, kind: str, key: str):
+        self.backend.delete(f"{kind}:{key}")
+
+    def clear(self):
+        self.backend.clear()
+
+    @property
+    def stats(self) -> dict:
+        stats = {}
+        for kind, counter in self.counters.items():
+            lookups = counter["hits"] + counter["misses"]
+            stats[kind] = {**counter, "hit_ratio": counter["hits"] / lookups if lookups else 0.0}
+        return stats
+
+
+class TextureCache:
+    """A content addressed cache of texture bytes, keyed by the texture's hash.
+
+    Textures are kept in a bounded in-memory cache, and optionally on disk, so a cape shared by
+    thousands of players is only ever downloaded once. Textures never change for a given hash,
+    which is why the entries do not expire.
+
+    Attributes:
+        directory (str): The directory textures are persisted to, or None to only keep them in memory.
+        memory (MemoryCache): The in-memory layer of the cache.
+
+    """
+
+    def __init__(self, directory: Optional[str] = None, max_size: int = 2048):
+        self.directory = directory
+        self.memory = MemoryCache(max_size)
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} directory={self.directory} memory={self.memory!r}>"
+
+    def __contains__(self, texture_hash: str):
+        if self.memory.get(texture_hash) is not MISSING:
+            return True
+        return self.directory is not None and os.path.exists(self._path(texture_hash))
+
+    def _path(self, texture_hash: str) -> str:
+        texture_hash = os.path.basename(texture_hash)
+        return os.path.join(self.directory, texture_hash[:2], texture_hash)
+
+    def get(self, texture_hash: str) -> Optional[bytes]:
+        """Gets the bytes of a texture.
+
+        Args:
+            texture_hash (str): The texture's hash.
+
+        Returns:
+            bytes: The texture, or None if it is not cached.
+        """
+        texture = self.memory.get(texture_hash)
+        if texture is not MISSING:
+            return texture
+        if self.directory is None:
+            return None
+        try:
+            with open(self._path(texture_hash), "rb") as texture_file:
+                texture = texture_file.read()
+        except FileNotFoundError:
+            return None
+        self.memory.set(texture_hash, texture)
+        return texture
+
+    def set(self, texture_hash: str, texture: bytes):
+        """Stores the bytes of a texture, in memory and on disk."""
+        self.memory.set(texture_hash, texture)
+        if self.directory is None:
+            return
+        path = self._path(texture_hash)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temporary_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(temporary_path, "wb") as texture_file:
+            texture_file.write(texture)
+        os.replace(temporary_path, path)
+
+    def clear(self):
+        self.memory.clear()
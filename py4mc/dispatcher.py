@@ -1,10 +1,17 @@
-import requests
+import json
+import time
 
-from typing import Union
+from typing import Union, Optional, Hashable
+from urllib.parse import urlsplit
 from requests import Response
 
-from .utils.checks import is_valid_json
-from .exceptions import InternalServerException, ApiException
+from .transport import Transport, NETWORK_ERRORS
+from .ratelimit import RateLimiter
+from .response import ApiResponse
+from .singleflight import SingleFlight
+from .metrics import Instrumentation
+from .resilience import RetryPolicy, CircuitBreaker
+from .exceptions import InternalServerException, ApiException, Ratelimited, NetworkException, CircuitOpen
 
 
 class Dispatch:
@@ -12,14 +19,228 @@ class Dispatch:
     SESSION_SERVER = "https://sessionserver.mojang.com"
     SERVICE_URL = "https://api.minecraftservices.com"
 
+    transport = None
+
+    rate_limiter = RateLimiter()
+
+    single_flight = SingleFlight()
+
+    instrumentation = Instrumentation()
+
+    retry_policy = RetryPolicy()
+
+    circuit_breaker = CircuitBreaker()
+
+    NAME_BATCH_ROUTES = ("/profiles/minecraft",)
+
+    IDEMPOTENT_ROUTES = NAME_BATCH_ROUTES + ("/orders/statistics",)
+
     @classmethod
-    def do_request(cls, method: str, route: str, **kwargs):
+    def get_transport(cls):
+        if cls.transport is None:
+            cls.transport = Transport()
+        return cls.transport
+
+    @classmethod
+    def set_transport(cls, transport):
+        """Replaces the transport every request is sent through.
+
+        Passing None resets the Dispatch to a fresh pooled Transport on the next request.
+        The previous transport is returned so it can be restored or closed by the caller.
+        """
+        previous, cls.transport = cls.transport, transport
+        return previous
+
+    @classmethod
+    def set_rate_limiter(cls, rate_limiter):
+        """Replaces the rate limiter requests are scheduled with.
+
+        Passing None disables client side rate limiting, in which case a 429 raises Ratelimited straight away.
+        The previous rate limiter is returned so it can be restored by the caller.
+        """
+        previous, cls.rate_limiter = cls.rate_limiter, rate_limiter
+        return previous
+
+    @classmethod
+    def set_single_flight(cls, single_flight):
+        """Replaces the SingleFlight identical in-flight requests are coalesced with.
+
+        Passing None disables coalescing, so every call sends its own request.
+        The previous SingleFlight is returned so it can be restored by the caller.
+        """
+        previous, cls.single_flight = cls.single_flight, single_flight
+        return previous
+
+    @classmethod
+    def set_instrumentation(cls, instrumentation):
+        """Replaces the Instrumentation every request is recorded by.
+
+        Passing None disables metrics and request hooks.
+        The previous Instrumentation is returned so it can be restored by the caller.
+        """
+        previous, cls.instrumentation = cls.instrumentation, instrumentation
+        return previous
+
+    @classmethod
+    def set_retry_policy(cls, retry_policy):
+        """Replaces the RetryPolicy failed idempotent requests are retried with.
+
+        Passing None disables retries, so network and server errors are raised straight away.
+        The previous RetryPolicy is returned so it can be restored by the caller.
+        """
+        previous, cls.retry_policy = cls.retry_policy, retry_policy
+        return previous
+
+    @classmethod
+    def set_circuit_breaker(cls, circuit_breaker):
+        """Replaces the CircuitBreaker requests to failing hosts are refused with.
+
+        Passing None disables it, so every request is sent however often its host failed.
+        The previous CircuitBreaker is returned so it can be restored by the caller.
+        """
+        previous, cls.circuit_breaker = cls.circuit_breaker, circuit_breaker
+        return previous
+
+    @classmethod
+    def is_idempotent(cls, method: str, route: str) -> bool:
+        """Checks if sending a request twice has the same effect as sending it once, so it may be retried.
+
+        Every GET is, and so are the POSTs that only look data up, such as resolving a batch of usernames.
+        """
+        method = method.upper()
+        return method in ("GET", "HEAD") or method == "POST" and urlsplit(route).path.endswith(cls.IDEMPOTENT_ROUTES)
+
+    @classmethod
+    def flight_key(cls, method: str, route: str, kwargs: dict) -> Optional[Hashable]:
+        """Gets the key identical requests are coalesced by, or None if the request must not be coalesced.
+
+        Only idempotent requests are coalesced: every GET, and the POSTs resolving a batch of
+        usernames. The names of a batch are compared case insensitively and regardless of order,
+        as that does not change what Mojang responds with.
+        """
+        headers = tuple(sorted((kwargs.get("headers") or {}).items()))
+        params = kwargs.get("params")
+        params = tuple(sorted(params.items())) if isinstance(params, dict) else params
+        if method.upper() == "GET" and kwargs.get("data") is None and kwargs.get("json") is None:
+            return "GET", route, headers, params
+        names = kwargs.get("json")
+        if method.upper() == "POST" and route.endswith(cls.NAME_BATCH_ROUTES) and isinstance(names, list):
+            return "POST", route, headers, params, json.dumps(sorted(str(n).lower() for n in names))
+        return None
+
+    @staticmethod
+    def prepare_headers(kwargs: dict) -> dict:
         if kwargs.get("headers") is None:
             kwargs["headers"] = {"Content-Type": "application/json"}
         elif kwargs["headers"].get("Content-Type") is None:
             kwargs["headers"].update({"Content-Type": "application/json"})
-        response = requests.request(method, route, **kwargs)
-        return cls.parse_response(response)
+        return kwargs
+
+    @classmethod
+    def send(cls, method: str, route: str, kwargs: dict) -> Response:
+        """Sends a request once, through the circuit breaker of its host.
+
+        Raises:
+            CircuitOpen: If the host is failing, in which case the request is not sent.
+            NetworkException: If the request could not be completed.
+        """
+        circuit_breaker = cls.circuit_breaker
+        if circuit_breaker is not None:
+            token = circuit_breaker.before(route)
+        response = None
+        try:
+            response = cls._transmit(method, route, kwargs)
+            return response
+        except NETWORK_ERRORS as exception:
+            raise NetworkException(f"{method} {route} failed: {exception}") from exception
+        finally:
+            if circuit_breaker is not None:
+                circuit_breaker.record(route, response is not None and response.status_code < 500, token)
+
+    @classmethod
+    def _transmit(cls, method: str, route: str, kwargs: dict) -> Response:
+        instrumentation = cls.instrumentation
+        if instrumentation is None:
+            return cls.get_transport().request(method, route, **kwargs)
+        started = instrumentation.started(method, route, kwargs)
+        response = None
+        try:
+            response = cls.get_transport().request(method, route, **kwargs)
+            return response
+        finally:
+            instrumentation.finished(method, route, kwargs, response, started)
+
+    @classmethod
+    def raw_request(cls, method: str, route: str, **kwargs) -> Response:
+        """Sends a request, retrying it on network and server errors if it is idempotent.
+
+        Once the retries run out, the last server error is returned and the last network error is raised.
+        A CircuitOpen is never retried, since the host is known to be failing.
+        """
+        cls.prepare_headers(kwargs)
+        retry_policy = cls.retry_policy if cls.is_idempotent(method, route) else None
+        attempt = 0
+        while True:
+            try:
+                response = cls.scheduled_send(method, route, kwargs)
+            except CircuitOpen:
+                raise
+            except NetworkException:
+                if retry_policy is None or not retry_policy.should_retry(attempt):
+                    raise
+            else:
+                if retry_policy is None or not retry_policy.should_retry(attempt, response.status_code):
+                    return response
+            if cls.instrumentation is not None:
+                cls.instrumentation.retried(route)
+            cls.throttle(retry_policy.delay(attempt))
+            attempt += 1
+
+    @classmethod
+    def scheduled_send(cls, method: str, route: str, kwargs: dict) -> Response:
+        """Sends a request as soon as the rate limiter allows, waiting out any 429 until its deadline."""
+        rate_limiter = cls.rate_limiter
+        if rate_limiter is None:
+            return cls.send(method, route, kwargs)
+        deadline = time.monotonic() + rate_limiter.deadline
+        attempt = 0
+        while True:
+            delay = rate_limiter.reserve(route, deadline)
+            if delay > 0:
+                cls.throttle(delay)
+            response = cls.send(method, route, kwargs)
+            if response.status_code != 429:
+                return response
+            retry_after = response.headers.get("Retry-After")
+            delay = rate_limiter.rate_limited(route, attempt, deadline, retry_after)
+            if cls.instrumentation is not None:
+                cls.instrumentation.retried(route)
+            cls.throttle(delay)
+            attempt += 1
+
+    @classmethod
+    def throttle(cls, delay: float):
+        if cls.instrumentation is not None:
+            cls.instrumentation.waited(delay)
+        time.sleep(delay)
+
+    @classmethod
+    def request(cls, method: str, route: str, **kwargs) -> ApiResponse:
+        response = cls.raw_request(method, route, **kwargs)
+        return ApiResponse.from_response(response)
+
+    @classmethod
+    def do_request(cls, method: str, route: str, **kwargs):
+        """Sends a request and parses its response.
+
+        Identical requests that are already in flight are not sent again, every caller waits for
+        the one request and receives the same parsed payload, so it must not be mutated.
+        """
+        single_flight = cls.single_flight
+        key = None if single_flight is None else cls.flight_key(method, route, kwargs)
+        if key is None:
+            return cls.parse_response(cls.request(method, route, **kwargs))
+        return single_flight.do(key, lambda: cls.parse_response(cls.request(method, route, **kwargs)))
 
     @staticmethod
     def _find_problems(response: dict) -> bool:
@@ -33,15 +254,18 @@ class Dispatch:
         return False
 
     @classmethod
-    def parse_response(cls, response: Response) -> Union[bool, dict, list]:
+    def parse_response(cls, response: Union[Response, ApiResponse]) -> Union[ApiResponse, dict, list]:
+        if not isinstance(response, ApiResponse):
+            response = ApiResponse.from_response(response)
         if response.status_code == 200:
-            if is_valid_json(response.text):
-                if isinstance(response.json(), list):
-                    return response.json()
-                elif not cls._find_problems(response.json()):
-                    return response.json()
-            else:
-                return response
+            payload = response.payload
+            if isinstance(payload, list):
+                return payload
+            elif isinstance(payload, dict) and not cls._find_problems(payload):
+                return payload
+            return response
+        elif response.status_code == 429:
+            raise Ratelimited("The request was rate limited.")
         elif response.status_code >= 500:
             raise InternalServerException(
                 "A status code greater than 500 was received."
@@ -24,3 +24,11 @@ class InvalidMetric(ApiException):
 
 class AuthenticationException(ApiException):
     pass
+
+
+class NetworkException(ApiException):
+    pass
+
+
+class CircuitOpen(NetworkException):
+    pass
@@ -0,0 +1,188 @@
+import os
+import csv
+
+from typing import Optional
+from collections.abc import Iterable
+
+from .types.profile import Profile
+from .utils.parsers import json_dumps
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # pragma: no cover - depends on the environment
+    pyarrow = None
+
+COLUMNS = ("uuid", "username", "timestamp", "skin_url", "skin_model", "cape_url")
+
+FORMATS = {".ndjson": "ndjson", ".jsonl": "ndjson", ".csv": "csv", ".parquet": "parquet"}
+
+
+def profile_row(profile: Profile) -> tuple:
+    """Gets the exported fields of a profile, in the order of COLUMNS.
+
+    The timestamp is kept in milliseconds, exactly as the sessionserver sent it.
+    """
+    return (
+        profile.uuid.hex,
+        profile.username,
+        profile._timestamp,
+        profile._skin_url,
+        profile._skin_model,
+        profile._cape_url,
+    )
+
+
+class _NdjsonWriter:
+    def __init__(self, path: str):
+        self._file = open(path, "wb")
+
+    def write(self, rows: list):
+        self._file.write(b"".join(json_dumps(dict(zip(COLUMNS, r))) + b"\n" for r in rows))
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+class _CsvWriter:
+    def __init__(self, path: str):
+        self._file = open(path, "w", newline="", encoding="utf-8")
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(COLUMNS)
+
+    def write(self, rows: list):
+        self._writer.writerows(rows)
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+class _ParquetWriter:
+    def __init__(self, path: str):
+        if pyarrow is None:
+            raise ImportError("pyarrow is required to export profiles to Parquet.")
+        self._schema = pyarrow.schema(
+            [
+                ("uuid", pyarrow.string()),
+                ("username", pyarrow.string()),
+                ("timestamp", pyarrow.int64()),
+                ("skin_url", pyarrow.string()),
+                ("skin_model", pyarrow.string()),
+                ("cape_url", pyarrow.string()),
+            ]
+        )
+        self._writer = pyarrow.parquet.ParquetWriter(path, self._schema)
+
+    def write(self, rows: list):
+        # Every batch becomes one row group, so the file is readable up to the last flush.
+        columns = [pyarrow.array(column, type=field.type) for column, field in zip(zip(*rows), self._schema)]
+        self._writer.write_table(pyarrow.Table.from_arrays(columns, schema=self._schema))
+
+    def close(self):
+        self._writer.close()
+
+
+WRITERS = {"ndjson": _NdjsonWriter, "csv": _CsvWriter, "parquet": _ParquetWriter}
+
+
+class ProfileExporter:
+    """Streams profiles to an NDJSON, CSV or Parquet file in bounded batches.
+
+    Profiles are buffered until batch_size of them are pending, then written and flushed, so
+    memory stays bounded no matter how many profiles are exported. Profiles that were not
+    found, which the bulk lookups return as None, and lookups that failed, which iter_profiles
+    yields as exceptions, are counted but not written.
+
+    Attributes:
+        path (str): The file the profiles are written to.
+        format (str): One of "ndjson", "csv" or "parquet", inferred from the extension by default.
+        batch_size (int): How many profiles are buffered before they are written.
+        written (int): How many profiles were written so far.
+        missing (int): How many profiles were None.
+        failed (int): How many lookups failed.
+
+    """
+
+    def __init__(self, path: str, format: Optional[str] = None, batch_size: int = 10000):
+        if format is None:
+            format = FORMATS.get(os.path.splitext(path)[1].lower())
+        if format not in WRITERS:
+            raise ValueError(f"Cannot export to {path!r}, pass a format out of {', '.join(WRITERS)}.")
+        self.path = path
+        self.format = format
+        self.batch_size = batch_size
+        self.written = 0
+        self.missing = 0
+        self.failed = 0
+        self._rows = []
+        self._writer = WRITERS[format](path)
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} path={self.path} format={self.format} written={self.written}>"
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def write(self, profile: Optional[Profile]):
+        """Buffers a profile, writing the batch once it is full.
+
+        Args:
+            profile (Profile): The profile, or a (requested, profile) tuple as yielded by iter_profiles.
+        """
+        if isinstance(profile, tuple):
+            profile = profile[1]
+        if profile is None:
+            self.missing += 1
+            return
+        if isinstance(profile, Exception):
+            self.failed += 1
+            return
+        self._rows.append(profile_row(profile))
+        if len(self._rows) >= self.batch_size:
+            self.flush()
+
+    def write_many(self, profiles: Iterable) -> int:
+        """Buffers and writes every profile of an iterable, consuming it lazily.
+
+        Returns:
+            int: How many profiles were written in total.
+        """
+        for profile in profiles:
+            self.write(profile)
+        return self.written
+
+    def flush(self):
+        """Writes the buffered profiles."""
+        if self._rows:
+            self._writer.write(self._rows)
+            self.written += len(self._rows)
+            self._rows = []
+
+    def close(self):
+        """Writes the buffered profiles, and closes the file."""
+        try:
+            self.flush()
+        finally:
+            self._writer.close()
+
+
+def export_profiles(profiles: Iterable, path: str, format: Optional[str] = None, batch_size: int = 10000) -> dict:
+    """Streams profiles to a file.
+
+    Args:
+        profiles (Iterable): Profiles, None, or (requested, profile) tuples, as returned by the bulk lookups.
+        path (str): The file to write.
+        format (str): One of "ndjson", "csv" or "parquet", inferred from the extension by default.
+        batch_size (int): How many profiles are buffered before they are written.
+
+    Returns:
+        dict: How many profiles were written, how many were missing, and how many lookups failed.
+    """
+    with ProfileExporter(path, format, batch_size) as exporter:
+        exporter.write_many(profiles)
+    return {"written": exporter.written, "missing": exporter.missing, "failed": exporter.failed}
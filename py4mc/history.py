@@ -0,0 +1,179 @@
+import bisect
+import threading
+
+from uuid import UUID
+from typing import Optional, Union
+from datetime import datetime, timezone
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+
+from .dispatcher import Dispatch
+from .cache import LookupCache, MISSING
+from .types.profile import HistoryIndex
+
+
+class _NameIntervals:
+    __slots__ = ("starts", "ends", "uuids")
+
+    def __init__(self):
+        self.starts = []
+        self.ends = []
+        self.uuids = []
+
+    def add(self, start: float, end: float, uuid: str):
+        position = bisect.bisect_right(self.starts, start)
+        self.starts.insert(position, start)
+        self.ends.insert(position, end)
+        self.uuids.insert(position, uuid)
+
+    def remove(self, uuid: str):
+        for position in reversed([i for i, u in enumerate(self.uuids) if u == uuid]):
+            del self.starts[position], self.ends[position], self.uuids[position]
+
+
+class NameHistoryService:
+    """Fetches the name histories of many profiles, and answers who owned a name at a given time.
+
+    Histories are fetched concurrently and cached under the same keys Profile.name_history uses.
+    Every fetched history is added to an interval index keyed by lowercase name, in which each
+    name maps to the sorted times it was taken, so owner_at is a binary search instead of a scan.
+
+    Notes:
+        Times are unix timestamps in milliseconds, like Mojang's changedToAt, or datetimes.
+        Naive datetimes are taken as UTC, which is what HistoryIndex.changed_at holds.
+
+    Attributes:
+        max_workers (int): The amount of threads histories are fetched with.
+        cache (LookupCache): Where fetched histories are cached, if anywhere.
+
+    """
+
+    def __init__(self, max_workers: int = 8, cache: Optional[LookupCache] = None):
+        self.max_workers = max_workers
+        self.cache = cache
+        self._histories = {}
+        self._names = {}
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} profiles={len(self._histories)} names={len(self._names)}>"
+
+    def __len__(self):
+        return len(self._histories)
+
+    @staticmethod
+    def _normalize_uuid(uuid) -> str:
+        return str(uuid).replace("-", "").lower()
+
+    @staticmethod
+    def _to_millis(timestamp: Union[datetime, float]) -> float:
+        if isinstance(timestamp, datetime):
+            if timestamp.tzinfo is None:
+                timestamp = timestamp.replace(tzinfo=timezone.utc)
+            return timestamp.timestamp() * 1000
+        return timestamp
+
+    def _request_history(self, uuid: str) -> Optional[list]:
+        if self.cache is not None:
+            cached = self.cache.get("name_history", uuid)
+            if cached is not MISSING:
+                return cached
+        route = Dispatch.API_BASE + "/user/profiles/{}/names".format(UUID(uuid))
+        response = Dispatch.do_request("GET", route)
+        if not isinstance(response, list):
+            return None
+        # Like Profile.name_history, only histories are cached, which it reads back under the same key.
+        if self.cache is not None:
+            self.cache.set("name_history", uuid, response)
+        return response
+
+    def add_history(self, uuid: Union[str, UUID], entries: list):
+        """Indexes a history, for instance one loaded from an archive, replacing any previous one.
+
+        Args:
+            uuid (UUID): The profile's UUID.
+            entries (list): The raw name history entries, as returned by the names endpoint.
+        """
+        uuid = self._normalize_uuid(uuid)
+        ordered = sorted(entries, key=lambda e: e.get("changedToAt") or 0)
+        with self._lock:
+            for name in {e.get("name").lower() for e in self._histories.get(uuid, [])}:
+                self._names[name].remove(uuid)
+            self._histories[uuid] = ordered
+            for position, entry in enumerate(ordered):
+                start = entry.get("changedToAt") or float("-inf")
+                end = ordered[position + 1]["changedToAt"] if position + 1 < len(ordered) else float("inf")
+                intervals = self._names.get(entry.get("name").lower())
+                if intervals is None:
+                    intervals = self._names[entry.get("name").lower()] = _NameIntervals()
+                intervals.add(start, end, uuid)
+
+    def fetch(self, uuid: Union[str, UUID]) -> Optional[list]:
+        """Fetches and indexes the history of one profile, unless it was fetched before.
+
+        Returns:
+            list: The HistoryIndex of every name the profile had, oldest first, or None if it was not found.
+        """
+        uuid = self._normalize_uuid(uuid)
+        history = self._histories.get(uuid)
+        if history is None:
+            entries = self._request_history(uuid)
+            if entries is None:
+                return None
+            self.add_history(uuid, entries)
+            history = self._histories[uuid]
+        return [HistoryIndex(e) for e in history]
+
+    def fetch_many(self, uuids: Iterable, max_workers: Optional[int] = None) -> dict:
+        """Fetches and indexes the histories of many profiles concurrently.
+
+        Args:
+            uuids (Iterable): The UUIDs of the profiles.
+            max_workers (int): The amount of threads to use, defaults to max_workers.
+
+        Returns:
+            dict: The undashed UUIDs mapped to their histories, or None for profiles that were not found.
+        """
+        uuids = list(dict.fromkeys(self._normalize_uuid(u) for u in uuids))
+        with ThreadPoolExecutor(max_workers or self.max_workers) as executor:
+            return dict(zip(uuids, executor.map(self.fetch, uuids)))
+
+    def owner_at(self, name: str, timestamp: Union[datetime, float]) -> Optional[str]:
+        """Gets the UUID of the profile that held a name at a point in time, among the indexed profiles.
+
+        Args:
+            name (str): The name, case insensitive.
+            timestamp (Union[datetime, float]): The point in time.
+
+        Returns:
+            str: The undashed UUID, or None if no indexed profile held the name at that time.
+        """
+        intervals = self._names.get(name.lower())
+        if intervals is None:
+            return None
+        timestamp = self._to_millis(timestamp)
+        with self._lock:
+            position = bisect.bisect_right(intervals.starts, timestamp) - 1
+            originals = bisect.bisect_right(intervals.starts, float("-inf"))
+            # The intervals with a known start never overlap, only the latest one can contain the time.
+            if position >= originals and intervals.ends[position] > timestamp:
+                return intervals.uuids[position]
+            # When an original name was first taken is unknown, so every profile whose original name
+            # it was may match. The one that gave it up first is the only one that could have held it.
+            candidates = [i for i in range(min(position + 1, originals)) if intervals.ends[i] > timestamp]
+            if not candidates:
+                return None
+            return intervals.uuids[min(candidates, key=intervals.ends.__getitem__)]
+
+    def owners(self, name: str) -> list:
+        """Gets every indexed profile that held a name.
+
+        Returns:
+            list: (uuid, start, end) tuples in milliseconds, oldest first. The start of an original
+            name is -inf, and the end of a current name is inf.
+        """
+        intervals = self._names.get(name.lower())
+        if intervals is None:
+            return []
+        with self._lock:
+            return list(zip(intervals.uuids, intervals.starts, intervals.ends))
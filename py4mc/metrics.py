@@ -0,0 +1,297 @@
+import re
+import json
+import time
+import bisect
+import threading
+
+from typing import Callable
+from urllib.parse import urlsplit, urlencode
+
+
+class Histogram:
+    """A cumulative latency histogram with fixed bucket bounds, in seconds.
+
+    Attributes:
+        bounds (tuple): The upper bounds of the buckets, an implicit +Inf bucket follows them.
+        counts (list): How many observations fell into each bucket, the last one being +Inf.
+        total (float): The sum of every observation.
+        count (int): The amount of observations.
+
+    """
+
+    __slots__ = ("bounds", "counts", "total", "count")
+
+    DEFAULT_BOUNDS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    def __init__(self, bounds: tuple = DEFAULT_BOUNDS):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} count={self.count} total={self.total:.3f}>"
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def quantile(self, quantile: float) -> float:
+        """Estimates a quantile as the upper bound of the bucket it falls into.
+
+        Args:
+            quantile (float): The quantile, between 0 and 1.
+
+        Returns:
+            float: The estimate, which is infinite if the quantile falls past the last bound.
+        """
+        if not self.count:
+            return 0.0
+        rank, seen = quantile * self.count, 0
+        for bound, count in zip(self.bounds + (float("inf"),), self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+    def snapshot(self) -> dict:
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "mean": self.total / self.count if self.count else 0.0,
+            "p50": self.quantile(0.5),
+            "p99": self.quantile(0.99),
+            "buckets": dict(zip([str(b) for b in self.bounds] + ["+Inf"], self.counts)),
+        }
+
+
+class _Endpoint:
+    __slots__ = ("latency", "statuses", "bytes_sent", "bytes_received", "retries", "rate_limited", "errors")
+
+    def __init__(self, bounds: tuple):
+        self.latency = Histogram(bounds)
+        self.statuses = {}
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.retries = 0
+        self.rate_limited = 0
+        self.errors = 0
+
+
+class Instrumentation:
+    """Collects metrics about every request sent through the Dispatch, and calls request hooks.
+
+    Requests are grouped by endpoint rather than by url, as UUIDs, names and texture hashes
+    are replaced by placeholders: every profile lookup counts towards
+    "sessionserver.mojang.com/session/minecraft/profile/{uuid}".
+
+    Attributes:
+        bounds (tuple): The bucket bounds of the latency histograms, in seconds.
+        throttled (float): How many seconds requests spent waiting on the client side rate limiter.
+
+    """
+
+    ENDPOINT_PATTERNS = (
+        (re.compile(r"/[0-9a-f]{8}-?[0-9a-f]{4}-?[0-9a-f]{4}-?[0-9a-f]{4}-?[0-9a-f]{12}(?=/|$)", re.I), "/{uuid}"),
+        (re.compile(r"(/users/profiles/minecraft)/[^/]+$"), r"\1/{name}"),
+        (re.compile(r"(/texture)/[^/]+$"), r"\1/{hash}"),
+    )
+
+    def __init__(self, bounds: tuple = Histogram.DEFAULT_BOUNDS):
+        self.bounds = bounds
+        self.throttled = 0.0
+        self._endpoints = {}
+        self._caches = {}
+        self._before = []
+        self._after = []
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} endpoints={len(self._endpoints)}>"
+
+    def before_request(self, hook: Callable) -> Callable:
+        """Registers a hook called with the method, url and keyword arguments of every request before it is sent.
+
+        Can be used as a decorator.
+        """
+        self._before.append(hook)
+        return hook
+
+    def after_request(self, hook: Callable) -> Callable:
+        """Registers a hook called with the method, url, response and elapsed seconds of every request.
+
+        The response is None if the request raised. Can be used as a decorator.
+        """
+        self._after.append(hook)
+        return hook
+
+    def register_cache(self, name: str, cache):
+        """Includes the hit ratios of a cache in the metrics, any object with a stats property works.
+
+        Nothing is registered implicitly, and a cache registered under a name that is taken replaces the other one.
+        """
+        self._caches[name] = cache
+
+    def unregister_cache(self, name: str):
+        """Stops including a cache in the metrics, and drops the reference to it."""
+        self._caches.pop(name, None)
+
+    @classmethod
+    def endpoint(cls, url: str) -> str:
+        """Gets the endpoint a url belongs to, with the identifiers in its path replaced by placeholders."""
+        parts = urlsplit(url)
+        path = parts.path
+        for pattern, replacement in cls.ENDPOINT_PATTERNS:
+            path = pattern.sub(replacement, path)
+        return f"{parts.hostname}{path}"
+
+    @staticmethod
+    def _request_size(kwargs: dict) -> int:
+        body = kwargs.get("data")
+        if body is None and kwargs.get("json") is not None:
+            body = json.dumps(kwargs["json"])
+        if isinstance(body, dict):
+            body = urlencode(body)
+        if isinstance(body, str):
+            body = body.encode()
+        return len(body) if isinstance(body, bytes) else 0
+
+    def _get_endpoint(self, url: str) -> _Endpoint:
+        name = self.endpoint(url)
+        endpoint = self._endpoints.get(name)
+        if endpoint is None:
+            endpoint = self._endpoints[name] = _Endpoint(self.bounds)
+        return endpoint
+
+    def started(self, method: str, url: str, kwargs: dict) -> float:
+        """Calls the before hooks of a request that is about to be sent.
+
+        Returns:
+            float: The time.perf_counter() time the request started at.
+        """
+        for hook in self._before:
+            hook(method, url, kwargs)
+        return time.perf_counter()
+
+    def finished(self, method: str, url: str, kwargs: dict, response, started: float):
+        """Records a request that was sent, and calls the after hooks.
+
+        Args:
+            method (str): The method of the request.
+            url (str): The url of the request.
+            kwargs (dict): The keyword arguments the request was sent with.
+            response: The response, or None if the request raised.
+            started (float): What started returned.
+        """
+        elapsed = time.perf_counter() - started
+        sent = self._request_size(kwargs)
+        received = 0 if response is None else len(response.content)
+        with self._lock:
+            endpoint = self._get_endpoint(url)
+            endpoint.latency.observe(elapsed)
+            endpoint.bytes_sent += sent
+            endpoint.bytes_received += received
+            if response is None:
+                endpoint.errors += 1
+            else:
+                endpoint.statuses[response.status_code] = endpoint.statuses.get(response.status_code, 0) + 1
+                if response.status_code == 429:
+                    endpoint.rate_limited += 1
+        for hook in self._after:
+            hook(method, url, response, elapsed)
+
+    def retried(self, url: str):
+        with self._lock:
+            self._get_endpoint(url).retries += 1
+
+    def waited(self, delay: float):
+        with self._lock:
+            self.throttled += delay
+
+    def reset(self):
+        with self._lock:
+            self.throttled = 0.0
+            self._endpoints.clear()
+
+    def snapshot(self) -> dict:
+        """Gets every metric as plain data.
+
+        Returns:
+            dict: The metrics of every endpoint, the time spent throttled, and the stats of the registered caches.
+        """
+        with self._lock:
+            endpoints = {
+                name: {
+                    "requests": e.latency.count,
+                    "errors": e.errors,
+                    "statuses": dict(e.statuses),
+                    "bytes_sent": e.bytes_sent,
+                    "bytes_received": e.bytes_received,
+                    "retries": e.retries,
+                    "rate_limited": e.rate_limited,
+                    "latency": e.latency.snapshot(),
+                }
+                for name, e in self._endpoints.items()
+            }
+            throttled = self.throttled
+        caches = {name: cache.stats for name, cache in self._caches.items()}
+        return {"endpoints": endpoints, "throttled_seconds": throttled, "caches": caches}
+
+    @staticmethod
+    def _labels(**labels) -> str:
+        escaped = {k: str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for k, v in labels.items()}
+        return "{" + ",".join(f'{k}="{v}"' for k, v in escaped.items()) + "}"
+
+    def to_prometheus(self, prefix: str = "py4mc") -> str:
+        """Renders the metrics in the Prometheus text exposition format.
+
+        Args:
+            prefix (str): What every metric name starts with.
+
+        Returns:
+            str: The metrics, ready to be served on a /metrics endpoint.
+        """
+        snapshot = self.snapshot()
+        lines = []
+
+        def metric(name: str, kind: str, description: str, samples: list):
+            lines.append(f"# HELP {prefix}_{name} {description}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+            lines.extend(f"{prefix}_{name}{suffix} {value}" for suffix, value in samples)
+
+        endpoints = snapshot["endpoints"].items()
+        metric(
+            "requests_total", "counter", "Requests sent, by endpoint and status code.",
+            [(self._labels(endpoint=n, status=s), c) for n, e in endpoints for s, c in e["statuses"].items()]
+            + [(self._labels(endpoint=n, status="error"), e["errors"]) for n, e in endpoints if e["errors"]],
+        )
+        latency = []
+        for name, e in endpoints:
+            cumulative = 0
+            for bound, count in e["latency"]["buckets"].items():
+                cumulative += count
+                latency.append((f"_bucket{self._labels(endpoint=name, le=bound)}", cumulative))
+            latency.append((f"_sum{self._labels(endpoint=name)}", e["latency"]["sum"]))
+            latency.append((f"_count{self._labels(endpoint=name)}", e["latency"]["count"]))
+        metric("request_duration_seconds", "histogram", "Request latency, by endpoint.", latency)
+        for name, key, description in (
+            ("request_bytes_total", "bytes_sent", "Request body bytes sent, by endpoint."),
+            ("response_bytes_total", "bytes_received", "Response body bytes received, by endpoint."),
+            ("retries_total", "retries", "Requests sent again, by endpoint."),
+            ("rate_limited_total", "rate_limited", "429 responses received, by endpoint."),
+        ):
+            metric(name, "counter", description, [(self._labels(endpoint=n), e[key]) for n, e in endpoints])
+        metric(
+            "throttled_seconds_total", "counter", "Seconds spent waiting on the client side rate limiter.",
+            [("", snapshot["throttled_seconds"])],
+        )
+        hits, misses = [], []
+        for cache, stats in snapshot["caches"].items():
+            kinds = stats.items() if "hits" not in stats else [("", stats)]
+            for kind, counter in kinds:
+                hits.append((self._labels(cache=cache, kind=kind), counter["hits"]))
+                misses.append((self._labels(cache=cache, kind=kind), counter["misses"]))
+        metric("cache_hits_total", "counter", "Cache lookups that found a fresh entry.", hits)
+        metric("cache_misses_total", "counter", "Cache lookups that found nothing.", misses)
+        return "\n".join(lines) + "\n"
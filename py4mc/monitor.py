@@ -0,0 +1,276 @@
+import time
+import logging
+import threading
+
+from array import array
+from typing import Optional, Callable
+from collections.abc import Iterable
+
+from .dispatcher import Dispatch
+from .exceptions import ApiException, InvalidMetric
+from .types.misc import Statistics
+
+logger = logging.getLogger(__name__)
+
+
+class _RingBuffer:
+    """Fixed size columns of samples, overwriting the oldest sample once full."""
+
+    COLUMNS = ("time", "total", "last_24h", "sale_velocity")
+
+    __slots__ = ("capacity", "columns", "size", "head")
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.columns = {c: array("d", bytes(8 * capacity)) for c in self.COLUMNS}
+        self.size = 0
+        self.head = 0
+
+    def __len__(self):
+        return self.size
+
+    def append(self, values: tuple):
+        for column, value in zip(self.COLUMNS, values):
+            self.columns[column][self.head] = value
+        self.head = (self.head + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+
+    def column(self, name: str) -> list:
+        """Gets a column, oldest sample first."""
+        values = self.columns[name]
+        if self.size < self.capacity:
+            return values[:self.size].tolist()
+        return values[self.head:].tolist() + values[:self.head].tolist()
+
+    def index(self, offset: int) -> int:
+        """Gets the position of a sample, where 0 is the oldest and -1 the newest."""
+        if offset < 0:
+            offset += self.size
+        return (self.head - self.size + offset) % self.capacity
+
+
+class StatisticsMonitor:
+    """Polls the sales statistics of a set of metrics on a schedule.
+
+    Every tick makes a single request for all the metrics, and the sample is stored in a
+    fixed size ring buffer, so deltas and rates over the kept samples cost no requests.
+    Dashboards watching the same metrics at the same interval should share one monitor
+    through StatisticsMonitor.shared, and receive new samples by subscribing to it. A shared
+    monitor is forgotten once its last subscriber leaves.
+
+    Attributes:
+        metrics (tuple): The metrics whose statistics are summed up by Mojang.
+        interval (float): How many seconds are between two requests.
+        capacity (int): How many samples are kept.
+        errors (int): How many ticks failed.
+
+    """
+
+    _registry = {}
+    _registry_lock = threading.Lock()
+
+    def __init__(self, metrics: Iterable, interval: float = 60.0, capacity: int = 1440):
+        self.metrics = self._check_metrics(metrics)
+        self.interval = interval
+        self.capacity = capacity
+        self.errors = 0
+        self._samples = _RingBuffer(capacity)
+        self._subscribers = []
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = None
+        self._key = None
+
+    def __repr__(self):
+        return (
+            f"<{self.__class__.__name__} metrics={','.join(self.metrics)} interval={self.interval} "
+            f"samples={len(self._samples)}>"
+        )
+
+    def __len__(self):
+        return len(self._samples)
+
+    @staticmethod
+    def _check_metrics(metrics: Iterable) -> tuple:
+        metrics = (metrics,) if isinstance(metrics, str) else tuple(sorted(set(metrics)))
+        if len(metrics) == 0:
+            raise ApiException("You must provide at least one metric!")
+        for metric in metrics:
+            if metric not in Statistics.VALID_METRICS:
+                raise InvalidMetric(f"{metric} is not a valid metric!")
+        return metrics
+
+    @classmethod
+    def shared(cls, metrics: Iterable, interval: float = 60.0, capacity: int = 1440) -> "StatisticsMonitor":
+        """Gets the monitor every caller watching these metrics at this interval and capacity shares.
+
+        Returns:
+            StatisticsMonitor: The existing monitor, or a new one if there was none yet.
+        """
+        key = (cls._check_metrics(metrics), interval, capacity)
+        with cls._registry_lock:
+            monitor = cls._registry.get(key)
+            if monitor is None:
+                monitor = cls._registry[key] = cls(key[0], interval, capacity)
+                monitor._key = key
+            return monitor
+
+    def poll(self) -> Statistics:
+        """Requests the statistics once, and records them as a sample.
+
+        Returns:
+            Statistics: The statistics that were recorded.
+        """
+        route = Dispatch.API_BASE + "/orders/statistics"
+        statistics = Statistics(Dispatch.do_request("POST", route, json={"metricKeys": list(self.metrics)}))
+        with self._lock:
+            self._samples.append((time.time(), statistics.total, statistics.last_24h, statistics.sale_velocity))
+            subscribers = list(self._subscribers)
+        for callback in subscribers:
+            try:
+                callback(self, statistics)
+            except Exception:
+                logger.exception("A statistics subscriber raised an exception.")
+        return statistics
+
+    def _run(self):
+        next_tick = time.monotonic()
+        while not self._stopped.is_set():
+            try:
+                self.poll()
+            except Exception:
+                self.errors += 1
+                logger.exception("Polling the statistics of %s failed.", ",".join(self.metrics))
+            # Ticks are scheduled from the previous one, so slow responses do not make the polling drift.
+            next_tick = max(next_tick + self.interval, time.monotonic())
+            self._stopped.wait(next_tick - time.monotonic())
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Starts polling in a background thread, unless it is already polling."""
+        with self._lock:
+            if self.running:
+                return
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run, name="py4mc-statistics", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        """Stops polling, the kept samples stay available."""
+        self._stopped.set()
+        thread, self._thread = self._thread, None
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+
+    def subscribe(self, callback: Callable) -> Callable:
+        """Calls a function with every new sample, and starts polling if it was not yet.
+
+        Args:
+            callback (Callable): Called with the monitor and the Statistics of every tick.
+
+        Returns:
+            Callable: The callback, so it can be used as a decorator.
+        """
+        with self._registry_lock:
+            # The monitor may have been forgotten after shared returned it, when its last subscriber left.
+            if self._key is not None:
+                self._registry.setdefault(self._key, self)
+            with self._lock:
+                self._subscribers.append(callback)
+        self.start()
+        return callback
+
+    def unsubscribe(self, callback: Callable):
+        """Removes a subscriber, and stops polling once none are left."""
+        with self._registry_lock:
+            with self._lock:
+                self._subscribers.remove(callback)
+                remaining = len(self._subscribers)
+            if remaining == 0 and self._key is not None and self._registry.get(self._key) is self:
+                del self._registry[self._key]
+        if remaining == 0:
+            self.stop()
+
+    @property
+    def latest(self) -> Optional[Statistics]:
+        """The statistics of the newest sample, or None if nothing was polled yet."""
+        with self._lock:
+            if not self._samples:
+                return None
+            position = self._samples.index(-1)
+            columns = self._samples.columns
+            return Statistics(
+                {
+                    "total": int(columns["total"][position]),
+                    "last24h": int(columns["last_24h"][position]),
+                    "saleVelocityPerSeconds": columns["sale_velocity"][position],
+                }
+            )
+
+    def samples(self, column: Optional[str] = None) -> list:
+        """Gets the kept samples, oldest first.
+
+        Args:
+            column (str): Only get one column out of "time", "total", "last_24h" or "sale_velocity".
+
+        Returns:
+            list: The values of the column, or (time, total, last_24h, sale_velocity) tuples.
+        """
+        with self._lock:
+            if column is not None:
+                return self._samples.column(column)
+            return list(zip(*(self._samples.column(c) for c in _RingBuffer.COLUMNS)))
+
+    def _window(self, window: Optional[float]) -> Optional[tuple]:
+        # The oldest and the newest sample within the window, found without copying the buffer.
+        with self._lock:
+            size = len(self._samples)
+            if size < 2:
+                return None
+            times, totals = self._samples.columns["time"], self._samples.columns["total"]
+            newest = self._samples.index(-1)
+            if window is None:
+                oldest = self._samples.index(0)
+            else:
+                low, high = 0, size - 1
+                while low < high:
+                    middle = (low + high) // 2
+                    if times[self._samples.index(middle)] < times[newest] - window:
+                        low = middle + 1
+                    else:
+                        high = middle
+                oldest = self._samples.index(low)
+            if oldest == newest:
+                return None
+            return times[newest] - times[oldest], totals[newest] - totals[oldest]
+
+    def delta(self, window: Optional[float] = None) -> Optional[int]:
+        """Gets how many copies were sold between the oldest and the newest sample.
+
+        Args:
+            window (float): Only look at the samples of the last window seconds, by default all are used.
+
+        Returns:
+            int: The change of the total, or None if there are not two samples to compare.
+        """
+        measured = self._window(window)
+        return None if measured is None else int(measured[1])
+
+    def rate(self, window: Optional[float] = None) -> Optional[float]:
+        """Gets how many copies were sold per second between the oldest and the newest sample.
+
+        Unlike sale_velocity, which Mojang computes, this is measured from the polled totals.
+
+        Args:
+            window (float): Only look at the samples of the last window seconds, by default all are used.
+
+        Returns:
+            float: The change of the total per second, or None if there are not two samples to compare.
+        """
+        measured = self._window(window)
+        if measured is None or measured[0] <= 0:
+            return None
+        return measured[1] / measured[0]
@@ -0,0 +1,181 @@
+import time
+import random
+import threading
+
+from typing import Optional
+from urllib.parse import urlsplit
+from email.utils import parsedate_to_datetime
+
+from .exceptions import Ratelimited
+
+
+class TokenBucket:
+    """A thread safe token bucket.
+
+    Tokens refill continuously at the given rate up to the capacity. Reserving a token never
+    blocks, instead the caller is told how long to wait before the token may be spent, which lets
+    the same bucket schedule both threaded and asyncio callers.
+
+    Attributes:
+        rate (float): The amount of tokens refilled per second.
+        capacity (int): The maximum amount of tokens, which is also the largest possible burst.
+
+    """
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} rate={self.rate} capacity={self.capacity} tokens={self.tokens:.2f}>"
+
+    @property
+    def tokens(self) -> float:
+        with self._lock:
+            self._refill(time.monotonic())
+            return self._tokens
+
+    def _refill(self, now: float):
+        elapsed = now - self._updated
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._updated = now
+
+    def reserve(self) -> float:
+        """Takes a token out of the bucket.
+
+        The bucket may go into debt, in which case the token only becomes usable later.
+
+        Returns:
+            float: How many seconds the caller has to wait before sending its request.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens -= 1
+            delay = 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+            return max(delay, self._blocked_until - now)
+
+    def refund(self):
+        """Puts a reserved token back, used when the request is never sent."""
+        with self._lock:
+            self._tokens = min(self.capacity, self._tokens + 1)
+
+    def block(self, delay: float):
+        """Stops handing out usable tokens for the given amount of seconds."""
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + delay)
+
+
+class RateLimiter:
+    """Schedules requests per endpoint family and backs off when Mojang rate limits us.
+
+    Every family of endpoints has its own token bucket, so sustained throughput stays at the
+    allowed ceiling rather than collapsing into a storm of 429 responses. Hosts without a
+    configured limit are not throttled.
+
+    Notes:
+        The default limits follow wiki.vg, which documents 600 requests per 10 minutes for
+        api.mojang.com. A full bucket plus 10 minutes of refill must stay within that, so the
+        burst is kept small: 60 + 0.9 * 600 = 600. The other families are not documented, and
+        use a conservative guess.
+
+    Attributes:
+        limits (dict): The hosts mapped to their (rate, capacity) pairs.
+        deadline (float): The maximum amount of seconds a request may wait before Ratelimited is raised.
+        backoff (float): The base delay of the exponential backoff after a 429 without Retry-After.
+        max_backoff (float): The largest delay the exponential backoff will wait.
+
+    """
+
+    DEFAULT_LIMITS = {
+        "api.mojang.com": (0.9, 60),
+        "sessionserver.mojang.com": (20.0, 200),
+        "api.minecraftservices.com": (10.0, 100),
+    }
+
+    def __init__(
+        self,
+        limits: Optional[dict] = None,
+        deadline: float = 30.0,
+        backoff: float = 0.5,
+        max_backoff: float = 30.0,
+    ):
+        self.limits = dict(self.DEFAULT_LIMITS if limits is None else limits)
+        self.deadline = deadline
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.buckets = {host: TokenBucket(*limit) for host, limit in self.limits.items()}
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} deadline={self.deadline} hosts={list(self.buckets)}>"
+
+    def get_bucket(self, url: str) -> Optional[TokenBucket]:
+        return self.buckets.get(urlsplit(url).hostname)
+
+    def reserve(self, url: str, deadline: float) -> float:
+        """Reserves a token for the given url.
+
+        Args:
+            url (str): The url that is about to be requested.
+            deadline (float): The time.monotonic() time the request must be sent by.
+
+        Returns:
+            float: How many seconds the caller has to wait before sending its request.
+
+        Raises:
+            Ratelimited: If the request could not be sent before the deadline.
+        """
+        bucket = self.get_bucket(url)
+        if bucket is None:
+            return 0.0
+        delay = bucket.reserve()
+        if time.monotonic() + delay > deadline:
+            bucket.refund()
+            raise Ratelimited(f"{urlsplit(url).hostname} is rate limited for another {delay:.1f} seconds.")
+        return delay
+
+    @staticmethod
+    def _parse_retry_after(retry_after: Optional[str]) -> Optional[float]:
+        if retry_after is None:
+            return None
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+    def rate_limited(self, url: str, attempt: int, deadline: float, retry_after: Optional[str] = None) -> float:
+        """Computes the backoff after a 429 response, and blocks the url's bucket for that long.
+
+        Retry-After is honored when present, otherwise an exponential backoff with full jitter is used.
+
+        Args:
+            url (str): The url that was rate limited.
+            attempt (int): How many times in a row the request has been rate limited.
+            deadline (float): The time.monotonic() time the request must be sent by.
+            retry_after (str): The Retry-After header of the response, if any.
+
+        Returns:
+            float: How many seconds the caller has to wait before trying again.
+
+        Raises:
+            Ratelimited: If the request could not be retried before the deadline.
+        """
+        delay = self._parse_retry_after(retry_after)
+        if delay is None:
+            delay = random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+        else:
+            delay += random.uniform(0, self.backoff)
+        if time.monotonic() + delay > deadline:
+            raise Ratelimited(f"{urlsplit(url).hostname} kept rate limiting the request.")
+        bucket = self.get_bucket(url)
+        if bucket is not None:
+            bucket.block(delay)
+        return delay
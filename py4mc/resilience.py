@@ -0,0 +1,203 @@
+import time
+import random
+import threading
+
+from typing import Optional
+from urllib.parse import urlsplit
+
+from .exceptions import CircuitOpen
+
+
+class RetryPolicy:
+    """Decides whether, and after how long, a failed idempotent request is sent again.
+
+    Network errors and the listed server errors are retried with exponential backoff. With
+    jitter, every delay is drawn uniformly between zero and the backoff ceiling, so clients that
+    failed together do not retry together. Requests that are not idempotent are never retried.
+
+    Attributes:
+        retries (int): How many times a request is sent again at most.
+        backoff (float): The ceiling of the first delay in seconds, doubled after every retry.
+        max_backoff (float): The largest delay in seconds.
+        jitter (bool): If the delays are randomized.
+        statuses (tuple): The status codes that are retried.
+
+    """
+
+    def __init__(
+        self,
+        retries: int = 2,
+        backoff: float = 0.1,
+        max_backoff: float = 5.0,
+        jitter: bool = True,
+        statuses: tuple = (500, 502, 503, 504),
+    ):
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.statuses = statuses
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} retries={self.retries} backoff={self.backoff} jitter={self.jitter}>"
+
+    def should_retry(self, attempt: int, status_code: Optional[int] = None) -> bool:
+        """Checks if a request should be sent again.
+
+        Args:
+            attempt (int): How many times the request was retried so far.
+            status_code (int): The status code received, or None if the request raised a network error.
+
+        Returns:
+            bool: If the request should be sent again.
+        """
+        return attempt < self.retries and (status_code is None or status_code in self.statuses)
+
+    def delay(self, attempt: int) -> float:
+        """Gets how many seconds to wait before the given retry, starting at 0."""
+        ceiling = min(self.max_backoff, self.backoff * 2 ** attempt)
+        return random.uniform(0, ceiling) if self.jitter else ceiling
+
+
+class _Circuit:
+    __slots__ = ("state", "failures", "opened_at", "probing", "generation")
+
+    def __init__(self):
+        self.state = CircuitBreaker.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probing = False
+        # Bumped every time the circuit opens, so outcomes of requests sent before that can be told apart.
+        self.generation = 0
+
+
+class CircuitBreaker:
+    """Fails requests to a host fast while it is down, instead of waiting on every one of them.
+
+    After failure_threshold consecutive failures, network errors or server errors, the circuit
+    of the host opens and requests raise CircuitOpen without being sent. Once reset_timeout
+    seconds have passed it half opens, letting a single probe through: the circuit closes
+    again if the probe succeeds, and reopens if it fails.
+
+    Every request let through gets a token from before, which has to be passed back to record.
+    Outcomes of requests that were sent before the circuit last opened are ignored, and while
+    the circuit is half open, only the outcome of the probe closes or reopens it.
+
+    Attributes:
+        failure_threshold (int): How many consecutive failures open the circuit.
+        reset_timeout (float): How many seconds the circuit stays open before it is probed.
+
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._circuits = {}
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        opened = [h for h, c in self._circuits.items() if c.state != self.CLOSED]
+        return f"<{self.__class__.__name__} failure_threshold={self.failure_threshold} open={','.join(opened)}>"
+
+    @staticmethod
+    def get_host(url: str) -> str:
+        return urlsplit(url).netloc or url
+
+    def _get_circuit(self, url: str) -> _Circuit:
+        host = self.get_host(url)
+        circuit = self._circuits.get(host)
+        if circuit is None:
+            circuit = self._circuits[host] = _Circuit()
+        return circuit
+
+    def state(self, url: str) -> str:
+        """Gets the state of the circuit of a url's host, "closed", "open" or "half_open"."""
+        with self._lock:
+            circuit = self._get_circuit(url)
+            if circuit.state == self.OPEN and time.monotonic() - circuit.opened_at >= self.reset_timeout:
+                return self.HALF_OPEN
+            return circuit.state
+
+    def before(self, url: str) -> tuple:
+        """Lets a request through, or refuses it while the circuit of its host is open.
+
+        Returns:
+            tuple: The token the outcome of the request has to be recorded with.
+
+        Raises:
+            CircuitOpen: If the circuit is open, or half open with its probe already in flight.
+        """
+        with self._lock:
+            circuit = self._get_circuit(url)
+            if circuit.state == self.CLOSED:
+                return circuit.generation, False
+            remaining = circuit.opened_at + self.reset_timeout - time.monotonic()
+            if circuit.state == self.OPEN and remaining <= 0:
+                circuit.state = self.HALF_OPEN
+            if circuit.state == self.HALF_OPEN and not circuit.probing:
+                circuit.probing = True
+                return circuit.generation, True
+        raise CircuitOpen(f"{self.get_host(url)} is failing, requests are refused for {max(remaining, 0):.1f}s.")
+
+    def _open(self, circuit: _Circuit):
+        circuit.state = self.OPEN
+        circuit.opened_at = time.monotonic()
+        circuit.generation += 1
+
+    def record(self, url: str, success: bool, token: tuple):
+        """Records the outcome of a request that was let through.
+
+        Args:
+            url (str): The url that was requested.
+            success (bool): If the request succeeded.
+            token (tuple): The token before returned for the request.
+        """
+        generation, probe = token
+        with self._lock:
+            circuit = self._get_circuit(url)
+            if generation != circuit.generation:
+                return
+            if probe:
+                circuit.probing = False
+                if success:
+                    circuit.state = self.CLOSED
+                    circuit.failures = 0
+                else:
+                    self._open(circuit)
+            elif circuit.state == self.CLOSED:
+                circuit.failures = 0 if success else circuit.failures + 1
+                if circuit.failures >= self.failure_threshold:
+                    self._open(circuit)
+
+    def reset(self, url: Optional[str] = None):
+        """Closes the circuit of a url's host, or of every host if no url is passed."""
+        with self._lock:
+            if url is None:
+                self._circuits.clear()
+            else:
+                self._circuits.pop(self.get_host(url), None)
+
+
+class BatchResult(list):
+    """The results of a bulk lookup, kept even when some of the lookups failed.
+
+    It is a list of the results in input order, with None in place of every lookup that
+    failed. The exceptions those lookups raised are kept in errors, keyed by their index.
+
+    Attributes:
+        errors (dict): The index of every failed lookup mapped to the exception it raised.
+
+    """
+
+    def __init__(self, results=(), errors: Optional[dict] = None):
+        super().__init__(results)
+        self.errors = errors if errors is not None else {}
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} results={len(self)} errors={len(self.errors)}>"
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
@@ -0,0 +1,68 @@
+from typing import Optional
+from requests import Response
+
+from .utils.parsers import json_loads
+
+NOT_JSON = object()
+
+
+class ApiResponse:
+    """A response whose body has been decoded exactly once.
+
+    Attributes:
+        status_code (int): The HTTP status code.
+        headers (dict): The response headers.
+        content (bytes): The raw body.
+        payload: The decoded JSON body, or NOT_JSON if the body is empty or not JSON.
+        url (str): The url that was requested.
+
+    """
+
+    __slots__ = ("status_code", "headers", "content", "payload", "url")
+
+    def __init__(self, status_code: int, headers: dict, content: bytes, payload=NOT_JSON, url: Optional[str] = None):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.payload = payload
+        self.url = url
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} status_code={self.status_code} url={self.url}>"
+
+    @classmethod
+    def from_response(cls, response: Response) -> "ApiResponse":
+        """Decodes the body of a requests response.
+
+        Args:
+            response (Response): The response to decode.
+
+        Returns:
+            ApiResponse: The decoded response.
+        """
+        content = response.content or b""
+        payload = NOT_JSON
+        if content:
+            try:
+                payload = json_loads(content)
+            except ValueError:
+                pass
+        return cls(response.status_code, response.headers, content, payload, response.url)
+
+    @property
+    def is_json(self) -> bool:
+        return self.payload is not NOT_JSON
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8", "replace")
+
+    def json(self):
+        """Gets the decoded body, like requests.Response.json does.
+
+        Raises:
+            ValueError: If the body is not JSON.
+        """
+        if self.payload is NOT_JSON:
+            raise ValueError("The response body is not valid JSON.")
+        return self.payload
@@ -0,0 +1,130 @@
+import asyncio
+import threading
+
+from typing import Callable, Hashable
+
+
+class _Call:
+    __slots__ = ("event", "result", "exception")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.exception = None
+
+
+class SingleFlight:
+    """Coalesces identical calls that are in flight at the same time.
+
+    The first caller of a key runs the function, every caller that arrives while it is running
+    waits for it and receives the same result, or the same exception. Once the call finished
+    the key is forgotten, so nothing is cached.
+
+    Attributes:
+        executed (int): How many calls actually ran.
+        coalesced (int): How many calls shared the result of a call that was already running.
+
+    """
+
+    def __init__(self):
+        self.executed = 0
+        self.coalesced = 0
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} executed={self.executed} coalesced={self.coalesced}>"
+
+    def do(self, key: Hashable, function: Callable, *args, **kwargs):
+        """Runs the function, unless an identical call is already running.
+
+        Args:
+            key (Hashable): What identifies identical calls.
+            function (Callable): The function to run.
+            *args: The arguments of the function.
+            **kwargs: The keyword arguments of the function.
+
+        Returns:
+            The result of the function.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = _Call()
+                self.executed += 1
+                leader = True
+            else:
+                self.coalesced += 1
+                leader = False
+        if not leader:
+            call.event.wait()
+            if call.exception is not None:
+                raise call.exception
+            return call.result
+        try:
+            call.result = function(*args, **kwargs)
+            return call.result
+        except BaseException as exception:
+            call.exception = exception
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+
+    @property
+    def stats(self) -> dict:
+        return {"executed": self.executed, "coalesced": self.coalesced, "in_flight": len(self._calls)}
+
+
+class AsyncSingleFlight:
+    """The asyncio counterpart of SingleFlight, for coroutines running on one event loop.
+
+    The call runs as its own task, which every caller awaits through a shield, the first one
+    included. Cancelling a caller therefore only cancels its wait, never the call the others share.
+
+    Attributes:
+        executed (int): How many calls actually ran.
+        coalesced (int): How many calls shared the result of a call that was already running.
+
+    """
+
+    def __init__(self):
+        self.executed = 0
+        self.coalesced = 0
+        self._calls = {}
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} executed={self.executed} coalesced={self.coalesced}>"
+
+    async def do(self, key: Hashable, function: Callable, *args, **kwargs):
+        """Awaits the coroutine function, unless an identical call is already running.
+
+        Args:
+            key (Hashable): What identifies identical calls.
+            function (Callable): The coroutine function to await.
+            *args: The arguments of the function.
+            **kwargs: The keyword arguments of the function.
+
+        Returns:
+            The result of the function.
+        """
+        task = self._calls.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            self.executed += 1
+            task = self._calls[key] = asyncio.ensure_future(function(*args, **kwargs))
+            task.add_done_callback(lambda done: self._forget(key, done))
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Future):
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # Marks the exception as retrieved, in case every caller stopped waiting for it.
+        if not task.cancelled():
+            task.exception()
+
+    @property
+    def stats(self) -> dict:
+        return {"executed": self.executed, "coalesced": self.coalesced, "in_flight": len(self._calls)}
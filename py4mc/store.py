@@ -0,0 +1,147 @@
+import time
+import sqlite3
+import threading
+
+from typing import Optional
+from collections.abc import Iterable
+
+
+class ProfileStore:
+    """A persistent SQLite store of resolved profiles, indexed by UUID and by lowercase username.
+
+    The raw textures property of every profile is kept, so profiles rebuilt from the store are
+    identical to the ones received from the sessionserver, signature included. Entries older than
+    max_age are treated as missing, which makes the MojangApi refresh them from the network.
+
+    Attributes:
+        path (str): The path of the SQLite database, ":memory:" keeps it in memory.
+        max_age (float): How many seconds an entry stays fresh.
+
+    """
+
+    SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS profiles ("
+        "uuid TEXT PRIMARY KEY, username TEXT NOT NULL, username_lower TEXT NOT NULL, "
+        "value TEXT NOT NULL, signature TEXT, updated_at REAL NOT NULL)",
+        "CREATE INDEX IF NOT EXISTS profiles_username_lower ON profiles (username_lower)",
+        "CREATE INDEX IF NOT EXISTS profiles_updated_at ON profiles (updated_at)",
+    )
+
+    def __init__(self, path: str = ":memory:", max_age: float = 86400.0):
+        self.path = path
+        self.max_age = max_age
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._connection:
+            for statement in self.SCHEMA:
+                self._connection.execute(statement)
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} path={self.path} max_age={self.max_age}>"
+
+    def __len__(self):
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM profiles").fetchone()[0]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @staticmethod
+    def _normalize_uuid(uuid) -> str:
+        return str(uuid).replace("-", "").lower()
+
+    def put(self, uuid: str, username: str, value: str, signature: Optional[str] = None):
+        """Stores or refreshes a profile.
+
+        Args:
+            uuid (str): The profile's UUID.
+            username (str): The profile's current username.
+            value (str): The base64 textures property of the profile.
+            signature (str): The signature of the textures property.
+        """
+        self.put_many([(uuid, username, value, signature)])
+
+    def put_many(self, profiles: Iterable):
+        """Stores or refreshes many profiles in a single transaction.
+
+        Args:
+            profiles (Iterable): (uuid, username, value, signature) tuples.
+        """
+        now = time.time()
+        rows = [(self._normalize_uuid(u), n, n.lower(), v, s, now) for u, n, v, s in profiles]
+        with self._lock, self._connection:
+            self._connection.executemany("INSERT OR REPLACE INTO profiles VALUES (?, ?, ?, ?, ?, ?)", rows)
+
+    def get_by_uuid(self, uuid: str) -> Optional[tuple]:
+        """Gets a fresh profile by its UUID.
+
+        Args:
+            uuid (str): The profile's UUID, with or without dashes.
+
+        Returns:
+            tuple: The base64 value and signature of the profile, or None if there is no fresh entry.
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT value, signature FROM profiles WHERE uuid = ? AND updated_at >= ?",
+                (self._normalize_uuid(uuid), time.time() - self.max_age),
+            ).fetchone()
+        return row
+
+    def get_uuid(self, username: str) -> Optional[str]:
+        """Gets the UUID of the freshest profile with the given username.
+
+        Args:
+            username (str): The username, case insensitive.
+
+        Returns:
+            str: The undashed UUID, or None if there is no fresh entry.
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT uuid FROM profiles WHERE username_lower = ? AND updated_at >= ? "
+                "ORDER BY updated_at DESC LIMIT 1",
+                (username.lower(), time.time() - self.max_age),
+            ).fetchone()
+        return None if row is None else row[0]
+
+    def get_by_name(self, username: str) -> Optional[tuple]:
+        """Gets a fresh profile by its username.
+
+        Args:
+            username (str): The username, case insensitive.
+
+        Returns:
+            tuple: The base64 value and signature of the profile, or None if there is no fresh entry.
+        """
+        uuid = self.get_uuid(username)
+        if uuid is None:
+            return None
+        return self.get_by_uuid(uuid)
+
+    def stale_uuids(self, limit: int = 1000) -> list:
+        """Gets the UUIDs of the oldest entries that are no longer fresh, so they can be refreshed.
+
+        Args:
+            limit (int): The maximum amount of UUIDs to return.
+
+        Returns:
+            list: The undashed UUIDs, oldest first.
+        """
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT uuid FROM profiles WHERE updated_at < ? ORDER BY updated_at LIMIT ?",
+                (time.time() - self.max_age, limit),
+            ).fetchall()
+        return [r[0] for r in rows]
+
+    def delete(self, uuid: str):
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM profiles WHERE uuid = ?", (self._normalize_uuid(uuid),))
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
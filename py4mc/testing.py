@@ -0,0 +1,304 @@
+import re
+import json
+import time
+import base64
+import random
+import hashlib
+import threading
+
+from uuid import UUID
+from typing import Optional
+from collections import Counter
+from collections.abc import Iterable
+from urllib.parse import urlsplit, parse_qs
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .transport import Transport
+
+
+def player_uuid(name: str) -> str:
+    """Gets the undashed UUID the FakeMojangServer gives a player, derived from their name."""
+    return UUID(hashlib.md5(name.lower().encode()).hexdigest(), version=4).hex
+
+
+class LocalTransport(Transport):
+    """A Transport sending the requests meant for Mojang and Microsoft to a FakeMojangServer.
+
+    The urls themselves are left untouched for the rest of the library, only the connection
+    goes to the local server, which receives the original host as the first segment of the path.
+
+    Attributes:
+        server_url (str): The base url of the local server.
+
+    """
+
+    def __init__(self, server_url: str, **kwargs):
+        super().__init__(**kwargs)
+        self.server_url = server_url
+
+    def request(self, method: str, url: str, **kwargs):
+        parts = urlsplit(url)
+        if parts.hostname in FakeMojangServer.HOSTS:
+            url = f"{self.server_url}/{parts.hostname}{parts.path}" + (f"?{parts.query}" if parts.query else "")
+        return super().request(method, url, **kwargs)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    # Headers and body are written separately, Nagle would hold the body back for a delayed ACK.
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def _respond(self, status: int, body=None, headers: Optional[dict] = None):
+        if isinstance(body, (dict, list)):
+            content, content_type = json.dumps(body).encode(), "application/json"
+        else:
+            content, content_type = body or b"", "application/octet-stream"
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(content)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(content)
+
+    def _handle(self, method: str):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        status, payload, headers = self.server.fake.handle(method, self.path, self.headers, body)
+        self._respond(status, payload, headers)
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+
+class FakeMojangServer:
+    """A local HTTP stand-in for the Mojang, Minecraft services, textures and Microsoft login endpoints.
+
+    It runs on a background thread, and every player it knows has a deterministic UUID, profile,
+    skin and name history. Latency, 429 responses and 5xx responses can be injected, so lookups,
+    retries and backoff can be tested and benchmarked repeatably without touching the real services.
+    Point the Dispatch at it with Dispatch.set_transport(server.transport()).
+
+    Attributes:
+        players (dict): The undashed UUIDs of the known players mapped to their names.
+        capes (set): The lowercase names of the players wearing a cape.
+        latency (float): How many seconds every response is delayed by.
+        rate_limit_ratio (float): The share of requests answered with a 429.
+        error_ratio (float): The share of requests answered with a 503.
+        retry_after (float): The Retry-After seconds sent along with a 429.
+        blocked (list): The addresses whose SHA1 digests the blockedservers endpoint returns.
+        requests (Counter): How many requests every endpoint received, by the name of its handler.
+
+    """
+
+    HOSTS = (
+        "api.mojang.com",
+        "sessionserver.mojang.com",
+        "api.minecraftservices.com",
+        "textures.minecraft.net",
+        "login.live.com",
+        "user.auth.xboxlive.com",
+        "xsts.auth.xboxlive.com",
+    )
+
+    TEXTURE_URL = "http://textures.minecraft.net/texture/"
+
+    def __init__(
+        self,
+        names: Iterable = (),
+        capes: Iterable = (),
+        latency: float = 0.0,
+        rate_limit_ratio: float = 0.0,
+        error_ratio: float = 0.0,
+        retry_after: float = 0.05,
+        seed: int = 0,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        self.players = {player_uuid(n): n for n in names}
+        self.capes = {c.lower() for c in capes}
+        self.latency = latency
+        self.rate_limit_ratio = rate_limit_ratio
+        self.error_ratio = error_ratio
+        self.retry_after = retry_after
+        self.blocked = ["*.example.com", "10.0.0.*", "blocked.net"]
+        self.requests = Counter()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), _Handler)
+        self._httpd.daemon_threads = True
+        self._httpd.fake = self
+        self._thread = None
+        self._routes = [
+            ("GET", "api.mojang.com", re.compile(r"/users/profiles/minecraft/(\w+)$"), self._name_to_uuid),
+            ("POST", "api.mojang.com", re.compile(r"/profiles/minecraft$"), self._names_to_uuids),
+            ("GET", "api.mojang.com", re.compile(r"/user/profiles/([\w-]+)/names$"), self._name_history),
+            ("POST", "api.mojang.com", re.compile(r"/orders/statistics$"), self._statistics),
+            ("GET", "sessionserver.mojang.com", re.compile(r"/session/minecraft/profile/([\w-]+)$"), self._profile),
+            ("GET", "sessionserver.mojang.com", re.compile(r"/blockedservers$"), self._blocked_servers),
+            ("GET", "textures.minecraft.net", re.compile(r"/texture/(\w+)$"), self._texture),
+            ("POST", "login.live.com", re.compile(r"/oauth20_token.srf$"), self._oauth_token),
+            ("POST", "user.auth.xboxlive.com", re.compile(r"/user/authenticate$"), self._xbox_token),
+            ("POST", "xsts.auth.xboxlive.com", re.compile(r"/xsts/authorize$"), self._xbox_token),
+            ("POST", "api.minecraftservices.com", re.compile(r"/authentication/login_with_xbox$"), self._login),
+            ("GET", "api.minecraftservices.com", re.compile(r"/minecraft/profile$"), self._account_profile),
+            ("GET", "api.minecraftservices.com", re.compile(r"/player/attributes$"), self._attributes),
+        ]
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} url={self.url} players={len(self.players)}>"
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeMojangServer":
+        """Starts serving on a background daemon thread."""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._httpd.serve_forever, name="py4mc-fake-mojang", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        """Stops serving, and closes the listening socket."""
+        if self._thread is not None:
+            self._httpd.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._httpd.server_close()
+
+    def transport(self, **kwargs) -> LocalTransport:
+        """Builds a transport sending every request to this server, the keyword arguments go to the Transport."""
+        return LocalTransport(self.url, **kwargs)
+
+    def add_player(self, name: str, cape: bool = False) -> str:
+        """Adds a player, and returns their undashed UUID."""
+        uuid = player_uuid(name)
+        self.players[uuid] = name
+        if cape:
+            self.capes.add(name.lower())
+        return uuid
+
+    def _find_player(self, identifier: str) -> Optional[str]:
+        uuid = identifier.replace("-", "").lower()
+        if uuid in self.players:
+            return self.players[uuid]
+        return self.players.get(player_uuid(identifier))
+
+    def _fault(self) -> Optional[tuple]:
+        with self._lock:
+            roll = self._random.random()
+        if roll < self.rate_limit_ratio:
+            error = {"error": "TooManyRequestsException", "errorMessage": "The client has sent too many requests."}
+            return 429, error, {"Retry-After": str(self.retry_after)}
+        if roll < self.rate_limit_ratio + self.error_ratio:
+            return 503, {"error": "ServiceUnavailable", "errorMessage": "Injected failure."}, {}
+        return None
+
+    def handle(self, method: str, path: str, headers, body: bytes) -> tuple:
+        """Answers a request, returning its status code, body and headers."""
+        if self.latency:
+            time.sleep(self.latency)
+        host, _, rest = path.lstrip("/").partition("/")
+        parts = urlsplit("/" + rest)
+        for route_method, route_host, pattern, handler in self._routes:
+            match = pattern.search(parts.path)
+            if route_method != method or route_host != host or match is None:
+                continue
+            with self._lock:
+                self.requests[handler.__name__.lstrip("_")] += 1
+            fault = self._fault()
+            if fault is not None:
+                return fault
+            return handler(match, headers, body, parse_qs(parts.query))
+        return 404, {"error": "NotFound", "errorMessage": f"{method} {path} is not emulated."}, {}
+
+    def _name_to_uuid(self, match, headers, body, query) -> tuple:
+        name = self._find_player(match.group(1))
+        if name is None:
+            return 204, None, {}
+        return 200, {"id": player_uuid(name), "name": name}, {}
+
+    def _names_to_uuids(self, match, headers, body, query) -> tuple:
+        names = json.loads(body or b"[]")
+        if len(names) > 10:
+            error = "Not more that 10 profile name per call is allowed."
+            return 400, {"error": "IllegalArgumentException", "errorMessage": error}, {}
+        found = [self._find_player(n) for n in names]
+        return 200, [{"id": player_uuid(n), "name": n} for n in found if n is not None], {}
+
+    def _name_history(self, match, headers, body, query) -> tuple:
+        name = self._find_player(match.group(1))
+        if name is None:
+            return 204, None, {}
+        return 200, [{"name": name.lower()}, {"name": name, "changedToAt": 1423059891000}], {}
+
+    def _statistics(self, match, headers, body, query) -> tuple:
+        return 200, {"total": 38000000, "last24h": 12000, "saleVelocityPerSeconds": 0.14}, {}
+
+    def _profile(self, match, headers, body, query) -> tuple:
+        name = self._find_player(match.group(1))
+        if name is None:
+            return 204, None, {}
+        uuid = player_uuid(name)
+        textures = {"SKIN": {"url": self.TEXTURE_URL + hashlib.sha256(uuid.encode()).hexdigest()}}
+        if name.lower() in self.capes:
+            textures["CAPE"] = {"url": self.TEXTURE_URL + hashlib.sha256(b"cape").hexdigest()}
+        value = {"timestamp": int(time.time() * 1000), "profileId": uuid, "profileName": name, "textures": textures}
+        encoded = base64.b64encode(json.dumps(value).encode()).decode()
+        properties = {"name": "textures", "value": encoded}
+        if query.get("unsigned") == ["false"]:
+            properties["signature"] = base64.b64encode(hashlib.sha512(encoded.encode()).digest()).decode()
+        return 200, {"id": uuid, "name": name, "properties": [properties]}, {}
+
+    def _blocked_servers(self, match, headers, body, query) -> tuple:
+        content = "\n".join(hashlib.sha1(a.encode()).hexdigest() for a in self.blocked).encode()
+        etag = '"{}"'.format(hashlib.sha1(content).hexdigest())
+        if headers.get("If-None-Match") == etag:
+            return 304, None, {"ETag": etag}
+        return 200, content, {"ETag": etag}
+
+    def _texture(self, match, headers, body, query) -> tuple:
+        # A PNG signature followed by filler, sized like a real 64x64 skin.
+        return 200, b"\x89PNG\r\n\x1a\n" + hashlib.sha256(match.group(1).encode()).digest() * 64, {}
+
+    def _oauth_token(self, match, headers, body, query) -> tuple:
+        token = hashlib.sha1(body).hexdigest()
+        return 200, {"access_token": f"ms-{token}", "refresh_token": f"refresh-{token}", "expires_in": 3600}, {}
+
+    def _xbox_token(self, match, headers, body, query) -> tuple:
+        not_after = time.strftime("%Y-%m-%dT%H:%M:%S.0000000Z", time.gmtime(time.time() + 86400))
+        token = hashlib.sha1(body).hexdigest()
+        return 200, {"Token": f"xbl-{token}", "NotAfter": not_after, "DisplayClaims": {"xui": [{"uhs": "1234"}]}}, {}
+
+    def _login(self, match, headers, body, query) -> tuple:
+        return 200, {"access_token": "mc-" + hashlib.sha1(body).hexdigest(), "expires_in": 86400}, {}
+
+    def _account_profile(self, match, headers, body, query) -> tuple:
+        if not headers.get("Authorization", "").startswith("Bearer "):
+            return 401, {"error": "Unauthorized", "errorMessage": "A bearer token is required."}, {}
+        name = next(iter(self.players.values()), "Player")
+        skin_url = self.TEXTURE_URL + hashlib.sha256(name.encode()).hexdigest()
+        skin = {"state": "ACTIVE", "url": skin_url, "variant": "CLASSIC"}
+        return 200, {"id": player_uuid(name), "name": name, "skins": [skin], "capes": []}, {}
+
+    def _attributes(self, match, headers, body, query) -> tuple:
+        if not headers.get("Authorization", "").startswith("Bearer "):
+            return 401, {"error": "Unauthorized", "errorMessage": "A bearer token is required."}, {}
+        names = ("onlineChat", "multiplayerServer", "multiplayerRealms", "telemetry")
+        privileges = {p: {"enabled": True} for p in names}
+        return 200, {"privileges": privileges, "profanityFilterPreferences": {"profanityFilterOn": False}}, {}
@@ -0,0 +1,227 @@
+import asyncio
+import threading
+import requests
+
+from typing import Optional
+from urllib.parse import urlsplit
+from requests import Response
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3.util.retry import Retry
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover - depends on the environment
+    aiohttp = None
+
+# The exceptions the transports raise when a request could not be completed, whatever the backend.
+if aiohttp is None:
+    NETWORK_ERRORS = (requests.RequestException,)
+else:
+    NETWORK_ERRORS = (requests.RequestException, aiohttp.ClientError, asyncio.TimeoutError)
+
+
+class Transport:
+    """Pooled, keep-alive HTTP transport used by the Dispatch.
+
+    Every host gets its own requests.Session with a mounted HTTPAdapter, so repeated calls to
+    api.mojang.com or sessionserver.mojang.com reuse the same TCP/TLS connection instead of
+    paying the handshake cost on every lookup.
+
+    Any object that exposes ``request(method, url, **kwargs)`` and returns a Response can be
+    used in place of this class, which is how tests swap in a local fake server.
+
+    Retrying is left to the RetryPolicy of the Dispatch by default. Connection retries set here
+    happen inside every attempt the policy makes, so the two multiply: with retries=2 and a
+    policy of 2 retries, a host that refuses connections is tried up to 9 times.
+
+    Attributes:
+        pool_connections (int): The amount of connection pools to cache per session.
+        pool_maxsize (int): The maximum amount of connections kept alive per pool.
+        timeout (float): The default timeout in seconds, used when no timeout is passed.
+        retries (int): How many times a failed connection attempt is retried within one request.
+        backoff_factor (float): The backoff factor between connection retries.
+
+    """
+
+    def __init__(
+        self,
+        pool_connections: int = 4,
+        pool_maxsize: int = 16,
+        timeout: Optional[float] = 10.0,
+        retries: int = 0,
+        backoff_factor: float = 0.1,
+    ):
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return "<{} pool_maxsize={} timeout={} retries={} hosts={}>".format(
+            self.__class__.__name__,
+            self.pool_maxsize,
+            self.timeout,
+            self.retries,
+            len(self._sessions),
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _build_session(self) -> requests.Session:
+        """Builds a session with a pooled adapter mounted for both schemes.
+
+        Only connection errors are retried here, status codes are left to the Dispatch
+        so non-idempotent requests are never sent twice by accident. Retry-After is ignored
+        too, otherwise urllib3 raises on a 429 before the rate limiter gets to see it.
+
+        Returns:
+            Session: The configured session.
+        """
+        retry = Retry(
+            total=self.retries,
+            connect=self.retries,
+            read=0,
+            status=0,
+            backoff_factor=self.backoff_factor,
+            respect_retry_after_header=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            max_retries=retry,
+        )
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def get_session(self, url: str) -> requests.Session:
+        """Gets the keep-alive session responsible for the url's host.
+
+        Args:
+            url (str): The url that is about to be requested.
+
+        Returns:
+            Session: The session for that host.
+        """
+        parts = urlsplit(url)
+        host = f"{parts.scheme}://{parts.netloc}"
+        session = self._sessions.get(host)
+        if session is None:
+            with self._lock:
+                session = self._sessions.get(host)
+                if session is None:
+                    session = self._build_session()
+                    self._sessions[host] = session
+        return session
+
+    def request(self, method: str, url: str, **kwargs) -> Response:
+        """Sends a request over the pooled session of the url's host.
+
+        Args:
+            method (str): The HTTP method to use.
+            url (str): The url to request.
+            **kwargs: Any keyword arguments requests.Session.request accepts.
+
+        Returns:
+            Response: The response received.
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        return self.get_session(url).request(method, url, **kwargs)
+
+    def close(self):
+        """Closes every pooled session."""
+        with self._lock:
+            sessions, self._sessions = self._sessions, {}
+        for session in sessions.values():
+            session.close()
+
+
+class AsyncTransport:
+    """Asynchronous counterpart of the Transport.
+
+    When aiohttp is installed, requests go through a single pooled ClientSession. Otherwise the
+    requests are handed to a pooled Transport on the event loop's default executor, so the event
+    loop is never blocked either way.
+
+    Responses are always returned as requests.Response objects, which means the Dispatch can
+    parse them exactly like synchronous responses.
+
+    Attributes:
+        pool_maxsize (int): The maximum amount of connections kept alive.
+        timeout (float): The total timeout in seconds of a request.
+        transport (Transport): The blocking transport used when aiohttp is not installed.
+
+    """
+
+    def __init__(
+        self,
+        pool_maxsize: int = 64,
+        timeout: Optional[float] = 10.0,
+        transport: Optional[Transport] = None,
+    ):
+        self.pool_maxsize = pool_maxsize
+        self.timeout = timeout
+        self.transport = transport
+        self._session = None
+
+    def __repr__(self):
+        backend = "aiohttp" if aiohttp is not None and self.transport is None else "executor"
+        return f"<{self.__class__.__name__} backend={backend} pool_maxsize={self.pool_maxsize}>"
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    def _get_session(self):
+        if self._session is None:
+            connector = aiohttp.TCPConnector(limit=self.pool_maxsize)
+            timeout = aiohttp.ClientTimeout(total=self.timeout)
+            self._session = aiohttp.ClientSession(connector=connector, timeout=timeout)
+        return self._session
+
+    async def request(self, method: str, url: str, **kwargs) -> Response:
+        """Sends a request without blocking the running event loop.
+
+        Args:
+            method (str): The HTTP method to use.
+            url (str): The url to request.
+            **kwargs: The headers, params, json or data of the request.
+
+        Returns:
+            Response: The response received.
+        """
+        if aiohttp is None or self.transport is not None:
+            if self.transport is None:
+                self.transport = Transport(pool_maxsize=self.pool_maxsize, timeout=self.timeout)
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                None, lambda: self.transport.request(method, url, **kwargs)
+            )
+        kwargs.pop("timeout", None)
+        async with self._get_session().request(method, url, **kwargs) as received:
+            response = Response()
+            response.status_code = received.status
+            response.headers = CaseInsensitiveDict(received.headers)
+            response.url = str(received.url)
+            response.encoding = received.charset
+            response._content = await received.read()
+            return response
+
+    async def close(self):
+        """Closes the underlying session or transport."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+        if self.transport is not None:
+            self.transport.close()
@@ -1,4 +1,5 @@
 from .profile import Profile, HistoryIndex
-from .textures import Skin, Cape
+from .textures import Skin, Cape, prefetch_textures
 from .misc import Statistics
 from .account import Account
+from .servers import BlockedServerIndex, BlockedServerRefresher
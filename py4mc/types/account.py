@@ -1,4 +1,5 @@
-import py4mc
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
 
 from ..dispatcher import Dispatch
 from .profile import Profile
@@ -7,18 +8,38 @@ from ..exceptions import AuthenticationException
 
 
 class Account:
+    """A logged in Minecraft account.
+
+    Nothing is requested when the account is created. The account information is fetched the
+    first time it is needed and kept afterwards, and many accounts can be fetched at once with
+    Account.hydrate.
+
+    Attributes:
+        access_token (str): The account's Minecraft access token.
+
+    """
+
     def __init__(self, access_token: str):
         self.access_token = access_token
         self._auth = {"Authorization": f"Bearer {access_token}"}
-        self.account = self._account_information()
-        self.mojang = py4mc.MojangApi()
+        self._account = None
+        self._attributes = None
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} hydrated={self._account is not None}>"
+
+    @property
+    def account(self) -> dict:
+        """The /minecraft/profile information of the account, requested on first access."""
+        if self._account is None:
+            self._account = self._account_information()
+        return self._account
 
     def get_profile(self) -> Profile:
-        profile_uuid = self.account.get("id")
-        return self.mojang.get_profile(profile_uuid)
+        return Profile.from_minecraft_profile(self.account)
 
     def auth_request(self, method: str, route: str):
-        response = Dispatch.do_request(method, route, headers=self._auth)
+        response = Dispatch.do_request(method, route, headers=dict(self._auth))
         if not isinstance(response, dict):
             raise AuthenticationException("Invalid access token was passed.")
         return response
@@ -28,13 +49,43 @@ class Account:
         return self.auth_request("GET", route)
 
     def get_attributes(self):
-        route = f"{Dispatch.SERVICE_URL}/player/attributes"
-        response = self.auth_request("GET", route)
-        return AccountAttributes(response)
+        if self._attributes is None:
+            route = f"{Dispatch.SERVICE_URL}/player/attributes"
+            response = self.auth_request("GET", route)
+            self._attributes = AccountAttributes(response)
+        return self._attributes
+
+    def hydrate_account(self, attributes: bool = False) -> "Account":
+        """Fetches everything about the account that has not been fetched yet.
+
+        Args:
+            attributes (bool): If the account's attributes should be fetched as well.
+
+        Returns:
+            Account: The account itself.
+        """
+        self.account
+        if attributes:
+            self.get_attributes()
+        return self
+
+    @classmethod
+    def hydrate(cls, accounts: Iterable, attributes: bool = False, max_workers: int = 8) -> list:
+        """Fetches the information of many accounts concurrently.
+
+        Args:
+            accounts (Iterable): The accounts to fetch.
+            attributes (bool): If the accounts' attributes should be fetched as well.
+            max_workers (int): The amount of threads to fetch with.
+
+        Returns:
+            list: The accounts, in the order they were given.
+        """
+        with ThreadPoolExecutor(max_workers) as executor:
+            return list(executor.map(lambda a: a.hydrate_account(attributes), accounts))
 
     def from_code(self, code: str):
         pass
 
     def from_token(self, access_token: str):
         pass
-
@@ -6,10 +6,14 @@ class Statistics:
     and the sale velocity in seconds.
 
     Attributes:
-        raw_data (dict): The raw json response recieved from the API.
+        total (int): The total amount of copies sold.
+        last_24h (int): The amount of copies sold in the last 24 hours.
+        sale_velocity (float): The amount of copies sold per second.
 
     """
 
+    __slots__ = ("total", "last_24h", "sale_velocity")
+
     VALID_METRICS = [
         "item_sold_minecraft",
         "prepaid_card_redeemed_minecraft",
@@ -26,11 +30,20 @@ class Statistics:
         self.sale_velocity = raw_data.get("saleVelocityPerSeconds")
 
     def __repr__(self):
-        arguments = [f"{k}={v}" for k, v in self.__dict__.items()]
+        arguments = [f"{k}={getattr(self, k)}" for k in self.__slots__]
         return "<{} {}>".format(self.__class__.__name__, " ".join(arguments))
 
 
 class AccountAttributes:
+    __slots__ = (
+        "privileges",
+        "online_chat",
+        "multiplayer_server",
+        "multiplayer_realms",
+        "telemetry",
+        "profanity_filter",
+    )
+
     def __init__(self, raw_data: dict):
         self.privileges = raw_data.get("privileges")
         self.online_chat = self._get_is_enabled("onlineChat")
@@ -42,7 +55,7 @@ class AccountAttributes:
         )
 
     def __repr__(self):
-        arguments = [f"{k}={v}" for k, v in self.__dict__.items()]
+        arguments = [f"{k}={getattr(self, k)}" for k in self.__slots__]
         return "<{} {}>".format(self.__class__.__name__, " ".join(arguments))
 
     def _get_is_enabled(self, value: str):
@@ -1,15 +1,57 @@
+import os
+import time
 import base64
 import json
 
 from uuid import UUID
-from typing import Union
-from functools import reduce
+from typing import Union, Optional, Iterator
+from itertools import islice
+from collections import deque
+from collections.abc import Iterable
 from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
 
 from ..dispatcher import Dispatch
+from ..cache import LookupCache, MISSING
+from ..utils import analytics
+from ..utils.parsers import json_loads
 from .textures import Skin, Cape
 
 
+def _decode_fields(raw) -> tuple:
+    """Decodes one archived profile into the fields Profile._from_fields takes.
+
+    Args:
+        raw: A sessionserver response, either decoded or as JSON text, or a (value, signature) pair.
+
+    Returns:
+        tuple: The uuid, username, timestamp, signature, skin url, skin model and cape url.
+    """
+    if isinstance(raw, (str, bytes)):
+        raw = json_loads(raw)
+    if isinstance(raw, dict):
+        properties = raw.get("properties")[0]
+        raw = (properties.get("value"), properties.get("signature"))
+    value, signature = raw
+    profile = json_loads(base64.b64decode(value))
+    textures = profile.get("textures")
+    skin = textures.get("SKIN") or {}
+    cape = textures.get("CAPE") or {}
+    return (
+        profile.get("profileId"),
+        profile.get("profileName"),
+        int(profile.get("timestamp")),
+        signature,
+        skin.get("url"),
+        "classic" if skin.get("metadata") is None else "slim",
+        cape.get("url"),
+    )
+
+
+def _decode_chunk(chunk: list) -> list:
+    return [_decode_fields(raw) for raw in chunk]
+
+
 class Profile:
     """Represents a profile from the Mojang API.
 
@@ -22,26 +64,52 @@ class Profile:
         The signature is another potentially useful piece of information a user can use.
 
     Attributes:
-        profile (dict): The raw profile dictionary.
         uuid (UUID): The profile's uuid.
         username (str): The profile's current username.
         timestamp (datetime): The time the server processed your request.
         signature (str): The request signature.
+        raw_value (str): The base64 profile value, only kept when keep_raw is True.
 
     """
 
-    def __init__(self, profile_value: str, signature: str):
-        self.profile = self._process_value(profile_value)
-        self.uuid = UUID(self.profile.get("profileId"), version = 4)
-        self.username = self.profile.get("profileName")
-        self.timestamp = self.get_timestamp()
+    __slots__ = (
+        "uuid",
+        "username",
+        "signature",
+        "raw_value",
+        "_timestamp",
+        "_skin_url",
+        "_skin_model",
+        "_cape_url",
+        "_cache",
+    )
+
+    def __init__(
+        self,
+        profile_value: str,
+        signature: str,
+        cache: Optional[LookupCache] = None,
+        keep_raw: bool = False,
+    ):
+        profile = self._process_value(profile_value)
+        textures = profile.get("textures")
+        skin = textures.get("SKIN") or {}
+        cape = textures.get("CAPE") or {}
+        self.uuid = UUID(profile.get("profileId"), version = 4)
+        self.username = profile.get("profileName")
         self.signature = signature
+        self.raw_value = profile_value if keep_raw else None
+        self._timestamp = int(profile.get("timestamp"))
+        self._skin_url = skin.get("url")
+        self._skin_model = "classic" if skin.get("metadata") is None else "slim"
+        self._cape_url = cape.get("url")
+        self._cache = cache
 
     def __str__(self):
         return self.username
 
     def __repr__(self):
-        arguments = [f"{k}={v}" for k, v in self.__dict__.items()]
+        arguments = [f"{k}={getattr(self, k)}" for k in ("uuid", "username", "timestamp", "signature")]
         return "<{} {}>".format(self.__class__.__name__, " ".join(arguments))
 
     def __eq__(self, other: object):
@@ -49,6 +117,165 @@ class Profile:
             return False
         return self.uuid == other.uuid
 
+    @classmethod
+    def from_response(cls, response: dict, cache: Optional[LookupCache] = None) -> "Profile":
+        """Builds a profile from a sessionserver profile response.
+
+        Args:
+            response (dict): The decoded sessionserver response.
+            cache (LookupCache): Where the profile's name history is cached, if anywhere.
+
+        Returns:
+            Profile: The profile the response describes.
+        """
+        properties = response.get("properties")[0]
+        return cls(properties.get("value"), properties.get("signature"), cache)
+
+    @classmethod
+    def _from_fields(
+        cls,
+        uuid: str,
+        username: str,
+        timestamp: int,
+        signature: Optional[str] = None,
+        skin_url: Optional[str] = None,
+        skin_model: str = "classic",
+        cape_url: Optional[str] = None,
+        cache: Optional[LookupCache] = None,
+    ) -> "Profile":
+        """Builds a profile from already parsed fields, without decoding anything."""
+        profile = cls.__new__(cls)
+        profile.uuid = UUID(uuid, version=4)
+        profile.username = username
+        profile.signature = signature
+        profile.raw_value = None
+        profile._timestamp = timestamp
+        profile._skin_url = skin_url
+        profile._skin_model = skin_model
+        profile._cape_url = cape_url
+        profile._cache = cache
+        return profile
+
+    @classmethod
+    def iter_raw_many(
+        cls,
+        raws: Iterable,
+        processes: Optional[int] = None,
+        chunksize: int = 2048,
+        fields_only: bool = False,
+        cache: Optional[LookupCache] = None,
+    ) -> Iterator[Union["Profile", tuple]]:
+        """Lazily decodes archived profiles across a pool of processes, in input order.
+
+        The base64 and JSON decoding of every chunk runs in a worker process, which only sends
+        back the plain field tuples. Profiles are then built from them without decoding anything
+        again. At most two chunks per process are in flight, so the archive is never held in memory.
+
+        Args:
+            raws (Iterable): Sessionserver responses, decoded or as JSON text, or (value, signature) pairs.
+            processes (int): The amount of worker processes, defaults to the CPU count. 0 decodes in this process.
+            chunksize (int): How many profiles are sent to a worker at once.
+            fields_only (bool): Yields the (uuid, username, timestamp, signature, skin url, skin model,
+                cape url) tuples instead of Profiles, which is the most compact result.
+            cache (LookupCache): Where the profiles' name histories are cached, if anywhere.
+
+        Yields:
+            Union[Profile, tuple]: The decoded profiles, or their fields.
+        """
+        raws = iter(raws)
+        chunks = iter(lambda: list(islice(raws, chunksize)), [])
+        if processes == 0:
+            decoded = map(_decode_chunk, chunks)
+        else:
+            decoded = cls._decode_in_pool(chunks, processes)
+        for fields in decoded:
+            if fields_only:
+                yield from fields
+            else:
+                yield from (cls._from_fields(*f, cache=cache) for f in fields)
+
+    @staticmethod
+    def _decode_in_pool(chunks: Iterator, processes: Optional[int]) -> Iterator[list]:
+        processes = processes or os.cpu_count() or 1
+        with ProcessPoolExecutor(processes) as executor:
+            pending = deque()
+            for chunk in chunks:
+                pending.append(executor.submit(_decode_chunk, chunk))
+                if len(pending) >= processes * 2:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+    @classmethod
+    def from_raw_many(
+        cls,
+        raws: Iterable,
+        processes: Optional[int] = None,
+        chunksize: int = 2048,
+        fields_only: bool = False,
+        cache: Optional[LookupCache] = None,
+    ) -> list:
+        """Decodes many archived profiles across a pool of processes.
+
+        Check the iter_raw_many method for extended documentation.
+
+        Returns:
+            list: The decoded profiles, or their fields, in input order.
+        """
+        return list(cls.iter_raw_many(raws, processes, chunksize, fields_only, cache))
+
+    @classmethod
+    def from_minecraft_profile(cls, response: dict, cache: Optional[LookupCache] = None) -> "Profile":
+        """Builds a profile from the minecraftservices profile of a logged in account.
+
+        The active skin and cape are used, and the timestamp is the time the profile was built.
+
+        Args:
+            response (dict): The decoded /minecraft/profile response.
+            cache (LookupCache): Where the profile's name history is cached, if anywhere.
+
+        Returns:
+            Profile: The account's profile.
+        """
+        skin = next((s for s in response.get("skins", []) if s.get("state") == "ACTIVE"), {})
+        cape = next((c for c in response.get("capes", []) if c.get("state") == "ACTIVE"), {})
+        return cls._from_fields(
+            response.get("id"),
+            response.get("name"),
+            int(time.time() * 1000),
+            skin_url=skin.get("url"),
+            skin_model="slim" if skin.get("variant", "").upper() == "SLIM" else "classic",
+            cape_url=cape.get("url"),
+            cache=cache,
+        )
+
+    @property
+    def timestamp(self) -> datetime:
+        return self.get_timestamp()
+
+    @property
+    def profile(self) -> dict:
+        """The profile dictionary.
+
+        The original dictionary is decoded again when the raw value was kept,
+        otherwise an equivalent dictionary is rebuilt from the parsed fields.
+        """
+        if self.raw_value is not None:
+            return self._process_value(self.raw_value)
+        textures = {}
+        if self._skin_url is not None:
+            textures["SKIN"] = {"url": self._skin_url}
+            if self._skin_model == "slim":
+                textures["SKIN"]["metadata"] = {"model": "slim"}
+        if self._cape_url is not None:
+            textures["CAPE"] = {"url": self._cape_url}
+        return {
+            "timestamp": self._timestamp,
+            "profileId": self.uuid.hex,
+            "profileName": self.username,
+            "textures": textures,
+        }
+
     def get_timestamp(self) -> datetime:
         """Gets the timestamp of the request.
 
@@ -58,10 +285,10 @@ class Profile:
         Returns:
             datetime: The datetime object to the timestamp.
         """
-        timestamp = int(self.profile.get("timestamp")) // 1000
-        return datetime.utcfromtimestamp(timestamp)
+        return datetime.utcfromtimestamp(self._timestamp // 1000)
 
-    def _process_value(self, profile_value: str) -> dict:
+    @staticmethod
+    def _process_value(profile_value: str) -> dict:
         """Decodes the Base64 profile data returned.
 
         Args:
@@ -79,36 +306,33 @@ class Profile:
 
         This gets the Java hashcode of the profile's uuid.
         If the hashcode is even, the default skin is a Steve.
-        Otherwise, the skin is an Alex.
+        Otherwise, the skin is an Alex. Use utils.analytics to classify many UUIDs at once.
 
         Returns:
             str: Steve if the profile's default skin is Steve, Alex if it's Alex.
         """
-        uuid_values = list()
-        for number in [7, 15, 23, 31]:
-            converted_uuid = int(self.uuid.hex[number], 16)
-            uuid_values.append(converted_uuid)
-        hash_code = reduce(lambda x, y: x ^ y, uuid_values)
-        if hash_code % 2 == 0:
-            return "Steve"
-        return "Alex"
-
-    def get_skin(self) -> Skin:
+        return analytics.default_skin(self.uuid)
+
+    def get_skin(self) -> Optional[Skin]:
         """Gets the profile's skin.
 
         If there is a metadata, then the skin is in the slim style.
         Else it is in the classic style.
 
         Returns:
-            Skin: The profile's skin.
+            Skin: The profile's skin, or None if the profile uses its default skin.
         """
-        textures = self.profile.get("textures")
-        skin = textures.get("SKIN")
-        if skin.get("metadata") is not None:
-            model_type = "slim"
-        else:
-            model_type = "classic"
-        return Skin(skin.get("url"), model_type)
+        if self._skin_url is None:
+            return None
+        return Skin(self._skin_url, self._skin_model)
+
+    def skin_attributes(self) -> tuple:
+        """Gets the profile's skin url and model type without downloading the skin.
+
+        Returns:
+            tuple: The skin's url and its model type. The url is None if the profile uses its default skin.
+        """
+        return self._skin_url, self._skin_model
 
     def get_cape(self) -> Union[bool, Cape]:
         """Gets the profile's cape.
@@ -117,25 +341,40 @@ class Profile:
             Cape: The profile's cape.
             bool: Returns None if the profile does not have a cape.
         """
-        textures = self.profile.get("textures")
-        if textures.get("CAPE") is None:
+        cape_url = self.cape_url()
+        if cape_url is None:
             return None
-        return Cape(textures.get("CAPE"))
+        return Cape(cape_url)
+
+    def cape_url(self) -> Optional[str]:
+        """Gets the profile's cape url without downloading the cape.
+
+        Returns:
+            str: The cape's url, or None if the profile does not have a cape.
+        """
+        return self._cape_url
 
     def name_history(self) -> list:
         """Gets the profile's name history.
 
         If there is only one name in the name history, then it
         will return a HistoryIndex object. If not, it returns a
-        list of HistoryIndex objects.
+        list of HistoryIndex objects. When the profile was given a
+        cache, the name history is only requested once per TTL.
 
         Returns:
             HistoryIndex: One of the profile's names.
             list: A list of the profile's old names.
 
         """
-        route = Dispatch.API_BASE + "/user/profiles/{}/names".format(self.uuid)
-        previous_names = Dispatch.do_request("GET", route)
+        previous_names = MISSING
+        if self._cache is not None:
+            previous_names = self._cache.get("name_history", self.uuid.hex)
+        if previous_names is MISSING:
+            route = Dispatch.API_BASE + "/user/profiles/{}/names".format(self.uuid)
+            previous_names = Dispatch.do_request("GET", route)
+            if self._cache is not None and isinstance(previous_names, list):
+                self._cache.set("name_history", self.uuid.hex, previous_names)
         if len(previous_names) == 1:
             return HistoryIndex(previous_names[0])
         return [HistoryIndex(v) for v in previous_names]
@@ -145,13 +384,14 @@ class HistoryIndex:
     """Represents one element of a profile's history of names.
 
     Attributes:
-        raw_data (dict): The profile's raw name data.
         name (str): One of the profile's old names.
         changed_at (datetime): The time they changed the name. Can be None if they have never done so.
         is_original (bool): If the name is their original name. Is True if it is their original name.
 
     """
 
+    __slots__ = ("name", "changed_at", "is_original")
+
     def __init__(self, raw_data: dict):
         self.name = raw_data.get("name")
         self.changed_at = raw_data.get("changedToAt")
@@ -163,5 +403,5 @@ class HistoryIndex:
             self.is_original = False
 
     def __repr__(self):
-        arguments = [f"{k}={v}" for k, v in self.__dict__.items()]
+        arguments = [f"{k}={getattr(self, k)}" for k in self.__slots__]
         return "<{} {}>".format(self.__class__.__name__, " ".join(arguments))
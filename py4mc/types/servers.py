@@ -0,0 +1,243 @@
+import os
+import asyncio
+import hashlib
+import threading
+
+from typing import Optional, Callable
+from collections.abc import Iterable
+
+from ..dispatcher import Dispatch
+from ..exceptions import ApiException
+
+
+class BlockedServerIndex:
+    """An index of Mojang's blocked server hashes.
+
+    The client does not only hash the address it connects to, it also hashes wildcard variants
+    of it: "*.example.com" and "*.com" for mc.example.com, or "10.0.0.*", "10.0.*" and "10.*" for
+    10.0.0.1. Checking an address therefore costs one set lookup per variant, no matter how many
+    servers are blocked.
+
+    Attributes:
+        hashes (frozenset): The lowercase SHA1 hex digests of the blocked addresses.
+
+    """
+
+    __slots__ = ("hashes",)
+
+    def __init__(self, hashes: Iterable = ()):
+        self.hashes = frozenset(h.strip().lower() for h in hashes if h.strip())
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} hashes={len(self.hashes)}>"
+
+    def __len__(self):
+        return len(self.hashes)
+
+    def __iter__(self):
+        return iter(self.hashes)
+
+    def __contains__(self, server_hash: str):
+        return server_hash.lower() in self.hashes
+
+    def update(self, added: Iterable = (), removed: Iterable = ()):
+        """Applies a delta to the index in place.
+
+        The hashes are swapped atomically, so threads checking addresses concurrently
+        either see the old or the new list, never a mix of both.
+
+        Args:
+            added (Iterable): The hashes that were added to the list.
+            removed (Iterable): The hashes that were removed from the list.
+        """
+        self.hashes = (self.hashes - frozenset(removed)) | frozenset(added)
+
+    @classmethod
+    def from_content(cls, content: bytes) -> "BlockedServerIndex":
+        """Builds an index from the body of the blockedservers endpoint.
+
+        Args:
+            content (bytes): The newline separated hashes.
+
+        Returns:
+            BlockedServerIndex: The index of the hashes.
+        """
+        return cls(content.decode().splitlines())
+
+    @staticmethod
+    def _strip_address(address: str) -> str:
+        address = address.strip().lower()
+        if address.startswith("["):
+            return address[1:].split("]", 1)[0]
+        if address.count(":") == 1:
+            address = address.split(":", 1)[0]
+        return address.rstrip(".")
+
+    @classmethod
+    def address_variants(cls, address: str) -> list:
+        """Gets every variant of an address the client checks against the blocked hashes.
+
+        Args:
+            address (str): A hostname or IP address, optionally followed by a port.
+
+        Returns:
+            list: The address itself, followed by its wildcard variants.
+        """
+        address = cls._strip_address(address)
+        parts = address.split(".")
+        variants = [address]
+        if len(parts) == 4 and all(p.isdigit() for p in parts):
+            variants.extend(".".join(parts[:i]) + ".*" for i in range(3, 0, -1))
+        else:
+            variants.extend("*." + ".".join(parts[i:]) for i in range(1, len(parts)))
+        return variants
+
+    def matching_rule(self, address: str) -> Optional[str]:
+        """Gets the variant of an address that is blocked.
+
+        Args:
+            address (str): A hostname or IP address, optionally followed by a port.
+
+        Returns:
+            str: The blocked variant, such as "*.example.com", or None if the address is not blocked.
+        """
+        for variant in self.address_variants(address):
+            if hashlib.sha1(variant.encode()).hexdigest() in self.hashes:
+                return variant
+        return None
+
+    def is_blocked(self, address: str) -> bool:
+        """Checks if the client would refuse to connect to an address.
+
+        Args:
+            address (str): A hostname or IP address, optionally followed by a port.
+
+        Returns:
+            bool: True if the address or one of its wildcard variants is blocked.
+        """
+        return self.matching_rule(address) is not None
+
+
+class BlockedServerRefresher:
+    """Keeps a BlockedServerIndex up to date by polling the blockedservers endpoint.
+
+    Every poll is a conditional request using the ETag and Last-Modified of the previous response
+    when Mojang sends them. Otherwise the body is compared against the digest of the last body,
+    so an unchanged list is never parsed or diffed again. When the list did change, only the
+    added and removed hashes are applied to the index, and the change callbacks are called with them.
+
+    Attributes:
+        index (BlockedServerIndex): The index that is kept up to date.
+        interval (float): How many seconds to wait between polls.
+        path (str): Where the last known list is persisted between restarts, if anywhere.
+        last_error (Exception): The exception raised by the last failed background poll, if any.
+
+    """
+
+    def __init__(
+        self,
+        index: Optional[BlockedServerIndex] = None,
+        interval: float = 60.0,
+        path: Optional[str] = None,
+    ):
+        self.index = index if index is not None else BlockedServerIndex()
+        self.interval = interval
+        self.path = path
+        self.last_error = None
+        self._callbacks = []
+        self._etag = None
+        self._last_modified = None
+        self._digest = None
+        self._stopped = threading.Event()
+        self._thread = None
+        if path is not None and os.path.exists(path):
+            with open(path, "rb") as blocked_file:
+                content = blocked_file.read()
+            self._digest = hashlib.sha1(content).digest()
+            self.index.hashes = BlockedServerIndex.from_content(content).hashes
+
+    def __repr__(self):
+        return f"<{self.__class__.__name__} index={self.index!r} interval={self.interval}>"
+
+    def on_change(self, callback: Callable) -> Callable:
+        """Registers a callback that is called with the added and removed hashes on every change.
+
+        Can be used as a decorator.
+        """
+        self._callbacks.append(callback)
+        return callback
+
+    def refresh(self) -> tuple:
+        """Polls the blockedservers endpoint once, and applies any change to the index.
+
+        Returns:
+            tuple: The frozensets of added and removed hashes, both empty if nothing changed.
+
+        Raises:
+            ApiException: If the endpoint responded with an unexpected status code.
+        """
+        headers = {}
+        if self._etag is not None:
+            headers["If-None-Match"] = self._etag
+        if self._last_modified is not None:
+            headers["If-Modified-Since"] = self._last_modified
+        route = Dispatch.SESSION_SERVER + "/blockedservers"
+        response = Dispatch.raw_request("GET", route, headers=headers)
+        if response.status_code == 304:
+            return frozenset(), frozenset()
+        if response.status_code != 200:
+            raise ApiException(f"The blocked servers could not be retrieved, status {response.status_code}.")
+        self._etag = response.headers.get("ETag")
+        self._last_modified = response.headers.get("Last-Modified")
+        digest = hashlib.sha1(response.content).digest()
+        if digest == self._digest:
+            return frozenset(), frozenset()
+        self._digest = digest
+        hashes = BlockedServerIndex.from_content(response.content).hashes
+        added, removed = hashes - self.index.hashes, self.index.hashes - hashes
+        self.index.update(added, removed)
+        if self.path is not None:
+            with open(self.path, "wb") as blocked_file:
+                blocked_file.write(response.content)
+        if added or removed:
+            for callback in self._callbacks:
+                callback(added, removed)
+        return added, removed
+
+    def _poll(self):
+        while not self._stopped.is_set():
+            try:
+                self.refresh()
+                self.last_error = None
+            except Exception as exception:
+                self.last_error = exception
+            self._stopped.wait(self.interval)
+
+    def start(self) -> "BlockedServerRefresher":
+        """Starts polling on a background daemon thread, the first poll happens immediately."""
+        if self._thread is None or not self._thread.is_alive():
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._poll, name="py4mc-blockedservers", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        """Stops the background thread."""
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    async def run(self):
+        """Polls forever from an asyncio task, running every poll on the default executor.
+
+        Cancel the task to stop polling.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                await loop.run_in_executor(None, self.refresh)
+                self.last_error = None
+            except Exception as exception:
+                self.last_error = exception
+            await asyncio.sleep(self.interval)
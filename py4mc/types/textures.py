@@ -1,15 +1,37 @@
-import hashlib
+from typing import Optional
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
 
 from ..dispatcher import Dispatch
+from ..cache import TextureCache
+from ..exceptions import ResourceNotFound
 
 
 class _Texture:
-    def __init__(self, texture_url: str):
-        self.texture = self._texture_bytes(texture_url)
+    """A skin or cape, whose bytes are only downloaded the first time they are accessed.
+
+    Downloaded textures are kept in a shared, content addressed TextureCache, so identical
+    textures are downloaded once no matter how many profiles use them.
+
+    Attributes:
+        texture_url (str): The url of the texture.
+        texture_hash (str): The hash of the texture, taken from its url.
+        cache (TextureCache): The cache shared by every texture, replace it to persist textures to disk.
+
+    """
+
+    __slots__ = ("texture_url", "texture_hash", "_texture")
+
+    cache = TextureCache()
+
+    def __init__(self, texture_url: str, texture: Optional[bytes] = None):
         self.texture_url = texture_url
         # It's less intensive to just get the last 38 characters
         # rather than to hash the bytes.
         self.texture_hash = texture_url[38:]
+        if texture is not None:
+            self.cache.set(self.texture_hash, texture)
+        self._texture = texture
 
     def __str__(self):
         return self.texture_hash
@@ -19,14 +41,48 @@ class _Texture:
             return False
         return self.texture_hash == other.texture_hash
 
-    def _texture_bytes(self, texture_url: str):
-        response = Dispatch.do_request("GET", texture_url)
+    @property
+    def texture(self) -> bytes:
+        """The bytes of the texture, downloaded on first access."""
+        if self._texture is None:
+            self._texture = self.fetch(self.texture_url)
+        return self._texture
+
+    @classmethod
+    def fetch(cls, texture_url: str) -> bytes:
+        """Gets the bytes of a texture from the cache, downloading them if they are not cached.
+
+        Args:
+            texture_url (str): The url of the texture.
+
+        Returns:
+            bytes: The texture.
+        """
+        texture_hash = texture_url[38:]
+        texture = cls.cache.get(texture_hash)
+        if texture is None:
+            single_flight = Dispatch.single_flight
+            if single_flight is None:
+                texture = cls._texture_bytes(texture_url)
+            else:
+                # Profiles sharing a texture download it once, even when fetched concurrently.
+                texture = single_flight.do(("texture", texture_hash), cls._texture_bytes, texture_url)
+            cls.cache.set(texture_hash, texture)
+        return texture
+
+    @staticmethod
+    def _texture_bytes(texture_url: str) -> bytes:
+        response = Dispatch.raw_request("GET", texture_url)
+        if response.status_code != 200:
+            raise ResourceNotFound(f"The texture {texture_url} could not be downloaded.")
         return response.content
 
 
 class Skin(_Texture):
-    def __init__(self, texture_url: str, model_type: str):
-        super().__init__(texture_url)
+    __slots__ = ("model",)
+
+    def __init__(self, texture_url: str, model_type: str, texture: Optional[bytes] = None):
+        super().__init__(texture_url, texture)
         self.model = model_type
 
     def __repr__(self):
@@ -34,5 +90,30 @@ class Skin(_Texture):
 
 
 class Cape(_Texture):
-    pass
+    __slots__ = ()
+
+
+def prefetch_textures(profiles: Iterable, max_workers: int = 8) -> int:
+    """Downloads the skins and capes of many profiles concurrently.
+
+    Every distinct texture that is not cached yet is downloaded once, after which
+    accessing the texture of any of the profiles does not make a request.
+
+    Args:
+        profiles (Iterable): The profiles whose textures should be downloaded.
+        max_workers (int): The amount of threads to download with.
 
+    Returns:
+        int: The amount of textures that were downloaded.
+    """
+    urls = {}
+    for profile in profiles:
+        if profile is None:
+            continue
+        for texture_url in (profile.skin_attributes()[0], profile.cape_url()):
+            if texture_url is not None:
+                urls.setdefault(texture_url[38:], texture_url)
+    missing = [u for h, u in urls.items() if h not in _Texture.cache]
+    with ThreadPoolExecutor(max_workers) as executor:
+        list(executor.map(_Texture.fetch, missing))
+    return len(missing)
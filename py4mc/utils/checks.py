@@ -1,24 +1,32 @@
+import re
 import json
 
-from string import ascii_letters
-from uuid import UUID
+from collections import namedtuple
+from collections.abc import Iterable
 
+NAME_PATTERN = re.compile(r"[A-Za-z0-9_]{1,25}")
 
-def is_valid_uuid(uuid: UUID, version: int = 4) -> bool:
+UUID_PATTERN = re.compile(r"[0-9a-fA-F]{32}")
+
+DASHED_UUID_PATTERN = re.compile(r"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}")
+
+Identifiers = namedtuple("Identifiers", ["names", "uuids", "rejects"])
+
+
+def is_valid_uuid(uuid: str, version: int = 4) -> bool:
     """Checks if the given uuid is valid.
 
     Args:
-        uuid: The uuid to check.
-        version: The uuid version to check.
+        uuid: The uuid to check, with or without dashes.
+        version: Kept for compatibility, any version is accepted like before.
 
     Returns:
         bool: True if the uuid is valid, False if it is not.
     """
-    try:
-        UUID(uuid, version=version)
-        return True
-    except ValueError:
+    if not isinstance(uuid, str):
         return False
+    pattern = DASHED_UUID_PATTERN if len(uuid) == 36 else UUID_PATTERN
+    return pattern.fullmatch(uuid) is not None
 
 
 def is_valid_json(string: str) -> bool:
@@ -49,6 +57,34 @@ def is_valid_name(name: str) -> bool:
     Returns:
         bool: True if name is valid, False if it is not.
     """
-    if len(name) <= 25:
-        return all(x in ascii_letters + "_" for x in name)
-    return False
+    return isinstance(name, str) and NAME_PATTERN.fullmatch(name) is not None
+
+
+def partition_identifiers(identifiers: Iterable) -> Identifiers:
+    """Splits a mixed iterable of names and UUIDs in a single pass.
+
+    A UUID is 32 characters long without dashes, so it can never be mistaken for a name.
+
+    Args:
+        identifiers (Iterable): The names and UUIDs, dashed or undashed.
+
+    Returns:
+        Identifiers: The valid names, the valid UUIDs and everything else, each in input order.
+    """
+    names, uuids, rejects = [], [], []
+    match_name, match_uuid, match_dashed = NAME_PATTERN.fullmatch, UUID_PATTERN.fullmatch, DASHED_UUID_PATTERN.fullmatch
+    for identifier in identifiers:
+        if not isinstance(identifier, str):
+            rejects.append(identifier)
+            continue
+        # The length alone tells which pattern can match, so every identifier is matched once.
+        length = len(identifier)
+        if length <= 25:
+            (names if match_name(identifier) else rejects).append(identifier)
+        elif length == 32:
+            (uuids if match_uuid(identifier) else rejects).append(identifier)
+        elif length == 36:
+            (uuids if match_dashed(identifier) else rejects).append(identifier)
+        else:
+            rejects.append(identifier)
+    return Identifiers(names, uuids, rejects)
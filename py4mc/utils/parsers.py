@@ -1 +1,40 @@
 # Later, when I do protocol
+import json
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+JSON_BACKEND = "json" if orjson is None else "orjson"
+
+
+def json_loads(data: bytes):
+    """Decodes a JSON document, using orjson when it is installed.
+
+    Args:
+        data: The raw bytes or string to decode.
+
+    Returns:
+        The decoded document.
+
+    Raises:
+        ValueError: If the data is not valid JSON.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps(document) -> bytes:
+    """Encodes a document to compact JSON bytes, using orjson when it is installed.
+
+    Args:
+        document: The document to encode.
+
+    Returns:
+        bytes: The encoded document.
+    """
+    if orjson is not None:
+        return orjson.dumps(document)
+    return json.dumps(document, separators=(",", ":")).encode()
@@ -0,0 +1,34 @@
+import pytest
+
+from py4mc import Dispatch
+
+
+@pytest.fixture(autouse=True)
+def close_circuits():
+    # Failures recorded by one test must not leave a circuit open for the next one.
+    yield
+    if Dispatch.circuit_breaker is not None:
+        Dispatch.circuit_breaker.reset()
+
+
+@pytest.fixture
+def dispatch():
+    # Tests swap whatever Dispatch state they need, it is all restored once they are done.
+    # Client side rate limiting is disabled, as the fakes answer far faster than Mojang allows.
+    previous = (
+        Dispatch.transport,
+        Dispatch.rate_limiter,
+        Dispatch.single_flight,
+        Dispatch.instrumentation,
+        Dispatch.retry_policy,
+        Dispatch.circuit_breaker,
+    )
+    Dispatch.set_rate_limiter(None)
+    yield Dispatch
+    transport, rate_limiter, single_flight, instrumentation, retry_policy, circuit_breaker = previous
+    Dispatch.set_transport(transport)
+    Dispatch.set_rate_limiter(rate_limiter)
+    Dispatch.set_single_flight(single_flight)
+    Dispatch.set_instrumentation(instrumentation)
+    Dispatch.set_retry_policy(retry_policy)
+    Dispatch.set_circuit_breaker(circuit_breaker)
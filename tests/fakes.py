@@ -0,0 +1,109 @@
+import re
+import json
+import time
+import base64
+import hashlib
+import asyncio
+import threading
+
+from uuid import UUID
+from requests import Response
+
+
+def make_uuid(name: str) -> str:
+    return UUID(hashlib.md5(name.lower().encode()).hexdigest(), version=4).hex
+
+
+def make_profile_response(name: str, cape: bool = False, slim: bool = False) -> dict:
+    textures = {"SKIN": {"url": f"http://textures.minecraft.net/texture/skin{make_uuid(name)}"}}
+    if slim:
+        textures["SKIN"]["metadata"] = {"model": "slim"}
+    if cape:
+        textures["CAPE"] = {"url": "http://textures.minecraft.net/texture/cape0000000000000000"}
+    value = {
+        "timestamp": 1641070000000,
+        "profileId": make_uuid(name),
+        "profileName": name,
+        "textures": textures,
+    }
+    encoded = base64.b64encode(json.dumps(value).encode()).decode()
+    return {
+        "id": make_uuid(name),
+        "name": name,
+        "properties": [{"name": "textures", "value": encoded, "signature": "c2lnbmF0dXJl"}],
+    }
+
+
+def make_response(status_code: int = 200, payload=None, content: bytes = None, headers: dict = None):
+    response = Response()
+    response.status_code = status_code
+    response.encoding = "utf-8"
+    if payload is not None:
+        content = json.dumps(payload).encode()
+    response._content = content if content is not None else b""
+    response.headers.update(headers or {})
+    return response
+
+
+class FakeMojang:
+    """An in-process stand-in for the Mojang endpoints, usable as a Dispatch transport."""
+
+    PROFILE_ROUTE = re.compile(r"/session/minecraft/profile/(\w+)")
+    NAME_ROUTE = re.compile(r"/users/profiles/minecraft/(\w+)$")
+    HISTORY_ROUTE = re.compile(r"/user/profiles/([\w-]+)/names")
+
+    def __init__(self, names=(), latency: float = 0.0, capes=()):
+        self.players = {make_uuid(n): n for n in names}
+        self.capes = set(capes)
+        self.latency = latency
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def count(self, fragment: str) -> int:
+        return len([c for c in self.calls if fragment in c[1]])
+
+    def respond(self, method: str, url: str, **kwargs):
+        with self._lock:
+            self.calls.append((method, url))
+        if url.endswith("/profiles/minecraft") and method == "POST":
+            found = [n for n in kwargs.get("json") if make_uuid(n) in self.players]
+            return make_response(payload=[{"id": make_uuid(n), "name": self.players[make_uuid(n)]} for n in found])
+        match = self.PROFILE_ROUTE.search(url)
+        if match is not None:
+            name = self.players.get(match.group(1).replace("-", ""))
+            if name is None:
+                return make_response(204)
+            return make_response(payload=make_profile_response(name, cape=name in self.capes))
+        match = self.NAME_ROUTE.search(url)
+        if match is not None:
+            if make_uuid(match.group(1)) not in self.players:
+                return make_response(204)
+            name = self.players[make_uuid(match.group(1))]
+            return make_response(payload={"id": make_uuid(name), "name": name})
+        match = self.HISTORY_ROUTE.search(url)
+        if match is not None:
+            name = self.players.get(match.group(1).replace("-", ""))
+            return make_response(payload=[{"name": name.lower()}, {"name": name, "changedToAt": 1423059891000}])
+        if url.endswith("/blockedservers"):
+            blocked = [hashlib.sha1(s.encode()).hexdigest() for s in ("*.example.com", "10.0.0.*")]
+            return make_response(content="\n".join(blocked).encode())
+        if url.endswith("/orders/statistics"):
+            return make_response(payload={"total": 10, "last24h": 2, "saleVelocityPerSeconds": 0.5})
+        if "textures.minecraft.net" in url:
+            return make_response(content=url.encode(), headers={"Content-Type": "image/png"})
+        return make_response(404)
+
+    def request(self, method: str, url: str, **kwargs):
+        if self.latency:
+            time.sleep(self.latency)
+        return self.respond(method, url, **kwargs)
+
+
+class AsyncFakeMojang(FakeMojang):
+    async def request(self, method: str, url: str, **kwargs):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return self.respond(method, url, **kwargs)
+
+    async def close(self):
+        pass
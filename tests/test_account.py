@@ -0,0 +1,58 @@
+import threading
+
+import pytest
+
+from py4mc.types import Account, Profile
+
+from fakes import make_response, make_uuid
+
+
+class AccountEndpoints:
+    def __init__(self):
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def request(self, method, url, **kwargs):
+        with self.lock:
+            self.calls.append(url)
+        name = kwargs["headers"]["Authorization"].split()[-1]
+        if url.endswith("/minecraft/profile"):
+            return make_response(
+                payload={
+                    "id": make_uuid(name),
+                    "name": name,
+                    "skins": [{"state": "ACTIVE", "url": "http://textures.minecraft.net/texture/abc", "variant": "SLIM"}],
+                    "capes": [{"state": "INACTIVE", "url": "http://textures.minecraft.net/texture/def"}],
+                }
+            )
+        return make_response(
+            payload={
+                "privileges": {"onlineChat": {"enabled": True}},
+                "profanityFilterPreferences": {"profanityFilterOn": False},
+            }
+        )
+
+
+class TestAccount:
+    @pytest.fixture(autouse=True)
+    def setup_dispatch(self, dispatch):
+        self.endpoints = AccountEndpoints()
+        dispatch.set_transport(self.endpoints)
+
+    def test_account_is_lazy(self):
+        account = Account("Notch")
+        assert self.endpoints.calls == []
+        profile = account.get_profile()
+        assert isinstance(profile, Profile)
+        assert profile.username == "Notch" and profile.uuid.hex == make_uuid("Notch")
+        assert profile.skin_attributes() == ("http://textures.minecraft.net/texture/abc", "slim")
+        assert profile.cape_url() is None
+        account.get_profile()
+        assert len(self.endpoints.calls) == 1
+
+    def test_hydrate(self):
+        accounts = Account.hydrate([Account(f"bot_{chr(97 + i)}") for i in range(20)], attributes=True)
+        assert len(self.endpoints.calls) == 40
+        assert [a.account["name"] for a in accounts] == [f"bot_{chr(97 + i)}" for i in range(20)]
+        assert accounts[0].get_attributes().online_chat is True
+        assert len(self.endpoints.calls) == 40
@@ -0,0 +1,62 @@
+import uuid
+import random
+
+from functools import reduce
+
+import pytest
+
+from py4mc.utils import analytics
+from py4mc.types import Profile
+
+from fakes import make_profile_response
+
+UUIDS = [uuid.UUID(int=random.Random(i).getrandbits(128)) for i in range(500)] + [uuid.uuid4() for _ in range(500)]
+
+
+def legacy_default_skin(value: uuid.UUID) -> str:
+    hash_code = reduce(lambda x, y: x ^ y, [int(value.hex[n], 16) for n in (7, 15, 23, 31)])
+    return "Steve" if hash_code % 2 == 0 else "Alex"
+
+
+BACKENDS = [
+    False,
+    pytest.param(True, marks=pytest.mark.skipif(analytics.numpy is None, reason="NumPy is not installed")),
+]
+
+
+class TestAnalytics:
+    def test_pack_uuids(self):
+        packed = analytics.pack_uuids([u.hex for u in UUIDS[:3]])
+        assert packed == b"".join(u.bytes for u in UUIDS[:3])
+        assert analytics.pack_uuids([str(UUIDS[0]), UUIDS[1], UUIDS[2].hex.upper()]) == packed
+        assert analytics.pack_uuids(packed) == packed
+        with pytest.raises(ValueError):
+            analytics.pack_uuids(["not a uuid"])
+        with pytest.raises(ValueError):
+            analytics.pack_uuids(b"\x00" * 15)
+        # 30 and 34 hex digits add up to two UUIDs, but neither of them is one.
+        with pytest.raises(ValueError):
+            analytics.pack_uuids(["ab" * 15, "cd" * 17])
+
+    @pytest.mark.parametrize("use_numpy", BACKENDS)
+    def test_default_skins_match_legacy(self, use_numpy):
+        expected = [legacy_default_skin(u) for u in UUIDS]
+        assert analytics.default_skins([u.hex for u in UUIDS], use_numpy=use_numpy) == expected
+        assert [analytics.default_skin(u) for u in UUIDS] == expected
+        assert set(expected) == {"Steve", "Alex"}
+
+    @pytest.mark.parametrize("use_numpy", BACKENDS)
+    def test_analyze_uuids(self, use_numpy):
+        columns = analytics.analyze_uuids([str(u) for u in UUIDS], use_numpy=use_numpy)
+        assert [int(v) for v in columns["version"]] == [u.bytes[6] >> 4 for u in UUIDS]
+        assert [int(v) for v in columns["version"][500:]] == [4] * 500
+        assert [analytics.VARIANTS[v] for v in columns["variant"]] == [u.variant for u in UUIDS]
+        assert [analytics.DEFAULT_SKINS[c] for c in columns["default_skin"]] == [legacy_default_skin(u) for u in UUIDS]
+
+    def test_empty(self):
+        assert analytics.default_skins([], use_numpy=False) == []
+        assert analytics.analyze_uuids([], use_numpy=False)["version"] == b""
+
+    def test_profile_default_skin(self):
+        profile = Profile.from_response(make_profile_response("Notch"))
+        assert profile.default_skin() == legacy_default_skin(profile.uuid)
@@ -0,0 +1,83 @@
+import time
+import types
+import asyncio
+
+import pytest
+
+from py4mc import AsyncMojangApi, Dispatch, async_api, ratelimit
+from py4mc.ratelimit import RateLimiter
+from py4mc.types import Profile, Statistics, Skin, Cape
+
+from fakes import AsyncFakeMojang, make_uuid
+
+NAMES = [f"player_{chr(97 + i // 26)}{chr(97 + i % 26)}" for i in range(200)]
+
+
+@pytest.mark.usefixtures("dispatch")
+class TestAsyncMojangApi:
+    def test_concurrent_user_resolution(self):
+        fake = AsyncFakeMojang(NAMES, latency=0.05)
+
+        async def resolve():
+            async with AsyncMojangApi(transport=fake, concurrency=100) as mojang:
+                return await mojang.get_user(NAMES + ["unknown_name"])
+
+        started = time.perf_counter()
+        profiles = asyncio.run(resolve())
+        elapsed = time.perf_counter() - started
+        assert [p.username for p in profiles[:-1]] == NAMES
+        assert profiles[-1] is None
+        assert fake.count("/profiles/minecraft") == 21
+        assert elapsed < 1.0
+
+    def test_default_rate_limiter_paces_large_lookups(self, monkeypatch):
+        clock = [1000.0]
+        fake_time = types.SimpleNamespace(monotonic=lambda: clock[0], time=time.time)
+        monkeypatch.setattr(ratelimit, "time", fake_time)
+        monkeypatch.setattr(async_api, "time", fake_time)
+
+        async def advance(delay):
+            # The clock only moves once the other requests ran, as they would while this one sleeps.
+            wake_up = clock[0] + delay
+            await asyncio.sleep(0.001)
+            clock[0] = max(clock[0], wake_up)
+
+        monkeypatch.setattr(AsyncMojangApi, "throttle", staticmethod(advance))
+        Dispatch.set_rate_limiter(RateLimiter())
+        names = [f"player_{i:04d}" for i in range(1000)]
+        # A little latency, so the batches are really in flight at the same time.
+        fake = AsyncFakeMojang(names, latency=0.001)
+
+        async def resolve():
+            async with AsyncMojangApi(transport=fake) as mojang:
+                return await mojang.get_uuids(names)
+
+        assert asyncio.run(resolve()) == [make_uuid(n) for n in names]
+        assert fake.count("/profiles/minecraft") == 100
+        # 60 batches fit in the burst of api.mojang.com, the other 40 are paced at 0.9 per second.
+        assert clock[0] - 1000.0 == pytest.approx(40 / 0.9, rel=0.05)
+
+    def test_single_user_and_uuids(self):
+        fake = AsyncFakeMojang(["Notch", "jeb_"], capes=["Notch"])
+
+        async def resolve():
+            mojang = AsyncMojangApi(transport=fake)
+            profile = await mojang.get_user("notch")
+            return profile, await mojang.get_uuids(["Notch", "jeb_"]), await mojang.get_textures(profile)
+
+        profile, uuids, (skin, cape) = asyncio.run(resolve())
+        assert isinstance(profile, Profile)
+        assert profile.username == "Notch"
+        assert uuids == [make_uuid("Notch"), make_uuid("jeb_")]
+        assert isinstance(skin, Skin) and skin.texture == skin.texture_url.encode()
+        assert isinstance(cape, Cape)
+
+    def test_statistics_and_blocked_servers(self):
+        async def fetch():
+            mojang = AsyncMojangApi(transport=AsyncFakeMojang())
+            return await mojang.get_statistics(["item_sold_minecraft"]), await mojang.get_blocked_servers()
+
+        statistics, blocked = asyncio.run(fetch())
+        assert isinstance(statistics, Statistics)
+        assert statistics.total == 10
+        assert len(blocked) == 2 and all(isinstance(b, str) for b in blocked)
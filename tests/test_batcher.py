@@ -0,0 +1,74 @@
+import threading
+
+import pytest
+
+from concurrent.futures import ThreadPoolExecutor
+
+import py4mc
+
+from py4mc import UuidBatcher
+
+from fakes import FakeMojang, make_uuid
+
+NAMES = [f"player_{chr(97 + i // 26)}{chr(97 + i % 26)}" for i in range(40)]
+
+
+class TestUuidBatcher:
+    @pytest.fixture(autouse=True)
+    def setup_dispatch(self, dispatch):
+        self.fake = FakeMojang(NAMES, latency=0.01)
+        dispatch.set_transport(self.fake)
+
+    def posts(self) -> list:
+        return [c for c in self.fake.calls if c[0] == "POST"]
+
+    def test_single_lookups_are_batched(self):
+        with UuidBatcher(window=0.2) as batcher:
+            mojang = py4mc.MojangApi(batcher=batcher)
+            with ThreadPoolExecutor(40) as executor:
+                uuids = list(executor.map(mojang.get_uuid, NAMES))
+        assert uuids == [make_uuid(n) for n in NAMES]
+        assert len(self.posts()) == 4
+        assert self.fake.count("/users/profiles/minecraft/") == 0
+        assert batcher.requests == 4 and batcher.lookups == 40
+
+    def test_window_flushes_partial_batches(self):
+        with UuidBatcher(window=0.01) as batcher:
+            assert batcher.get_uuid(NAMES[0]) == make_uuid(NAMES[0])
+            assert batcher.get_uuid("unknown_name") is None
+        assert len(self.posts()) == 2
+
+    def test_duplicates_share_a_slot(self):
+        barrier = threading.Barrier(6)
+
+        def lookup(name):
+            barrier.wait()
+            return batcher.get_uuid(name)
+
+        with UuidBatcher(window=0.2) as batcher:
+            with ThreadPoolExecutor(6) as executor:
+                uuids = list(executor.map(lookup, [NAMES[0].upper()] * 5 + [NAMES[1]]))
+        assert uuids == [make_uuid(NAMES[0])] * 5 + [make_uuid(NAMES[1])]
+        assert len(self.posts()) == 1
+
+    def test_invalid_names_are_not_sent(self):
+        with UuidBatcher() as batcher:
+            assert batcher.get_uuid("not a name!") is None
+        assert self.fake.calls == []
+
+    def test_closed_batcher_rejects_names(self):
+        batcher = UuidBatcher(window=0.01)
+        assert batcher.get_uuid(NAMES[0]) == make_uuid(NAMES[0])
+        batcher.close()
+        with pytest.raises(RuntimeError):
+            batcher.submit(NAMES[1])
+
+    def test_failed_hand_off_fails_the_batch(self):
+        batcher = UuidBatcher(window=0.01)
+        batcher._executor.shutdown()
+        with pytest.raises(RuntimeError):
+            batcher.get_uuid(NAMES[0], timeout=3)
+        # The collector survived, so later names fail too instead of hanging.
+        with pytest.raises(RuntimeError):
+            batcher.get_uuid(NAMES[1], timeout=3)
+        batcher.close()
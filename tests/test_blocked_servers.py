@@ -1,5 +1,6 @@
 import py4mc
-import _hashlib
+
+from py4mc.types import BlockedServerIndex
 
 mojang = py4mc.MojangApi()
 
@@ -10,7 +11,12 @@ class TestBlockedServers:
         assert isinstance(blocked_servers, list)
         assert all([isinstance(b, str) for b in blocked_servers])
 
-    def test_hashlibed_hashes(self):
+    def test_digest_hashes(self):
         blocked_servers = mojang.get_blocked_servers(raw_hashes=False)
         assert isinstance(blocked_servers, list)
-        assert all([isinstance(b, _hashlib.HASH) for b in blocked_servers])
+        assert all([isinstance(b, bytes) and len(b) == 20 for b in blocked_servers])
+
+    def test_blocked_server_index(self):
+        index = mojang.get_blocked_server_index()
+        assert isinstance(index, BlockedServerIndex)
+        assert len(index) == len(mojang.get_blocked_servers())
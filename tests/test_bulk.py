@@ -0,0 +1,53 @@
+import time
+
+import pytest
+
+import py4mc
+
+from py4mc.types import Profile
+
+from fakes import FakeMojang, make_uuid
+
+NAMES = [f"player_{chr(97 + i // 26)}{chr(97 + i % 26)}" for i in range(100)]
+
+
+class TestBulkProfiles:
+    @pytest.fixture(autouse=True)
+    def setup_dispatch(self, dispatch):
+        self.fake = FakeMojang(NAMES, latency=0.01)
+        dispatch.set_transport(self.fake)
+
+    def test_users_in_input_order(self):
+        mojang = py4mc.MojangApi(max_workers=32)
+        requested = ["unknown_name"] + NAMES[::-1] + [make_uuid(NAMES[0])]
+        started = time.perf_counter()
+        profiles = mojang.get_users(requested)
+        elapsed = time.perf_counter() - started
+        assert profiles[0] is None
+        assert [p.username for p in profiles[1:-1]] == NAMES[::-1]
+        assert isinstance(profiles[-1], Profile) and profiles[-1].username == NAMES[0]
+        assert self.fake.count("/profiles/minecraft") == 11
+        assert self.fake.count("/users/profiles/minecraft/") == 0
+        assert elapsed < 1.0
+
+    def test_uuid_mapping(self):
+        mojang = py4mc.MojangApi()
+        mapping = mojang.get_uuid_mapping(n.upper() for n in NAMES[:25])
+        assert mapping == {n: make_uuid(n) for n in NAMES[:25]}
+        assert mojang.get_uuids(NAMES[:25]) == [make_uuid(n) for n in NAMES[:25]]
+
+    def test_iter_profiles_streams(self):
+        mojang = py4mc.MojangApi(max_workers=4)
+        consumed = []
+
+        def names():
+            for name in NAMES + ["unknown_name"]:
+                consumed.append(name)
+                yield name
+
+        stream = mojang.iter_profiles(names(), max_pending=8)
+        requested, profile = next(stream)
+        assert len(consumed) < len(NAMES)
+        results = dict([(requested, profile)] + list(stream))
+        assert results.pop("unknown_name") is None
+        assert {k: v.username for k, v in results.items()} == {n: n for n in NAMES}
@@ -0,0 +1,77 @@
+import os
+import time
+
+import pytest
+
+import py4mc
+
+from py4mc.cache import MemoryCache, FileCache, LookupCache, MISSING
+
+from fakes import FakeMojang, make_uuid, make_response
+
+
+class TestCache:
+    @pytest.fixture(autouse=True)
+    def setup_dispatch(self, dispatch):
+        self.fake = FakeMojang(["Notch", "jeb_"])
+        dispatch.set_transport(self.fake)
+
+    def test_memory_cache_ttl_and_lru(self):
+        cache = MemoryCache(max_size=2)
+        cache.set("a", 1)
+        cache.set("b", 2, ttl=0.05)
+        assert cache.get("a") == 1
+        cache.set("c", None)
+        assert cache.get("b") is MISSING
+        assert cache.get("c") is None
+        cache.set("d", 4, ttl=0.01)
+        time.sleep(0.02)
+        assert cache.get("d") is MISSING
+        assert cache.stats["hits"] == 2 and cache.stats["misses"] == 2
+
+    def test_file_cache_persists(self, tmp_path):
+        path = os.path.join(tmp_path, "lookups")
+        with FileCache(path, max_size=2) as cache:
+            cache.set("a", ("value", "signature"))
+            cache.set("b", None)
+            cache.set("c", 3)
+        with FileCache(path) as cache:
+            assert cache.get("a") is MISSING
+            assert cache.get("b") is None
+            assert cache.get("c") == 3
+
+    def test_lookups_are_cached(self):
+        cache = LookupCache()
+        mojang = py4mc.MojangApi(cache=cache)
+        for _ in range(3):
+            assert mojang.get_uuid("Notch") == make_uuid("Notch")
+            assert mojang.get_uuid("unknown_name") is None
+            profile = mojang.get_user("jeb_")
+            assert len(profile.name_history()) == 2
+        assert mojang.get_uuid_mapping(["notch", "jeb_", "unknown_name"]) == {
+            "notch": make_uuid("Notch"),
+            "jeb_": make_uuid("jeb_"),
+        }
+        assert self.fake.count("/users/profiles/minecraft/") == 3
+        assert self.fake.count("/session/minecraft/profile/") == 1
+        assert self.fake.count("/names") == 1
+        assert [c for c in self.fake.calls if c[0] == "POST"] == []
+        assert cache.stats["profile"] == {"hits": 2, "misses": 1, "hit_ratio": 2 / 3}
+
+    def test_errors_are_not_cached_as_missing(self):
+        cache = LookupCache()
+        mojang = py4mc.MojangApi(cache=cache)
+        respond = self.fake.respond
+        self.fake.respond = lambda method, url, **kwargs: make_response(403, payload={"path": url})
+        assert mojang.get_uuid("Notch") is None
+        assert mojang.get_uuid_mapping(["notch", "jeb_"]) == {}
+        assert mojang.get_profile_attributes(make_uuid("Notch")) is None
+        assert cache.get("uuid", "notch") is MISSING and cache.get("uuid", "jeb_") is MISSING
+        assert cache.get("profile", make_uuid("Notch")) is MISSING
+        self.fake.respond = respond
+        assert mojang.get_uuid("Notch") == make_uuid("Notch")
+        assert mojang.get_profile_attributes(make_uuid("Notch")).username == "Notch"
+        assert mojang.get_profile_attributes(make_uuid("unknown_name")) is None
+        assert cache.get("profile", make_uuid("unknown_name")) is None
+        assert mojang.get_uuid_mapping(["jeb_", "unknown_name"]) == {"jeb_": make_uuid("jeb_")}
+        assert cache.get("uuid", "unknown_name") is None
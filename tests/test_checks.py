@@ -0,0 +1,57 @@
+import pytest
+
+import py4mc
+
+from py4mc.utils.checks import is_valid_name, is_valid_uuid, partition_identifiers
+
+from fakes import FakeMojang, make_uuid
+
+UUID = "069a79f444e94726a5befca90e38aaf5"
+DASHED = "069a79f4-44e9-4726-a5be-fca90e38aaf5"
+
+
+class TestChecks:
+    def test_names(self):
+        assert is_valid_name("Notch") and is_valid_name("jeb_") and is_valid_name("player123")
+        assert is_valid_name("a" * 25)
+        assert not is_valid_name("a" * 26)
+        assert not is_valid_name("")
+        assert not is_valid_name("not a name")
+        assert not is_valid_name("name\n")
+        assert not is_valid_name(None)
+
+    def test_uuids(self):
+        assert is_valid_uuid(UUID) and is_valid_uuid(DASHED) and is_valid_uuid(UUID.upper())
+        assert not is_valid_uuid(UUID[:-1])
+        assert not is_valid_uuid(DASHED.replace("-", "_"))
+        assert not is_valid_uuid("Notch")
+        assert not is_valid_uuid(None)
+
+    def test_partition(self):
+        identifiers = partition_identifiers(["Notch", UUID, "bad name", DASHED, "player123", None, ""])
+        assert identifiers.names == ["Notch", "player123"]
+        assert identifiers.uuids == [UUID, DASHED]
+        assert identifiers.rejects == ["bad name", None, ""]
+        names, uuids, rejects = partition_identifiers(iter([]))
+        assert names == uuids == rejects == []
+
+
+class TestValidatedPipelines:
+    @pytest.fixture(autouse=True)
+    def setup_dispatch(self, dispatch):
+        self.fake = FakeMojang(["player1", "player2", "Notch"])
+        dispatch.set_transport(self.fake)
+
+    def test_names_with_digits_are_resolved(self):
+        mojang = py4mc.MojangApi()
+        assert mojang.get_uuids(["player1", "bad name", "player2"]) == [make_uuid("player1"), make_uuid("player2")]
+
+    def test_rejects_are_not_requested(self):
+        mojang = py4mc.MojangApi()
+        profiles = mojang.get_users(["bad name", "player1", make_uuid("Notch")])
+        assert profiles[0] is None
+        assert [p.username for p in profiles[1:]] == ["player1", "Notch"]
+        assert mojang.get_user("bad name") is None
+        assert mojang.get_user("unknown_name") is None
+        assert dict(mojang.iter_profiles(["bad name"])) == {"bad name": None}
+        assert all("bad" not in url and "None" not in url for _, url in self.fake.calls)
@@ -0,0 +1,79 @@
+import threading
+
+import pytest
+
+from py4mc import CredentialManager
+from py4mc.authentication import MicrosoftOAuth, MinecraftAuthentication
+
+from fakes import make_response
+
+
+class AuthEndpoints:
+    def __init__(self):
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def count(self, url):
+        return len([c for c in self.calls if c == url])
+
+    def request(self, method, url, **kwargs):
+        with self.lock:
+            self.calls.append(url)
+        if url == MicrosoftOAuth.AUTH_TOKEN_URL:
+            grant = kwargs["data"]["grant_type"]
+            return make_response(payload={"access_token": f"ms-{grant}", "refresh_token": "refresh", "expires_in": 3600})
+        if url in (MinecraftAuthentication.XBL_URL, MinecraftAuthentication.XSTS_URL):
+            return make_response(
+                payload={
+                    "Token": f"token-{len(self.calls)}",
+                    "NotAfter": "2999-12-21T12:43:24.3479318Z",
+                    "DisplayClaims": {"xui": [{"uhs": "1234"}]},
+                }
+            )
+        return make_response(payload={"access_token": f"minecraft-{len(self.calls)}", "expires_in": 86400})
+
+
+class TestCredentialManager:
+    @pytest.fixture(autouse=True)
+    def setup_dispatch(self, dispatch):
+        self.endpoints = AuthEndpoints()
+        dispatch.set_transport(self.endpoints)
+
+    def test_tokens_are_cached(self):
+        manager = CredentialManager("client")
+        access_token = manager.login("bot", "code")
+        assert len(self.endpoints.calls) == 4
+        assert manager.get_access_token("bot") == access_token
+        assert len(self.endpoints.calls) == 4
+
+    def test_only_expired_tiers_are_refreshed(self):
+        manager = CredentialManager("client")
+        manager.login("bot", "code")
+        manager._accounts["bot"].minecraft.expires_at = 0
+        manager.get_access_token("bot")
+        assert len(self.endpoints.calls) == 5
+        manager._accounts["bot"].microsoft.expires_at = 0
+        manager._accounts["bot"].xbl.expires_at = 0
+        manager._accounts["bot"].xsts.expires_at = 0
+        manager._accounts["bot"].minecraft.expires_at = 0
+        manager.get_access_token("bot")
+        assert self.endpoints.calls[-4:] == [
+            MicrosoftOAuth.AUTH_TOKEN_URL,
+            MinecraftAuthentication.XBL_URL,
+            MinecraftAuthentication.XSTS_URL,
+            MinecraftAuthentication.MINECRAFT_URL,
+        ]
+        assert manager._accounts["bot"].microsoft.value == "ms-refresh_token"
+
+    def test_concurrent_refreshes_are_shared(self):
+        manager = CredentialManager("client")
+        manager.add_refresh_token("bot", "refresh")
+        tokens = []
+        threads = [threading.Thread(target=lambda: tokens.append(manager.get_access_token("bot"))) for _ in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(set(tokens)) == 1
+        assert self.endpoints.count(MicrosoftOAuth.AUTH_TOKEN_URL) == 1
+        assert len(self.endpoints.calls) == 4
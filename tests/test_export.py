@@ -0,0 +1,74 @@
+import csv
+import json
+
+import pytest
+
+import py4mc
+
+from py4mc.export import ProfileExporter, export_profiles, COLUMNS, pyarrow
+from py4mc.types import Profile
+
+from fakes import FakeMojang, make_profile_response, make_uuid
+
+NAMES = [f"player_{chr(97 + i // 26)}{chr(97 + i % 26)}" for i in range(50)]
+
+
+def profiles() -> list:
+    responses = [make_profile_response(n, cape=i % 2 == 0, slim=i % 3 == 0) for i, n in enumerate(NAMES)]
+    return [Profile.from_response(r) for r in responses]
+
+
+class TestExport:
+    def test_ndjson(self, tmp_path):
+        path = str(tmp_path / "profiles.ndjson")
+        assert export_profiles(profiles() + [None], path, batch_size=7) == {"written": 50, "missing": 1, "failed": 0}
+        with open(path) as exported:
+            rows = [json.loads(line) for line in exported]
+        assert [r["username"] for r in rows] == NAMES
+        assert rows[0] == {
+            "uuid": make_uuid(NAMES[0]),
+            "username": NAMES[0],
+            "timestamp": 1641070000000,
+            "skin_url": f"http://textures.minecraft.net/texture/skin{make_uuid(NAMES[0])}",
+            "skin_model": "slim",
+            "cape_url": "http://textures.minecraft.net/texture/cape0000000000000000",
+        }
+        assert rows[1]["cape_url"] is None and rows[1]["skin_model"] == "classic"
+
+    def test_csv_flushes_incrementally(self, tmp_path):
+        path = str(tmp_path / "profiles.csv")
+        with ProfileExporter(path, batch_size=10) as exporter:
+            for profile in profiles()[:25]:
+                exporter.write(profile)
+            with open(path, newline="") as exported:
+                assert len(list(csv.reader(exported))) == 21
+            assert exporter.written == 20
+        with open(path, newline="") as exported:
+            rows = list(csv.reader(exported))
+        assert tuple(rows[0]) == COLUMNS
+        assert [r[1] for r in rows[1:]] == NAMES[:25]
+
+    @pytest.mark.skipif(pyarrow is None, reason="pyarrow is not installed")
+    def test_parquet(self, tmp_path):
+        import pyarrow.parquet
+
+        path = str(tmp_path / "profiles.parquet")
+        export_profiles(profiles(), path, batch_size=20)
+        parquet = pyarrow.parquet.ParquetFile(path)
+        assert parquet.metadata.num_row_groups == 3
+        table = parquet.read()
+        assert table.column_names == list(COLUMNS)
+        assert table.column("username").to_pylist() == NAMES
+        assert table.column("timestamp").to_pylist()[0] == 1641070000000
+
+    def test_unknown_format(self, tmp_path):
+        with pytest.raises(ValueError):
+            ProfileExporter(str(tmp_path / "profiles.xml"))
+
+    def test_export_from_lookups(self, tmp_path, dispatch):
+        dispatch.set_transport(FakeMojang(NAMES))
+        path = str(tmp_path / "profiles.jsonl")
+        result = py4mc.MojangApi(max_workers=4).export_profiles(iter(NAMES + ["unknown_name"]), path, batch_size=8)
+        assert result == {"written": 50, "missing": 1, "failed": 0}
+        with open(path) as exported:
+            assert sorted(json.loads(line)["username"] for line in exported) == sorted(NAMES)
@@ -0,0 +1,62 @@
+import pytest
+
+import py4mc
+
+from py4mc import Dispatch, CredentialManager, SingleFlight
+from py4mc.exceptions import InternalServerException
+from py4mc.ratelimit import RateLimiter
+from py4mc.testing import FakeMojangServer, player_uuid
+from py4mc.types import Skin, Cape, Statistics, Account
+
+NAMES = ["Notch", "jeb_", "player_a"]
+
+
+class TestFakeMojangServer:
+    @pytest.fixture(autouse=True)
+    def setup_dispatch(self, dispatch):
+        self.server = FakeMojangServer(NAMES, capes=["Notch"]).start()
+        self.transport = self.server.transport()
+        dispatch.set_transport(self.transport)
+        dispatch.set_single_flight(SingleFlight())
+        yield
+        self.transport.close()
+        self.server.stop()
+
+    def test_profiles_and_textures(self):
+        mojang = py4mc.MojangApi()
+        profile = mojang.get_user("notch")
+        assert profile.uuid.hex == player_uuid("Notch") and profile.username == "Notch"
+        assert profile.signature is not None
+        assert self.server.requests["profile"] == 1
+        assert isinstance(profile.get_skin(), Skin) and isinstance(profile.get_cape(), Cape)
+        assert profile.get_skin().texture.startswith(b"\x89PNG")
+        assert mojang.get_user("unknown_name") is None
+        assert mojang.get_uuids(NAMES) == [player_uuid(n) for n in NAMES]
+        assert [h.name for h in profile.name_history()] == ["notch", "Notch"]
+
+    def test_blocked_servers_and_statistics(self):
+        mojang = py4mc.MojangApi()
+        assert mojang.get_blocked_server_index().is_blocked("mc.example.com")
+        assert isinstance(mojang.get_statistics(["item_sold_minecraft"]), Statistics)
+
+    def test_authentication(self):
+        manager = CredentialManager("client")
+        manager.add_refresh_token("main", "refresh")
+        access_token = manager.get_access_token("main")
+        assert access_token.startswith("mc-")
+        account = Account(access_token).hydrate_account(attributes=True)
+        assert account.get_profile().username == "Notch"
+        assert account.get_attributes().online_chat is True
+
+    def test_rate_limits_are_retried(self):
+        self.server.rate_limit_ratio = 0.5
+        self.server.retry_after = 0.01
+        Dispatch.set_rate_limiter(RateLimiter(limits={}, deadline=5.0, backoff=0.01))
+        mojang = py4mc.MojangApi()
+        assert [mojang.get_uuid(n) for n in NAMES * 4] == [player_uuid(n) for n in NAMES * 4]
+        assert sum(self.server.requests.values()) > 12
+
+    def test_server_errors(self):
+        self.server.error_ratio = 1.0
+        with pytest.raises(InternalServerException):
+            py4mc.MojangApi().get_uuid("Notch")
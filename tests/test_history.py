@@ -0,0 +1,81 @@
+from datetime import datetime
+
+from py4mc import MojangApi, NameHistoryService, SingleFlight
+from py4mc.cache import LookupCache, MISSING
+
+from fakes import FakeMojang, make_uuid, make_response
+
+NAMES = [f"player_{chr(97 + i)}" for i in range(20)]
+
+ALICE, BOB, CAROL = make_uuid("alice"), make_uuid("bob"), make_uuid("carol")
+
+
+def indexed() -> NameHistoryService:
+    service = NameHistoryService()
+    # alice was "Steve" from the start and gave it up in 2015, bob took it in 2016 and gave it up in 2018.
+    service.add_history(ALICE, [{"name": "Steve"}, {"name": "alice", "changedToAt": 1420070400000}])
+    service.add_history(BOB, [
+        {"name": "bob"},
+        {"name": "Steve", "changedToAt": 1451606400000},
+        {"name": "bob", "changedToAt": 1514764800000},
+    ])
+    # carol registered with "steve" after it was free again.
+    service.add_history(CAROL, [{"name": "steve"}])
+    return service
+
+
+class TestNameHistoryService:
+    def test_owner_at(self):
+        service = indexed()
+        assert service.owner_at("steve", datetime(2014, 6, 1)) == ALICE
+        assert service.owner_at("STEVE", 1483228800000) == BOB
+        assert service.owner_at("steve", datetime(2020, 1, 1)) == CAROL
+        assert service.owner_at("bob", datetime(2017, 1, 1)) is None
+        assert service.owner_at("bob", datetime(2019, 1, 1)) == BOB
+        assert service.owner_at("nobody", datetime(2019, 1, 1)) is None
+        assert [o[0] for o in service.owners("steve")] == [ALICE, CAROL, BOB]
+
+    def test_histories_are_replaced(self):
+        service = indexed()
+        service.add_history(BOB, [{"name": "bob"}])
+        assert service.owner_at("steve", 1483228800000) != BOB
+        assert len(service) == 3
+
+    def test_fetch_many(self, dispatch):
+        fake = FakeMojang(NAMES, latency=0.05)
+        dispatch.set_transport(fake)
+        dispatch.set_single_flight(SingleFlight())
+        cache = LookupCache()
+        service = NameHistoryService(max_workers=20, cache=cache)
+        histories = service.fetch_many(make_uuid(n) for n in NAMES)
+        assert [h[-1].name for h in histories.values()] == NAMES
+        assert service.owner_at(NAMES[3], datetime(2020, 1, 1)) == make_uuid(NAMES[3])
+        # The fake's original names only differ in case, so the profile held the name all along.
+        assert service.owner_at(NAMES[3], datetime(2010, 1, 1)) == make_uuid(NAMES[3])
+        assert service.owner_at(NAMES[4], datetime(2010, 1, 1)) != make_uuid(NAMES[3])
+        assert service.fetch(make_uuid(NAMES[0]))[0].is_original
+        assert NameHistoryService(cache=cache).fetch_many([make_uuid(NAMES[0])])
+        assert fake.count("/names") == 20
+
+    def test_missing_histories_are_not_cached(self, dispatch):
+        fake = FakeMojang(NAMES)
+        respond = fake.respond
+        missing = [True]
+
+        def flaky_history(method, url, **kwargs):
+            if "/names" in url and missing and missing.pop():
+                fake.calls.append((method, url))
+                return make_response(204)
+            return respond(method, url, **kwargs)
+
+        fake.respond = flaky_history
+        dispatch.set_transport(fake)
+        cache = LookupCache()
+        uuid = make_uuid(NAMES[0])
+        assert NameHistoryService(cache=cache).fetch(uuid) is None
+        assert cache.get("name_history", uuid) is MISSING
+        # Profile.name_history shares the cache key, and must not read back a cached None.
+        history = MojangApi(cache=cache).get_profile_attributes(uuid).name_history()
+        assert [h.name for h in history] == [NAMES[0].lower(), NAMES[0]]
+        assert NameHistoryService(cache=cache).fetch(uuid)[-1].name == NAMES[0]
+        assert fake.count("/names") == 2
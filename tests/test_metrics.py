@@ -0,0 +1,98 @@
+import pytest
+
+import py4mc
+
+from py4mc import Dispatch, Instrumentation, SingleFlight
+from py4mc.cache import LookupCache
+from py4mc.ratelimit import RateLimiter
+
+from fakes import FakeMojang, make_response, make_uuid
+
+NAMES = ["player_a", "player_b"]
+
+
+class TestInstrumentation:
+    @pytest.fixture(autouse=True)
+    def setup_dispatch(self, dispatch):
+        self.fake = FakeMojang(NAMES)
+        dispatch.set_transport(self.fake)
+        dispatch.set_instrumentation(Instrumentation())
+        dispatch.set_single_flight(SingleFlight())
+
+    def test_endpoints_are_templated(self):
+        profile = "https://sessionserver.mojang.com/session/minecraft/profile/069a79f4-44e9-4726-a5be-fca90e38aaf5"
+        assert Instrumentation.endpoint(
+            profile + "?unsigned=false"
+        ) == "sessionserver.mojang.com/session/minecraft/profile/{uuid}"
+        assert Instrumentation.endpoint(
+            "https://api.mojang.com/users/profiles/minecraft/Notch"
+        ) == "api.mojang.com/users/profiles/minecraft/{name}"
+        assert Instrumentation.endpoint(
+            "http://textures.minecraft.net/texture/abcdef"
+        ) == "textures.minecraft.net/texture/{hash}"
+
+    def test_requests_are_recorded(self):
+        mojang = py4mc.MojangApi(cache=LookupCache())
+        Dispatch.instrumentation.register_cache("lookup", mojang.cache)
+        for name in NAMES + ["unknown_name", NAMES[0]]:
+            mojang.get_uuid(name)
+        mojang.get_uuids(NAMES)
+        snapshot = Dispatch.instrumentation.snapshot()
+        lookups = snapshot["endpoints"]["api.mojang.com/users/profiles/minecraft/{name}"]
+        assert lookups["requests"] == 3
+        assert lookups["statuses"] == {200: 2, 204: 1}
+        assert lookups["bytes_received"] > 0
+        assert lookups["latency"]["count"] == 3
+        batches = snapshot["endpoints"]["api.mojang.com/profiles/minecraft"]
+        assert batches["bytes_sent"] == len('["player_a", "player_b"]')
+        assert snapshot["caches"]["lookup"]["uuid"]["hits"] == 1
+        # Other apis do not replace the registered cache, nor end up referenced by the instrumentation.
+        py4mc.MojangApi(cache=LookupCache())
+        assert Dispatch.instrumentation.snapshot()["caches"]["lookup"]["uuid"]["hits"] == 1
+        Dispatch.instrumentation.unregister_cache("lookup")
+        assert Dispatch.instrumentation.snapshot()["caches"] == {}
+
+    def test_hooks(self):
+        seen = []
+        Dispatch.instrumentation.before_request(lambda method, url, kwargs: seen.append(("before", method)))
+
+        @Dispatch.instrumentation.after_request
+        def after(method, url, response, elapsed):
+            seen.append(("after", response.status_code))
+
+        py4mc.MojangApi().get_uuid(NAMES[0])
+        assert seen == [("before", "GET"), ("after", 200)]
+
+    def test_errors_are_recorded(self):
+        class FailingTransport:
+            def request(self, method, url, **kwargs):
+                raise ConnectionError("unreachable")
+
+        Dispatch.set_transport(FailingTransport())
+        with pytest.raises(ConnectionError):
+            Dispatch.do_request("GET", Dispatch.API_BASE + "/users/profiles/minecraft/Notch")
+        endpoint = Dispatch.instrumentation.snapshot()["endpoints"]["api.mojang.com/users/profiles/minecraft/{name}"]
+        assert endpoint["errors"] == 1 and endpoint["statuses"] == {}
+
+    def test_retries_are_recorded(self):
+        responses = [make_response(429, headers={"Retry-After": "0.01"}), make_response(payload={"id": "a"})]
+        self.fake.request = lambda method, url, **kwargs: responses.pop(0)
+        Dispatch.set_rate_limiter(RateLimiter(deadline=5.0))
+        Dispatch.do_request("GET", Dispatch.API_BASE + "/users/profiles/minecraft/Notch")
+        snapshot = Dispatch.instrumentation.snapshot()
+        endpoint = snapshot["endpoints"]["api.mojang.com/users/profiles/minecraft/{name}"]
+        assert endpoint["retries"] == 1 and endpoint["rate_limited"] == 1
+        assert snapshot["throttled_seconds"] >= 0.01
+
+    def test_prometheus_text(self):
+        mojang = py4mc.MojangApi(cache=LookupCache())
+        Dispatch.instrumentation.register_cache("lookup", mojang.cache)
+        mojang.get_uuid(NAMES[0])
+        text = Dispatch.instrumentation.to_prometheus()
+        endpoint = 'endpoint="api.mojang.com/users/profiles/minecraft/{name}"'
+        assert f"py4mc_requests_total{{{endpoint},status=\"200\"}} 1" in text
+        assert f"py4mc_request_duration_seconds_bucket{{{endpoint},le=\"+Inf\"}} 1" in text
+        assert f"py4mc_request_duration_seconds_count{{{endpoint}}} 1" in text
+        assert 'py4mc_cache_misses_total{cache="lookup",kind="uuid"} 1' in text
+        assert "# TYPE py4mc_request_duration_seconds histogram" in text
+        assert make_uuid(NAMES[0]) not in text
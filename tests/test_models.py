@@ -0,0 +1,26 @@
+import pytest
+
+from py4mc.types import Profile, HistoryIndex, Statistics
+
+from fakes import make_profile_response, make_uuid
+
+
+class TestModels:
+    def test_profile_fields(self):
+        properties = make_profile_response("Notch", cape=True, slim=True)["properties"][0]
+        profile = Profile(properties["value"], properties["signature"])
+        assert not hasattr(profile, "__dict__")
+        assert profile.uuid.hex == make_uuid("Notch")
+        assert profile.timestamp.year == 2022
+        assert profile.skin_attributes()[1] == "slim"
+        assert profile.cape_url().endswith("cape0000000000000000")
+        assert profile.raw_value is None
+        kept = Profile(properties["value"], properties["signature"], keep_raw=True)
+        assert kept.raw_value == properties["value"]
+        assert kept.profile == profile.profile
+
+    def test_small_models_have_slots(self):
+        for model in (HistoryIndex({"name": "Notch"}), Statistics({"total": 1})):
+            assert not hasattr(model, "__dict__")
+            with pytest.raises(AttributeError):
+                model.unknown = True
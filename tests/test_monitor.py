@@ -0,0 +1,88 @@
+import threading
+
+import pytest
+
+from py4mc import MojangApi, StatisticsMonitor
+from py4mc.exceptions import InvalidMetric
+
+from fakes import FakeMojang, make_response
+
+
+class SellingMojang(FakeMojang):
+    """Sells ten copies between two statistics requests."""
+
+    def __init__(self):
+        super().__init__()
+        self.total = 0
+
+    def respond(self, method: str, url: str, **kwargs):
+        if url.endswith("/orders/statistics"):
+            with self._lock:
+                self.calls.append((method, url, kwargs.get("json")))
+                self.total += 10
+                return make_response(payload={"total": self.total, "last24h": 10, "saleVelocityPerSeconds": 0.5})
+        return super().respond(method, url, **kwargs)
+
+
+class TestStatisticsMonitor:
+    @pytest.fixture(autouse=True)
+    def setup_dispatch(self, dispatch):
+        self.fake = SellingMojang()
+        dispatch.set_transport(self.fake)
+
+    def test_ring_buffer(self):
+        monitor = StatisticsMonitor(["item_sold_minecraft", "prepaid_card_redeemed_minecraft"], capacity=4)
+        assert monitor.latest is None and monitor.delta() is None
+        for _ in range(6):
+            monitor.poll()
+        assert len(monitor) == 4
+        assert monitor.samples("total") == [30, 40, 50, 60]
+        assert monitor.latest.total == 60
+        assert monitor.delta() == 30
+        assert monitor.samples()[-1][1:] == (60, 10, 0.5)
+        # One request per tick, for every metric at once.
+        assert len(self.fake.calls) == 6
+        assert self.fake.calls[0][2] == {"metricKeys": ["item_sold_minecraft", "prepaid_card_redeemed_minecraft"]}
+
+    def test_rates(self):
+        monitor = StatisticsMonitor("item_sold_minecraft", capacity=8)
+        for offset in range(5):
+            monitor.poll()
+            position = monitor._samples.index(-1)
+            monitor._samples.columns["time"][position] = 1000.0 + offset * 60
+        assert monitor.rate() == pytest.approx(40 / 240)
+        assert monitor.delta(window=120) == 20
+        assert monitor.rate(window=120) == pytest.approx(20 / 120)
+        assert monitor.delta(window=0) is None
+
+    def test_invalid_metrics(self):
+        with pytest.raises(InvalidMetric):
+            StatisticsMonitor(["item_sold_minecraft", "item_sold_nothing"])
+
+    def test_shared_and_subscribe(self):
+        monitor = MojangApi().monitor_statistics(["item_sold_dungeons"], interval=0.01)
+        assert monitor is StatisticsMonitor.shared(["item_sold_dungeons"], interval=0.01)
+        assert monitor is not StatisticsMonitor.shared(["item_sold_dungeons"], interval=1)
+        assert monitor is not StatisticsMonitor.shared(["item_sold_dungeons"], interval=0.01, capacity=10)
+        assert StatisticsMonitor.shared(["item_sold_dungeons"], interval=0.01, capacity=10).capacity == 10
+        received = threading.Event()
+        seen = []
+
+        def first(source, statistics):
+            seen.append(statistics.total)
+            if len(seen) >= 3:
+                received.set()
+
+        second = monitor.subscribe(lambda source, statistics: None)
+        monitor.subscribe(first)
+        try:
+            assert received.wait(2)
+            assert monitor.running
+        finally:
+            monitor.unsubscribe(first)
+            assert monitor.running
+            monitor.unsubscribe(second)
+        assert not monitor.running
+        assert seen == sorted(seen)
+        # Without subscribers the monitor is forgotten, the next dashboard starts a fresh one.
+        assert StatisticsMonitor.shared(["item_sold_dungeons"], interval=0.01) is not monitor
@@ -0,0 +1,50 @@
+import json
+
+from py4mc.types import Profile
+
+from fakes import make_profile_response, make_uuid
+
+NAMES = [f"player_{chr(97 + i // 26)}{chr(97 + i % 26)}" for i in range(300)]
+
+
+def archive() -> list:
+    responses = [make_profile_response(n, cape=i % 3 == 0, slim=i % 2 == 0) for i, n in enumerate(NAMES)]
+    # Archives mix decoded responses, raw JSON lines and bare (value, signature) pairs.
+    raws = []
+    for i, response in enumerate(responses):
+        properties = response["properties"][0]
+        raws.append([response, json.dumps(response), (properties["value"], properties["signature"])][i % 3])
+    return responses, raws
+
+
+class TestProfileDecode:
+    def test_matches_the_constructor(self):
+        responses, raws = archive()
+        expected = [Profile.from_response(r) for r in responses]
+        for processes in (0, 2):
+            profiles = Profile.from_raw_many(raws, processes=processes, chunksize=16)
+            assert [p.uuid for p in profiles] == [p.uuid for p in expected]
+            assert [p.username for p in profiles] == NAMES
+            assert [p.signature for p in profiles] == [p.signature for p in expected]
+            assert [p.skin_attributes() for p in profiles] == [p.skin_attributes() for p in expected]
+            assert [p.cape_url() for p in profiles] == [p.cape_url() for p in expected]
+            assert [p.timestamp for p in profiles] == [p.timestamp for p in expected]
+
+    def test_fields_only(self):
+        _, raws = archive()
+        fields = Profile.from_raw_many(raws[:2], processes=0, fields_only=True)
+        assert fields[0][:3] == (make_uuid(NAMES[0]), NAMES[0], 1641070000000)
+        assert fields[0][5] == "slim" and fields[1][5] == "classic"
+
+    def test_is_lazy(self):
+        _, raws = archive()
+        consumed = []
+
+        def source():
+            for raw in raws:
+                consumed.append(raw)
+                yield raw
+
+        stream = Profile.iter_raw_many(source(), processes=0, chunksize=10)
+        assert next(stream).username == NAMES[0]
+        assert len(consumed) == 10
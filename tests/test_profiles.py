@@ -22,13 +22,13 @@ class TestProfiles:
         assert profile.default_skin() == "Steve"
 
     def test_profiles(self):
-        test_profiles = open(PATH + "\\assets\\test_profiles.txt", "r").read()
+        test_profiles = open(os.path.join(PATH, "assets", "test_profiles.txt"), "r").read()
         profiles = mojang.get_profile(test_profiles.splitlines())
         assert isinstance(profiles, Iterable)
         assert all([isinstance(p, Profile) for p in profiles])
 
     def test_invalid_profiles(self):
-        test_profiles = open(PATH + "\\assets\\test_profiles_invalid.txt", "r").read()
+        test_profiles = open(os.path.join(PATH, "assets", "test_profiles_invalid.txt"), "r").read()
         profiles = mojang.get_profile(test_profiles.splitlines())
         assert isinstance(profiles, Iterable)
         assert all([isinstance(p, type(None)) for p in profiles])
@@ -44,5 +44,5 @@ class TestProfiles:
 
 
 if __name__ == "__main__":
-    profiles = open("./assets/test_profiles.txt", "r").read()
+    profiles = open(os.path.join(PATH, "assets", "test_profiles.txt"), "r").read()
     print(profiles.splitlines())
@@ -0,0 +1,71 @@
+import time
+import pytest
+
+from py4mc import Dispatch
+from py4mc.exceptions import Ratelimited
+from py4mc.ratelimit import TokenBucket, RateLimiter
+
+from fakes import make_response
+
+ROUTE = "https://api.mojang.com/users/profiles/minecraft/Notch"
+
+
+class SequenceTransport:
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.calls = 0
+
+    def request(self, method, url, **kwargs):
+        self.calls += 1
+        return self.responses.pop(0) if len(self.responses) > 1 else self.responses[0]
+
+
+@pytest.mark.usefixtures("dispatch")
+class TestRateLimit:
+    def test_default_limit_fits_the_documented_budget(self, monkeypatch):
+        now = [0.0]
+        monkeypatch.setattr(time, "monotonic", lambda: now[0])
+        bucket = RateLimiter().get_bucket(ROUTE)
+        # Requests sent as fast as the bucket allows, for 10 minutes from a full bucket.
+        sent = 0
+        while now[0] + bucket.reserve() < 600:
+            sent += 1
+        assert sent <= 600
+
+    def test_token_bucket_schedules(self):
+        bucket = TokenBucket(rate=10.0, capacity=2)
+        assert bucket.reserve() == 0.0
+        assert bucket.reserve() == 0.0
+        assert bucket.reserve() == pytest.approx(0.1, abs=0.01)
+        assert bucket.reserve() == pytest.approx(0.2, abs=0.01)
+
+    def test_retry_after_is_honored(self):
+        transport = SequenceTransport(
+            make_response(429, headers={"Retry-After": "0.2"}),
+            make_response(payload={"id": "069a79f444e94726a5befca90e38aaf5", "name": "Notch"}),
+        )
+        Dispatch.set_transport(transport)
+        Dispatch.set_rate_limiter(RateLimiter(deadline=5.0, backoff=0.01))
+        started = time.perf_counter()
+        assert Dispatch.do_request("GET", ROUTE).get("name") == "Notch"
+        assert time.perf_counter() - started >= 0.2
+        assert transport.calls == 2
+
+    def test_deadline_raises(self):
+        Dispatch.set_transport(SequenceTransport(make_response(429, headers={"Retry-After": "60"})))
+        Dispatch.set_rate_limiter(RateLimiter(deadline=1.0))
+        with pytest.raises(Ratelimited):
+            Dispatch.do_request("GET", ROUTE)
+
+    def test_bucket_deadline_raises(self):
+        Dispatch.set_transport(SequenceTransport(make_response(payload={})))
+        Dispatch.set_rate_limiter(RateLimiter(limits={"api.mojang.com": (0.1, 1)}, deadline=1.0))
+        Dispatch.do_request("GET", ROUTE)
+        with pytest.raises(Ratelimited):
+            Dispatch.do_request("GET", ROUTE)
+
+    def test_disabled_rate_limiter_raises(self):
+        Dispatch.set_transport(SequenceTransport(make_response(429)))
+        Dispatch.set_rate_limiter(None)
+        with pytest.raises(Ratelimited):
+            Dispatch.do_request("GET", ROUTE)
@@ -0,0 +1,174 @@
+import time
+import asyncio
+
+import pytest
+import requests
+
+import py4mc
+
+from py4mc import Dispatch, AsyncMojangApi, RetryPolicy, CircuitBreaker, BatchResult
+from py4mc.exceptions import InternalServerException, NetworkException, CircuitOpen
+
+from fakes import FakeMojang, AsyncFakeMojang, make_uuid, make_response
+
+NAMES = [f"player_{chr(97 + i)}" for i in range(12)]
+
+
+class FlakyMojang(FakeMojang):
+    """Fails the first requests to every url, then answers like FakeMojang."""
+
+    def __init__(self, names=(), failures: int = 1, status_code: int = None, broken=()):
+        super().__init__(names)
+        self.failures = failures
+        self.status_code = status_code
+        self.broken = broken
+        self.attempts = {}
+
+    def respond(self, method: str, url: str, **kwargs):
+        with self._lock:
+            self.attempts[url] = self.attempts.get(url, 0) + 1
+            failing = self.attempts[url] <= self.failures or any(b in url for b in self.broken)
+        if failing:
+            self.calls.append((method, url))
+            if self.status_code is None:
+                raise requests.ConnectionError("Connection reset by peer")
+            return make_response(self.status_code)
+        return super().respond(method, url, **kwargs)
+
+
+class AsyncFlakyMojang(FlakyMojang, AsyncFakeMojang):
+    pass
+
+
+class TestRetryPolicy:
+    def test_delays(self):
+        policy = RetryPolicy(retries=3, backoff=0.1, max_backoff=0.3, jitter=False)
+        assert [policy.delay(a) for a in range(4)] == [0.1, 0.2, 0.3, 0.3]
+        jittered = RetryPolicy(backoff=0.1)
+        assert all(0 <= jittered.delay(2) <= 0.4 for _ in range(100))
+        assert policy.should_retry(0) and policy.should_retry(2, 503)
+        assert not policy.should_retry(3) and not policy.should_retry(0, 404)
+
+
+class TestCircuitBreaker:
+    def test_opens_and_half_opens(self):
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.05)
+        url = Dispatch.SESSION_SERVER + "/session/minecraft/profile/abc"
+        for _ in range(2):
+            breaker.record(url, False, breaker.before(url))
+        assert breaker.state(url) == "open"
+        with pytest.raises(CircuitOpen):
+            breaker.before(url)
+        # Other hosts are not affected.
+        breaker.before(Dispatch.API_BASE + "/profiles/minecraft")
+        time.sleep(0.06)
+        assert breaker.state(url) == "half_open"
+        probe = breaker.before(url)
+        with pytest.raises(CircuitOpen):
+            breaker.before(url)
+        breaker.record(url, False, probe)
+        assert breaker.state(url) == "open"
+        time.sleep(0.06)
+        breaker.record(url, True, breaker.before(url))
+        assert breaker.state(url) == "closed"
+
+    def test_requests_sent_before_opening_are_ignored(self):
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+        url = Dispatch.SESSION_SERVER + "/session/minecraft/profile/abc"
+        stale_failure, stale_success = breaker.before(url), breaker.before(url)
+        breaker.record(url, False, breaker.before(url))
+        opened_at = breaker._get_circuit(url).opened_at
+        # A failure of a request sent before the circuit opened does not push the probe back.
+        breaker.record(url, False, stale_failure)
+        assert breaker._get_circuit(url).opened_at == opened_at
+        time.sleep(0.06)
+        probe = breaker.before(url)
+        # Nor does a late success close the circuit, or let a second probe through.
+        breaker.record(url, True, stale_success)
+        assert breaker.state(url) == "half_open"
+        with pytest.raises(CircuitOpen):
+            breaker.before(url)
+        breaker.record(url, True, probe)
+        assert breaker.state(url) == "closed"
+
+
+class TestDispatchResilience:
+    @pytest.fixture(autouse=True)
+    def setup_dispatch(self, dispatch):
+        dispatch.set_retry_policy(RetryPolicy(retries=2, backoff=0.001))
+        dispatch.set_circuit_breaker(CircuitBreaker(failure_threshold=3, reset_timeout=60))
+
+    def test_network_errors_are_retried(self):
+        fake = FlakyMojang(NAMES, failures=2)
+        Dispatch.set_transport(fake)
+        assert py4mc.MojangApi().get_uuid(NAMES[0]) == make_uuid(NAMES[0])
+        assert len(fake.calls) == 3
+
+    def test_server_errors_are_retried(self):
+        fake = FlakyMojang(NAMES, failures=1, status_code=503)
+        Dispatch.set_transport(fake)
+        assert py4mc.MojangApi().get_uuid(NAMES[0]) == make_uuid(NAMES[0])
+        Dispatch.set_transport(FlakyMojang(NAMES, failures=5, status_code=502))
+        with pytest.raises(InternalServerException):
+            py4mc.MojangApi().get_uuid(NAMES[1])
+
+    def test_network_errors_are_wrapped(self):
+        Dispatch.set_transport(FlakyMojang(NAMES, failures=5))
+        with pytest.raises(NetworkException) as raised:
+            py4mc.MojangApi().get_uuid(NAMES[0])
+        assert isinstance(raised.value.__cause__, requests.ConnectionError)
+
+    def test_non_idempotent_requests_are_not_retried(self):
+        fake = FlakyMojang(NAMES, failures=1, status_code=503)
+        Dispatch.set_transport(fake)
+        route = Dispatch.SERVICE_URL + "/authentication/login_with_xbox"
+        with pytest.raises(InternalServerException):
+            Dispatch.do_request("POST", route, json={"identityToken": "token"})
+        assert len(fake.calls) == 1
+        assert Dispatch.is_idempotent("POST", Dispatch.API_BASE + "/profiles/minecraft")
+        assert Dispatch.is_idempotent("GET", route)
+
+    def test_circuit_fails_fast(self):
+        fake = FlakyMojang(NAMES, failures=100)
+        Dispatch.set_transport(fake)
+        mojang = py4mc.MojangApi()
+        with pytest.raises(NetworkException):
+            mojang.get_uuid(NAMES[0])
+        with pytest.raises(CircuitOpen):
+            mojang.get_uuid(NAMES[1])
+        assert len(fake.calls) == 3
+
+    def test_get_users_returns_partial_results(self):
+        broken = make_uuid(NAMES[3])
+        Dispatch.set_transport(FlakyMojang(NAMES, failures=0, broken=(broken,)))
+        Dispatch.set_circuit_breaker(None)
+        result = py4mc.MojangApi().get_users(NAMES + ["nobody"])
+        assert isinstance(result, BatchResult) and not result.ok
+        assert list(result.errors) == [3]
+        assert isinstance(result.errors[3], NetworkException)
+        assert result[3] is None and result[-1] is None
+        assert [p.username for i, p in enumerate(result[:-1]) if i != 3] == NAMES[:3] + NAMES[4:]
+
+    def test_get_users_failed_name_chunks(self):
+        Dispatch.set_transport(FlakyMojang(NAMES, failures=0, status_code=503, broken=("/profiles/minecraft",)))
+        Dispatch.set_circuit_breaker(None)
+        uuids = [make_uuid(n) for n in NAMES[:2]]
+        result = py4mc.MojangApi().get_users(uuids + NAMES[:2])
+        assert [p.username for p in result[:2]] == NAMES[:2]
+        assert result[2:] == [None, None]
+        assert sorted(result.errors) == [2, 3]
+
+    def test_iter_profiles_yields_errors(self):
+        broken = make_uuid(NAMES[5])
+        Dispatch.set_transport(FlakyMojang(NAMES, failures=0, broken=(broken,)))
+        Dispatch.set_circuit_breaker(None)
+        results = dict(py4mc.MojangApi().iter_profiles(NAMES))
+        assert isinstance(results.pop(NAMES[5]), NetworkException)
+        assert sorted(p.username for p in results.values()) == sorted(NAMES[:5] + NAMES[6:])
+
+    def test_async_retries(self):
+        async def resolve():
+            async with AsyncMojangApi(transport=AsyncFlakyMojang(NAMES, failures=2)) as mojang:
+                return await mojang.get_uuid(NAMES[0])
+
+        assert asyncio.run(resolve()) == make_uuid(NAMES[0])
@@ -0,0 +1,39 @@
+import pytest
+
+import py4mc.response
+
+from py4mc import Dispatch
+from py4mc.response import ApiResponse
+from py4mc.exceptions import ApiException, InternalServerException
+
+from fakes import make_response
+
+
+class TestResponse:
+    def test_body_is_decoded_once(self, monkeypatch):
+        decodes = []
+
+        def counting_loads(data):
+            decodes.append(data)
+            return original(data)
+
+        original = py4mc.response.json_loads
+        monkeypatch.setattr(py4mc.response, "json_loads", counting_loads)
+        assert Dispatch.parse_response(make_response(payload={"id": "a", "name": "b"})) == {"id": "a", "name": "b"}
+        assert Dispatch.parse_response(make_response(payload=[1, 2])) == [1, 2]
+        assert len(decodes) == 2
+
+    def test_unparsed_responses(self):
+        response = Dispatch.parse_response(make_response(content=b"\x89PNG"))
+        assert isinstance(response, ApiResponse)
+        assert response.content == b"\x89PNG" and not response.is_json
+        with pytest.raises(ValueError):
+            response.json()
+        response = Dispatch.parse_response(make_response(400, payload={"error": "bad"}))
+        assert response.status_code == 400 and response.json() == {"error": "bad"}
+
+    def test_errors_raise(self):
+        with pytest.raises(ApiException):
+            Dispatch.parse_response(make_response(payload={"error": "IllegalArgument", "errorMessage": "bad"}))
+        with pytest.raises(InternalServerException):
+            Dispatch.parse_response(make_response(503))
@@ -0,0 +1,35 @@
+import pytest
+
+import py4mc
+
+from py4mc.types import BlockedServerIndex
+
+from fakes import FakeMojang
+
+
+class TestBlockedServerIndex:
+    @pytest.fixture(autouse=True)
+    def setup_dispatch(self, dispatch):
+        dispatch.set_transport(FakeMojang())
+
+    def test_address_variants(self):
+        assert BlockedServerIndex.address_variants("Mc.Example.com:25565") == [
+            "mc.example.com",
+            "*.example.com",
+            "*.com",
+        ]
+        assert BlockedServerIndex.address_variants("10.0.0.1") == ["10.0.0.1", "10.0.0.*", "10.0.*", "10.*"]
+
+    def test_is_blocked(self):
+        index = py4mc.MojangApi().get_blocked_server_index()
+        assert len(index) == 2
+        assert index.is_blocked("play.example.com")
+        assert index.matching_rule("a.b.example.com:25565") == "*.example.com"
+        assert index.matching_rule("10.0.0.77") == "10.0.0.*"
+        assert not index.is_blocked("example.com")
+        assert not index.is_blocked("10.0.1.1")
+
+    def test_blocked_server_digests(self):
+        mojang = py4mc.MojangApi()
+        digests = mojang.get_blocked_servers(raw_hashes=False)
+        assert [d.hex() for d in digests] == mojang.get_blocked_servers()
@@ -0,0 +1,73 @@
+import os
+import time
+import hashlib
+
+import pytest
+
+from py4mc import Dispatch
+from py4mc.types import BlockedServerIndex, BlockedServerRefresher
+
+from fakes import make_response
+
+
+def sha1(address):
+    return hashlib.sha1(address.encode()).hexdigest()
+
+
+class BlockedServersEndpoint:
+    def __init__(self, addresses, etag=True):
+        self.addresses = list(addresses)
+        self.etag = etag
+        self.requests = []
+
+    def request(self, method, url, **kwargs):
+        headers = kwargs.get("headers") or {}
+        self.requests.append(headers)
+        etag = f'"{len(self.addresses)}"'
+        if self.etag and headers.get("If-None-Match") == etag:
+            return make_response(304)
+        content = "\n".join(sha1(a) for a in self.addresses).encode()
+        return make_response(content=content, headers={"ETag": etag} if self.etag else {})
+
+
+@pytest.mark.usefixtures("dispatch")
+class TestBlockedServerRefresher:
+    def test_conditional_refresh(self):
+        endpoint = BlockedServersEndpoint(["*.example.com"])
+        Dispatch.set_transport(endpoint)
+        index = BlockedServerIndex()
+        refresher = BlockedServerRefresher(index)
+        changes = []
+        refresher.on_change(lambda added, removed: changes.append((added, removed)))
+        assert refresher.refresh() == ({sha1("*.example.com")}, frozenset())
+        assert refresher.refresh() == (frozenset(), frozenset())
+        assert endpoint.requests[-1]["If-None-Match"] == '"1"'
+        endpoint.addresses = ["10.0.0.*", "*.example.org"]
+        added, removed = refresher.refresh()
+        assert added == {sha1("10.0.0.*"), sha1("*.example.org")} and removed == {sha1("*.example.com")}
+        assert index.is_blocked("10.0.0.1") and not index.is_blocked("mc.example.com")
+        assert len(changes) == 2
+
+    def test_digest_refresh_and_persistence(self, tmp_path):
+        path = os.path.join(tmp_path, "blockedservers.txt")
+        endpoint = BlockedServersEndpoint(["*.example.com"], etag=False)
+        Dispatch.set_transport(endpoint)
+        refresher = BlockedServerRefresher(path=path)
+        refresher.refresh()
+        assert refresher.refresh() == (frozenset(), frozenset())
+        restarted = BlockedServerRefresher(path=path)
+        assert restarted.index.is_blocked("mc.example.com")
+        assert restarted.refresh() == (frozenset(), frozenset())
+
+    def test_background_polling(self):
+        endpoint = BlockedServersEndpoint(["*.example.com"])
+        Dispatch.set_transport(endpoint)
+        refresher = BlockedServerRefresher(interval=0.01).start()
+        try:
+            deadline = time.monotonic() + 2
+            while len(endpoint.requests) < 3 and time.monotonic() < deadline:
+                time.sleep(0.01)
+        finally:
+            refresher.stop()
+        assert refresher.index.is_blocked("mc.example.com")
+        assert len(endpoint.requests) >= 3
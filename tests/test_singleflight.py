@@ -0,0 +1,128 @@
+import asyncio
+import threading
+
+import pytest
+
+from concurrent.futures import ThreadPoolExecutor
+
+import py4mc
+
+from py4mc import Dispatch, AsyncMojangApi, SingleFlight, AsyncSingleFlight
+
+from fakes import FakeMojang, AsyncFakeMojang, make_uuid
+
+NAMES = [f"player_{chr(97 + i)}" for i in range(10)]
+
+
+class TestSingleFlight:
+    @pytest.fixture(autouse=True)
+    def setup_dispatch(self, dispatch):
+        self.fake = FakeMojang(NAMES, latency=0.2)
+        dispatch.set_transport(self.fake)
+        dispatch.set_single_flight(SingleFlight())
+
+    def test_identical_gets_are_coalesced(self):
+        mojang = py4mc.MojangApi()
+        with ThreadPoolExecutor(16) as executor:
+            uuids = list(executor.map(lambda _: mojang.get_uuid(NAMES[0]), range(16)))
+        assert uuids == [make_uuid(NAMES[0])] * 16
+        assert self.fake.count("/users/profiles/minecraft/") == 1
+        assert Dispatch.single_flight.stats == {"executed": 1, "coalesced": 15, "in_flight": 0}
+
+    def test_name_batches_are_coalesced(self):
+        mojang = py4mc.MojangApi()
+        batches = [NAMES, [n.upper() for n in NAMES[::-1]]] * 4
+        with ThreadPoolExecutor(8) as executor:
+            results = list(executor.map(mojang.get_uuids, batches))
+        assert all(sorted(r) == sorted(make_uuid(n) for n in NAMES) for r in results)
+        assert len([c for c in self.fake.calls if c[0] == "POST"]) == 1
+
+    def test_different_requests_are_not_coalesced(self):
+        mojang = py4mc.MojangApi()
+        with ThreadPoolExecutor(4) as executor:
+            list(executor.map(mojang.get_uuid, NAMES[:4]))
+        assert self.fake.count("/users/profiles/minecraft/") == 4
+        assert Dispatch.single_flight.coalesced == 0
+
+    def test_disabled(self):
+        Dispatch.set_single_flight(None)
+        mojang = py4mc.MojangApi()
+        with ThreadPoolExecutor(4) as executor:
+            list(executor.map(lambda _: mojang.get_uuid(NAMES[0]), range(4)))
+        assert self.fake.count("/users/profiles/minecraft/") == 4
+
+    def test_exceptions_are_shared(self):
+        single_flight = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+
+        def failing():
+            started.set()
+            release.wait()
+            raise ValueError("failed")
+
+        def call():
+            try:
+                single_flight.do("key", failing)
+            except ValueError as exception:
+                return exception
+
+        with ThreadPoolExecutor(4) as executor:
+            leader = executor.submit(call)
+            started.wait()
+            followers = [executor.submit(call) for _ in range(3)]
+            while single_flight.coalesced < 3:
+                pass
+            release.set()
+            errors = [leader.result()] + [f.result() for f in followers]
+        assert all(isinstance(e, ValueError) for e in errors)
+        assert single_flight.stats == {"executed": 1, "coalesced": 3, "in_flight": 0}
+
+
+@pytest.mark.usefixtures("dispatch")
+class TestAsyncSingleFlight:
+    def test_identical_gets_are_coalesced(self):
+        fake = AsyncFakeMojang(NAMES, latency=0.05)
+
+        async def resolve():
+            mojang = AsyncMojangApi(transport=fake)
+            uuids = await asyncio.gather(*[mojang.get_uuid(NAMES[0]) for _ in range(10)])
+            return uuids, mojang.single_flight
+
+        uuids, single_flight = asyncio.run(resolve())
+        assert uuids == [make_uuid(NAMES[0])] * 10
+        assert fake.count("/users/profiles/minecraft/") == 1
+        assert isinstance(single_flight, AsyncSingleFlight)
+        assert single_flight.stats == {"executed": 1, "coalesced": 9, "in_flight": 0}
+
+    def test_exceptions_are_shared(self):
+        single_flight = AsyncSingleFlight()
+
+        async def failing():
+            await asyncio.sleep(0.01)
+            raise ValueError("failed")
+
+        async def run():
+            return await asyncio.gather(*[single_flight.do("key", failing) for _ in range(3)], return_exceptions=True)
+
+        errors = asyncio.run(run())
+        assert all(isinstance(e, ValueError) for e in errors)
+        assert single_flight.coalesced == 2
+
+    def test_cancelled_leader(self):
+        single_flight = AsyncSingleFlight()
+
+        async def slow():
+            await asyncio.sleep(0.05)
+            return "result"
+
+        async def run():
+            leader = asyncio.ensure_future(asyncio.wait_for(single_flight.do("key", slow), 0.01))
+            await asyncio.sleep(0)
+            follower = asyncio.ensure_future(single_flight.do("key", slow))
+            with pytest.raises(asyncio.TimeoutError):
+                await leader
+            return await follower
+
+        assert asyncio.run(run()) == "result"
+        assert single_flight.stats == {"executed": 1, "coalesced": 1, "in_flight": 0}
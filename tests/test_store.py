@@ -0,0 +1,37 @@
+import os
+
+import pytest
+
+import py4mc
+
+from py4mc.store import ProfileStore
+
+from fakes import FakeMojang, make_uuid, make_profile_response
+
+
+class TestProfileStore:
+    @pytest.fixture(autouse=True)
+    def setup_dispatch(self, dispatch):
+        self.fake = FakeMojang(["Notch", "jeb_"])
+        dispatch.set_transport(self.fake)
+
+    def test_store_lookups(self):
+        with ProfileStore(max_age=60) as store:
+            properties = make_profile_response("Notch")["properties"][0]
+            store.put(make_uuid("Notch"), "Notch", properties["value"], properties["signature"])
+            assert store.get_uuid("NOTCH") == make_uuid("Notch")
+            assert store.get_by_name("notch") == (properties["value"], properties["signature"])
+            assert store.get_by_uuid(make_uuid("jeb_")) is None
+            store.max_age = -1
+            assert store.get_by_uuid(make_uuid("Notch")) is None
+            assert store.stale_uuids() == [make_uuid("Notch")]
+
+    def test_warm_restart(self, tmp_path):
+        path = os.path.join(tmp_path, "profiles.sqlite3")
+        with ProfileStore(path) as store:
+            profiles = py4mc.MojangApi(store=store).get_user(["Notch", "jeb_"])
+        requests_sent = len(self.fake.calls)
+        with ProfileStore(path) as store:
+            assert py4mc.MojangApi(store=store).get_user(["notch", "jeb_"]) == profiles
+            assert py4mc.MojangApi(store=store).get_users(["JEB_"]) == profiles[1:]
+        assert len(self.fake.calls) == requests_sent
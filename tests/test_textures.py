@@ -0,0 +1,40 @@
+import pytest
+
+import py4mc
+
+from py4mc.cache import TextureCache
+from py4mc.types.textures import _Texture, Skin, Cape, prefetch_textures
+
+from fakes import FakeMojang
+
+NAMES = [f"player_{chr(97 + i)}" for i in range(20)]
+
+
+class TestTextures:
+    @pytest.fixture(autouse=True)
+    def setup_dispatch(self, dispatch):
+        self.fake = FakeMojang(NAMES, capes=NAMES)
+        dispatch.set_transport(self.fake)
+        self.texture_cache, _Texture.cache = _Texture.cache, TextureCache()
+        yield
+        _Texture.cache = self.texture_cache
+
+    def test_textures_are_lazy(self):
+        profile = py4mc.MojangApi().get_user(NAMES[0])
+        skin, cape = profile.get_skin(), profile.get_cape()
+        assert isinstance(skin, Skin) and isinstance(cape, Cape)
+        assert skin.model == "classic"
+        assert self.fake.count("textures.minecraft.net") == 0
+        assert skin.texture == skin.texture_url.encode()
+        assert cape.texture == cape.texture_url.encode()
+        assert profile.get_cape().texture == cape.texture
+        assert self.fake.count("textures.minecraft.net") == 2
+
+    def test_prefetch_downloads_each_texture_once(self, tmp_path):
+        _Texture.cache = TextureCache(str(tmp_path))
+        profiles = py4mc.MojangApi().get_users(NAMES + ["unknown_name"])
+        assert prefetch_textures(profiles) == len(NAMES) + 1
+        assert prefetch_textures(profiles) == 0
+        _Texture.cache = TextureCache(str(tmp_path))
+        assert all(p.get_skin().texture for p in profiles[:-1])
+        assert self.fake.count("textures.minecraft.net") == len(NAMES) + 1
@@ -0,0 +1,66 @@
+import json
+import threading
+import py4mc
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from py4mc import Dispatch, Transport
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    peers = set()
+
+    def do_GET(self):
+        self.peers.add(self.client_address)
+        body = json.dumps({"id": "069a79f444e94726a5befca90e38aaf5", "name": "Notch"}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class FakeTransport:
+    def __init__(self, transport):
+        self.transport = transport
+        self.calls = []
+
+    def request(self, method, url, **kwargs):
+        self.calls.append((method, url))
+        return self.transport.request(method, url, **kwargs)
+
+
+class TestTransport:
+    def setup_method(self):
+        _Handler.peers = set()
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self.base = "http://127.0.0.1:{}".format(self.server.server_address[1])
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def teardown_method(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_connections_are_reused(self):
+        with Transport(pool_maxsize=2) as transport:
+            for _ in range(5):
+                assert transport.request("GET", self.base + "/users").status_code == 200
+        assert len(_Handler.peers) == 1
+
+    def test_injected_transport(self, dispatch):
+        fake = FakeTransport(Transport())
+        dispatch.set_transport(fake)
+        try:
+            mojang = py4mc.MojangApi()
+            Dispatch.API_BASE, original = self.base, Dispatch.API_BASE
+            try:
+                assert mojang.get_uuid("Notch") == "069a79f444e94726a5befca90e38aaf5"
+            finally:
+                Dispatch.API_BASE = original
+        finally:
+            fake.transport.close()
+        assert fake.calls == [("GET", self.base + "/users/profiles/minecraft/Notch")]